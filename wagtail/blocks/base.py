@@ -6,18 +6,24 @@ from functools import lru_cache
 from importlib import import_module
 
 from django import forms
+from django.conf import settings
 from django.core import checks
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
 from django.template.loader import render_to_string
 from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils.text import capfirst
+from django.utils.translation import get_language
 
 from wagtail.admin.staticfiles import versioned_static
 from wagtail.admin.telepath import JSContext
 from wagtail.admin.telepath import register as register_telepath_adapter
+from wagtail.coreutils import safe_md5
 from wagtail.utils.templates import template_is_overridden
 
 __all__ = [
@@ -35,6 +41,24 @@ __all__ = [
 # =========================================
 
 
+def get_block_render_cache():
+    """
+    Return the cache that renderings of StreamField blocks are stored in, as set
+    by the ``WAGTAIL_BLOCK_RENDER_CACHE`` setting, or ``None`` if it is not set.
+    """
+    alias = getattr(settings, "WAGTAIL_BLOCK_RENDER_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def get_block_search_cache():
+    """
+    Return the cache that the searchable content of StreamField blocks is stored in,
+    as set by the ``WAGTAIL_BLOCK_SEARCH_CACHE`` setting, or ``None`` if it is not set.
+    """
+    alias = getattr(settings, "WAGTAIL_BLOCK_SEARCH_CACHE", None)
+    return caches[alias] if alias else None
+
+
 class BaseBlock(type):
     def __new__(mcs, name, bases, attrs):
         meta_class = attrs.pop("Meta", None)
@@ -65,6 +89,9 @@ class Block(metaclass=BaseBlock):
         classname = None
         form_attrs = None
         group = ""
+        render_cache = True
+        render_cache_context = ()
+        search_cache = True
 
     # Attributes of Meta which can legally be modified after the block has been instantiated.
     # Used to implement __eq__. label is not included here, despite it technically being mutable via
@@ -267,6 +294,63 @@ class Block(metaclass=BaseBlock):
 
         return mark_safe(render_to_string(template, new_context))
 
+    def get_render_cache_key(self, block_id, raw_value, context=None):
+        """
+        Return the key under which the rendering of a value of this block, within a
+        StreamField, is stored in the render cache (see ``WAGTAIL_BLOCK_RENDER_CACHE``),
+        or ``None`` if it should not be cached. ``raw_value`` is the JSON-serialisable
+        value of the block, as returned by ``get_prep_value``.
+
+        The key is derived from the block's ID, ``raw_value``, template and the
+        active language, along with the values of the context variables named in
+        the ``render_cache_context`` meta option.
+        """
+        if not block_id or not self.meta.render_cache:
+            return None
+
+        context_values = []
+        for name in self.meta.render_cache_context:
+            value = context.get(name) if context is not None else None
+            if isinstance(value, models.Model):
+                value = (value._meta.label_lower, value.pk)
+            context_values.append(str(value))
+
+        key_data = json.dumps(
+            [
+                self.name,
+                raw_value,
+                getattr(self.meta, "template", None),
+                get_language(),
+                context_values,
+            ],
+            cls=DjangoJSONEncoder,
+            sort_keys=True,
+        )
+        value_hash = safe_md5(key_data.encode("utf-8"), usedforsecurity=False)
+        return f"wagtail-block-render:{block_id}:{value_hash.hexdigest()}"
+
+    def get_search_cache_key(self, block_id, raw_value):
+        """
+        Return the key under which the searchable content of a value of this block,
+        within a StreamField, is stored in the search cache (see
+        ``WAGTAIL_BLOCK_SEARCH_CACHE``), or ``None`` if it should not be cached.
+        ``raw_value`` is the JSON-serialisable value of the block, as returned by
+        ``get_prep_value``.
+
+        The key is derived from the block's ID, a hash of ``raw_value``, and the
+        active language.
+        """
+        if not block_id or not self.meta.search_cache:
+            return None
+
+        key_data = json.dumps(
+            [self.name, raw_value, get_language()],
+            cls=DjangoJSONEncoder,
+            sort_keys=True,
+        )
+        value_hash = safe_md5(key_data.encode("utf-8"), usedforsecurity=False)
+        return f"wagtail-block-search:{block_id}:{value_hash.hexdigest()}"
+
     def get_preview_context(self, value, parent_context=None):
         """
         Return a dict of context variables to be used as the template context
@@ -1,5 +1,4 @@
 import itertools
-import json
 import uuid
 from collections import OrderedDict, defaultdict
 from collections.abc import Mapping, MutableSequence
@@ -9,17 +8,23 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.db.models.fields import _load_field
 from django.forms.utils import ErrorList
+from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
 
 from wagtail.admin.staticfiles import versioned_static
 from wagtail.admin.telepath import Adapter, register
+from wagtail.rich_text import RichText, expanded_rich_text
+from wagtail.utils import json as wagtail_json
 
 from .base import (
     Block,
     BoundBlock,
     DeclarativeSubBlocksMetaclass,
+    get_block_render_cache,
+    get_block_search_cache,
     get_error_json_data,
     get_error_list_json_data,
     get_help_icon,
@@ -237,7 +242,7 @@ class BaseStreamBlock(Block):
             return value
         elif isinstance(value, str) and value:
             try:
-                value = json.loads(value)
+                value = wagtail_json.loads(value)
             except ValueError:
                 # value is not valid JSON; most likely, this field was previously a
                 # rich text field before being migrated to StreamField, and the data
@@ -378,23 +383,120 @@ class BaseStreamBlock(Block):
             for child in value  # child is a StreamChild instance
         ]
 
+    def render(self, value, context=None):
+        if (
+            isinstance(value, StreamValue)
+            and get_block_render_cache() is not None
+            and not self.get_template(value, context=context)
+        ):
+            # render_basic expands the rich text of the blocks that are not in the
+            # render cache, so that cached blocks don't need to be loaded
+            return self.render_basic(value, context=context)
+
+        # Expand the links and embeds in all of the rich text within the stream
+        # (including nested blocks) together, rather than once per rich text block
+        with expanded_rich_text(get_rich_text_sources(value)):
+            return super().render(value, context=context)
+
     def render_basic(self, value, context=None):
-        return format_html_join(
-            "\n",
-            '<div class="block-{1}">{0}</div>',
-            [(child.render(context=context), child.block_type) for child in value],
-        )
+        render_cache = get_block_render_cache()
+        if render_cache is None or not isinstance(value, StreamValue):
+            children = [
+                (child.render(context=context), child.block_type) for child in value
+            ]
+        else:
+            children = self.render_children_with_cache(value, render_cache, context)
+
+        return format_html_join("\n", '<div class="block-{1}">{0}</div>', children)
+
+    def render_children_with_cache(self, value, render_cache, context=None):
+        """
+        Return the rendering and block type of each child of the StreamValue ``value``,
+        taking the renderings from ``render_cache`` where possible, and storing the
+        others there. Children are only converted from their raw data if they are
+        not in the cache.
+        """
+        # Children that have been converted may have been changed since, so key them
+        # on their current value rather than the raw data they were converted from
+        prep_value = value.get_prep_value(assign_ids=False)
+        keys = []
+        for raw_item in prep_value:
+            child_block = self.child_blocks[raw_item["type"]]
+            keys.append(
+                child_block.get_render_cache_key(
+                    raw_item.get("id"), raw_item["value"], context=context
+                )
+            )
+
+        cached = render_cache.get_many([key for key in keys if key is not None])
+        rendered = {i: cached[key] for i, key in enumerate(keys) if key in cached}
+        missing = [i for i in range(len(keys)) if i not in rendered]
+
+        StreamValue._prefetch_items_in_bulk((value, i) for i in missing)
+        with expanded_rich_text(get_rich_text_sources([value[i] for i in missing])):
+            for i in missing:
+                rendered[i] = value[i].render(context=context)
+
+        to_cache = {keys[i]: str(rendered[i]) for i in missing if keys[i] is not None}
+        if to_cache:
+            render_cache.set_many(to_cache)
+
+        return [
+            (mark_safe(rendered[i]), raw_item["type"])
+            for i, raw_item in enumerate(prep_value)
+        ]
 
     def get_searchable_content(self, value):
         if not self.search_index:
             return []
-        content = []
 
+        search_cache = get_block_search_cache()
+        if search_cache is not None and isinstance(value, StreamValue):
+            return self.get_searchable_content_with_cache(value, search_cache)
+
+        content = []
         for child in value:
             content.extend(child.block.get_searchable_content(child.value))
 
         return content
 
+    def get_searchable_content_with_cache(self, value, search_cache):
+        """
+        Return the searchable content of the StreamValue ``value``, taking the content
+        of each child from ``search_cache`` where possible, and storing the others
+        there. Children are only converted from their raw data if they are not in
+        the cache.
+        """
+        # As in render_children_with_cache(), key children on their current value
+        keys = []
+        for raw_item in value.get_prep_value(assign_ids=False):
+            child_block = self.child_blocks[raw_item["type"]]
+            keys.append(
+                child_block.get_search_cache_key(raw_item.get("id"), raw_item["value"])
+            )
+
+        cached = search_cache.get_many([key for key in keys if key is not None])
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        StreamValue._prefetch_items_in_bulk((value, i) for i in missing)
+
+        content = []
+        to_cache = {}
+        for i, key in enumerate(keys):
+            if key in cached:
+                content.extend(cached[key])
+                continue
+
+            child = value[i]
+            child_content = list(child.block.get_searchable_content(child.value))
+            content.extend(child_content)
+            if key is not None:
+                to_cache[key] = child_content
+
+        if to_cache:
+            search_cache.set_many(to_cache)
+
+        return content
+
     def extract_references(self, value):
         for child in value:
             for (
@@ -492,6 +594,23 @@ class StreamBlock(BaseStreamBlock, metaclass=DeclarativeSubBlocksMetaclass):
     pass
 
 
+def get_rich_text_sources(value):
+    """
+    Yield the source HTML of every RichText value within a block value, including
+    those nested within StreamBlock, ListBlock and StructBlock values.
+    """
+    if isinstance(value, RichText):
+        yield value.source
+    elif isinstance(value, BoundBlock):
+        yield from get_rich_text_sources(value.value)
+    elif isinstance(value, MutableSequence):
+        for child in value:
+            yield from get_rich_text_sources(child)
+    elif isinstance(value, Mapping):
+        for child in value.values():
+            yield from get_rich_text_sources(child)
+
+
 class StreamValue(MutableSequence):
     """
     Custom type used to represent the value of a StreamBlock; behaves as a sequence of BoundBlocks
@@ -620,7 +739,9 @@ class StreamValue(MutableSequence):
         def __len__(self):
             return len(self.block_names)
 
-    def __init__(self, stream_block, stream_data, is_lazy=False, raw_text=None):
+    def __init__(
+        self, stream_block, stream_data, is_lazy=False, raw_text=None, raw_json=None
+    ):
         """
         Construct a StreamValue linked to the given StreamBlock,
         with child values given in stream_data.
@@ -639,10 +760,20 @@ class StreamValue(MutableSequence):
         migrated to a StreamField. In this situation we return a blank StreamValue
         with the raw text accessible under the `raw_text` attribute, so that migration
         code can be rewritten to convert it as desired.
+
+        Passing raw_json (a JSON string or bytes, as stored in the database) in place of
+        stream_data defers parsing it, and the checks done by StreamBlock.to_python, until
+        the content of the stream is first accessed. This avoids the cost of parsing
+        StreamFields that are loaded but never used, such as in listings.
         """
         self.stream_block = (
             stream_block  # the StreamBlock object that handles this value
         )
+
+        if raw_json is not None:
+            self._raw_json = raw_json
+            return
+
         self.is_lazy = is_lazy
         self.raw_text = raw_text
 
@@ -659,6 +790,46 @@ class StreamValue(MutableSequence):
                 self._construct_stream_child(item) for item in stream_data
             ]
 
+    # Attributes that are set once the JSON passed as raw_json has been parsed
+    _RAW_JSON_ATTRIBUTES = frozenset(
+        ["is_lazy", "raw_text", "_raw_data", "_bound_blocks"]
+    )
+
+    def __getattr__(self, name):
+        # Only called for attributes that haven't been set, such as those set by
+        # _parse_raw_json() when the value was constructed from raw_json
+        if name in self._RAW_JSON_ATTRIBUTES and "_raw_json" in self.__dict__:
+            self._parse_raw_json()
+            return getattr(self, name)
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def _parse_raw_json(self):
+        raw_json = self.__dict__.pop("_raw_json")
+        try:
+            stream_data = wagtail_json.loads(raw_json)
+        except ValueError:
+            # Leave StreamBlock.to_python to handle text that is not valid JSON
+            stream_data = force_str(raw_json)
+
+        value = self.stream_block.to_python(stream_data)
+        self.is_lazy = value.is_lazy
+        self.raw_text = value.raw_text
+        self._raw_data = value._raw_data
+        self._bound_blocks = value._bound_blocks
+
+    def _get_raw_json_data(self):
+        """
+        Return the JSON passed as raw_json decoded, but not converted to Python values
+        or checked by StreamBlock.to_python, so that it can be written back unchanged.
+        Text that is not valid JSON is returned as it is.
+        """
+        try:
+            return wagtail_json.loads(self._raw_json) or []
+        except ValueError:
+            return force_str(self._raw_json)
+
     def _construct_stream_child(self, item):
         """
         Create a StreamChild instance from a (type, value, id) or (type, value) tuple,
@@ -730,13 +901,62 @@ class StreamValue(MutableSequence):
                 child_block, value, id=self._raw_data[i].get("id")
             )
 
-    def get_prep_value(self):
+    @staticmethod
+    def prefetch_blocks_in_bulk(stream_values):
+        """
+        Populate _bound_blocks for every item in the given StreamValues that exists in
+        _raw_data but does not already exist in _bound_blocks.
+
+        This is equivalent to calling _prefetch_blocks for every block type on each
+        StreamValue in turn, but values are passed to each child block's bulk_to_python
+        method together, so that database lookups are batched into a single query per
+        block type across all of the streams, rather than one per stream.
+        """
+        StreamValue._prefetch_items_in_bulk(
+            (stream_value, i)
+            for stream_value in stream_values
+            for i in range(len(stream_value._raw_data))
+        )
+
+    @staticmethod
+    def _prefetch_items_in_bulk(items):
+        """
+        Populate _bound_blocks for each of the given ``(stream_value, index)`` pairs
+        that does not already exist in _bound_blocks, with a single call to
+        bulk_to_python per child block.
+        """
+        # map id(child_block) => (child_block, [(stream_value, index within the stream), ...])
+        items_by_block = {}
+        for stream_value, i in items:
+            if stream_value._bound_blocks[i] is not None:
+                continue
+            raw_item = stream_value._raw_data[i]
+            child_block = stream_value.stream_block.child_blocks[raw_item["type"]]
+            items_by_block.setdefault(id(child_block), (child_block, []))[1].append(
+                (stream_value, i)
+            )
+
+        for child_block, items in items_by_block.values():
+            converted_values = child_block.bulk_to_python(
+                [stream_value._raw_data[i]["value"] for stream_value, i in items]
+            )
+            for (stream_value, i), value in zip(items, converted_values):
+                stream_value._bound_blocks[i] = StreamValue.StreamChild(
+                    child_block, value, id=stream_value._raw_data[i].get("id")
+                )
+
+    def get_prep_value(self, assign_ids=True):
+        """
+        Return the raw JSONish data of the stream, reflecting any changes made to
+        its children. Children that are missing an ID are assigned a new one, unless
+        ``assign_ids`` is ``False``.
+        """
         prep_value = []
 
         for i, item in enumerate(self._bound_blocks):
             if item:
                 # Convert the native value back into raw JSONish data
-                if not item.id:
+                if not item.id and assign_ids:
                     item.id = str(uuid.uuid4())
 
                 prep_value.append(item.get_prep_value())
@@ -745,7 +965,7 @@ class StreamValue(MutableSequence):
                 # still usable (but ensure it has an ID before returning it)
 
                 raw_item = self._raw_data[i]
-                if not raw_item.get("id"):
+                if not raw_item.get("id") and assign_ids:
                     raw_item["id"] = str(uuid.uuid4())
 
                 prep_value.append(raw_item)
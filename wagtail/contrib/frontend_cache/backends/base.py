@@ -1,4 +1,5 @@
 import logging
+import time
 
 from django.http.request import validate_host
 
@@ -9,9 +10,35 @@ __all__ = ["BaseBackend"]
 
 
 class BaseBackend:
+    # The maximum number of URLs that can be purged with a single call to
+    # purge_batch(), or None if there is no limit
+    batch_size = None
+
+    # The maximum number of calls to purge_batch() per second, or None if
+    # there is no limit
+    rate_limit = None
+
+    # The response header that tells the cache which cache tags a response has,
+    # and the separator between tags. Backends that can purge by cache tag
+    # (with purge_tags()) set the header.
+    cache_tag_header = None
+    cache_tag_separator = " "
+
+    # The maximum number of cache tags that can be purged with a single call
+    # to purge_tags(), or None if there is no limit
+    tag_batch_size = None
+
     def __init__(self, params):
         # If unspecified, invalidate all hosts
         self.hostnames = params.get("HOSTNAMES", ["*"])
+        self.batch_size = params.get("BATCH_SIZE", self.batch_size)
+        self.rate_limit = params.get("RATE_LIMIT", self.rate_limit)
+        self.cache_tag_header = params.get("CACHE_TAG_HEADER", self.cache_tag_header)
+        self._last_batch_time = None
+
+    @property
+    def supports_cache_tags(self) -> bool:
+        return bool(self.cache_tag_header)
 
     def purge(self, url) -> None:
         raise NotImplementedError
@@ -21,6 +48,53 @@ class BaseBackend:
         for url in urls:
             self.purge(url)
 
+    def purge_in_batches(self, urls) -> int:
+        """
+        Purge ``urls`` in as few calls to ``purge_batch()`` as ``batch_size`` allows,
+        waiting between them if needed to stay within ``rate_limit``. Returns the
+        number of batches sent.
+        """
+        urls = list(urls)
+        if not urls:
+            return 0
+        batch_size = self.batch_size or len(urls)
+        batch_count = 0
+        for i in range(0, len(urls), batch_size):
+            self._wait_for_rate_limit()
+            self.purge_batch(urls[i : i + batch_size])
+            batch_count += 1
+        return batch_count
+
+    def purge_tags(self, tags) -> None:
+        """
+        Purge every response that has any of the cache tags in ``tags``.
+        """
+        raise NotImplementedError
+
+    def purge_tags_in_batches(self, tags) -> int:
+        """
+        Purge ``tags`` in as few calls to ``purge_tags()`` as ``tag_batch_size``
+        allows, waiting between them if needed to stay within ``rate_limit``.
+        Returns the number of batches sent.
+        """
+        tags = list(tags)
+        if not tags:
+            return 0
+        batch_size = self.tag_batch_size or len(tags)
+        batch_count = 0
+        for i in range(0, len(tags), batch_size):
+            self._wait_for_rate_limit()
+            self.purge_tags(tags[i : i + batch_size])
+            batch_count += 1
+        return batch_count
+
+    def _wait_for_rate_limit(self):
+        if self.rate_limit and self._last_batch_time is not None:
+            wait = self._last_batch_time + 1 / self.rate_limit - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        self._last_batch_time = time.monotonic()
+
     def invalidates_hostname(self, hostname) -> bool:
         """
         Can `hostname` be invalidated by this backend?
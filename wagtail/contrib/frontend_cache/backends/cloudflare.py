@@ -13,6 +13,10 @@ __all__ = ["CloudflareBackend"]
 
 class CloudflareBackend(BaseBackend):
     CHUNK_SIZE = 30
+    batch_size = CHUNK_SIZE
+    cache_tag_header = "Cache-Tag"
+    cache_tag_separator = ","
+    tag_batch_size = 30
 
     def __init__(self, params):
         super().__init__(params)
@@ -47,6 +51,13 @@ class CloudflareBackend(BaseBackend):
             )
 
     def _purge_urls(self, urls):
+        self._purge({"files": urls}, urls)
+
+    def _purge(self, data, items):
+        """
+        Send a purge_cache request with the given ``data``, logging an error for
+        each of the URLs or cache tags in ``items`` if it fails.
+        """
         try:
             purge_url = (
                 "https://api.cloudflare.com/client/v4/zones/{}/purge_cache".format(
@@ -62,8 +73,6 @@ class CloudflareBackend(BaseBackend):
                 headers["X-Auth-Email"] = self.cloudflare_email
                 headers["X-Auth-Key"] = self.cloudflare_api_key
 
-            data = {"files": urls}
-
             response = requests.delete(
                 purge_url,
                 json=data,
@@ -76,17 +85,17 @@ class CloudflareBackend(BaseBackend):
                 if response.status_code != 200:
                     response.raise_for_status()
                 else:
-                    for url in urls:
+                    for item in items:
                         logger.error(
                             "Couldn't purge '%s' from Cloudflare. Unexpected JSON parse error.",
-                            url,
+                            item,
                         )
 
         except requests.exceptions.HTTPError as e:
-            for url in urls:
+            for item in items:
                 logging.exception(
                     "Couldn't purge '%s' from Cloudflare. HTTPError: %d",
-                    url,
+                    item,
                     e.response.status_code,
                 )
             return
@@ -95,10 +104,10 @@ class CloudflareBackend(BaseBackend):
             error_messages = ", ".join(
                 [str(err["message"]) for err in response_json["errors"]]
             )
-            for url in urls:
+            for item in items:
                 logger.error(
                     "Couldn't purge '%s' from Cloudflare. Cloudflare errors '%s'",
-                    url,
+                    item,
                     error_messages,
                 )
             return
@@ -106,9 +115,15 @@ class CloudflareBackend(BaseBackend):
     def purge_batch(self, urls):
         # Break the batched URLs in to chunks to fit within Cloudflare's maximum size for
         # the purge_cache call (https://api.cloudflare.com/#zone-purge-files-by-url)
-        for i in range(0, len(urls), self.CHUNK_SIZE):
-            chunk = urls[i : i + self.CHUNK_SIZE]
+        for i in range(0, len(urls), self.batch_size):
+            chunk = urls[i : i + self.batch_size]
             self._purge_urls(chunk)
 
     def purge(self, url):
         self._purge_urls([url])
+
+    def purge_tags(self, tags):
+        # https://developers.cloudflare.com/cache/how-to/purge-cache/purge-by-tags/
+        for i in range(0, len(tags), self.tag_batch_size):
+            chunk = tags[i : i + self.tag_batch_size]
+            self._purge({"tags": chunk}, chunk)
@@ -19,11 +19,21 @@ class PurgeRequest(Request):
 
 
 class HTTPBackend(BaseBackend):
+    # Each URL is purged with a separate request
+    batch_size = 1
+
+    # Caches behind this backend don't necessarily support cache tags, so they
+    # are only sent (and purged) if CACHE_TAG_HEADER is set, such as to
+    # "Surrogate-Key" for Fastly, or "xkey" for Varnish's xkey module. Tags are
+    # purged by sending the tags to purge in the same header.
+
     def __init__(self, params):
         super().__init__(params)
         location_url_parsed = urlsplit(params.pop("LOCATION"))
         self.cache_scheme = location_url_parsed.scheme
         self.cache_netloc = location_url_parsed.netloc
+        self.tag_purge_method = params.pop("TAG_PURGE_METHOD", "PURGE")
+        self.tag_purge_header = params.pop("TAG_PURGE_HEADER", self.cache_tag_header)
 
     def purge(self, url):
         url_parsed = urlsplit(url)
@@ -62,3 +72,29 @@ class HTTPBackend(BaseBackend):
             logger.error(
                 "Couldn't purge '%s' from HTTP cache. URLError: %s", url, e.reason
             )
+
+    def purge_tags(self, tags):
+        request = Request(
+            url=urlunsplit([self.cache_scheme, self.cache_netloc, "/", "", ""]),
+            headers={
+                self.tag_purge_header: " ".join(tags),
+                "User-Agent": "Wagtail-frontendcache/" + __version__,
+            },
+            method=self.tag_purge_method,
+        )
+
+        try:
+            urlopen(request)
+        except HTTPError as e:
+            logger.error(
+                "Couldn't purge cache tags '%s' from HTTP cache. HTTPError: %d %s",
+                " ".join(tags),
+                e.code,
+                e.reason,
+            )
+        except URLError as e:
+            logger.error(
+                "Couldn't purge cache tags '%s' from HTTP cache. URLError: %s",
+                " ".join(tags),
+                e.reason,
+            )
@@ -0,0 +1,81 @@
+"""
+Cache tags (also known as surrogate keys) label each page response with the objects
+it was rendered from, so that when any of those objects changes, every response that
+shows it can be purged from the frontend cache in a single request.
+
+Each page response is tagged with the page itself, and each object that the page
+references (such as linked pages, images, documents and snippets), as recorded in
+the reference index.
+"""
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+
+from wagtail.models import ReferenceIndex
+
+from .utils import get_cache_tag_headers
+
+# Cache tags beyond this total length are left out of the header, as CDNs limit
+# the size of response headers
+MAX_CACHE_TAG_HEADER_LENGTH = 8000
+
+
+def cache_tags_enabled() -> bool:
+    return getattr(settings, "WAGTAILFRONTENDCACHE_CACHE_TAGS", False)
+
+
+def _get_cache_tag_for_content_type(content_type, pk) -> str:
+    return f"{content_type.app_label}.{content_type.model}-{pk}"
+
+
+def get_cache_tag(obj) -> str:
+    """
+    Return the cache tag for a model instance. Instances of models that use
+    multi-table inheritance (such as pages) are tagged by their base model.
+    """
+    return _get_cache_tag_for_content_type(
+        ReferenceIndex._get_base_content_type(obj), obj.pk
+    )
+
+
+def get_page_cache_tags(page) -> list[str]:
+    """
+    Return the cache tags for a response of ``page``. Page models can define a
+    ``get_cache_tags()`` method to return extra tags, such as for objects that are
+    shown on the page without being referenced by it.
+    """
+    tags = [get_cache_tag(page)]
+
+    references = (
+        ReferenceIndex.get_references_for_object(page)
+        .order_by()
+        .values_list("to_content_type_id", "to_object_id")
+        .distinct()
+    )
+    for content_type_id, object_id in references:
+        tags.append(
+            _get_cache_tag_for_content_type(
+                ContentType.objects.get_for_id(content_type_id), object_id
+            )
+        )
+
+    if hasattr(page, "get_cache_tags"):
+        tags.extend(page.get_cache_tags())
+
+    return list(dict.fromkeys(tags))
+
+
+def add_cache_tag_headers(response, tags) -> None:
+    """
+    Add ``tags`` to the response in the header (or headers) that the configured
+    frontend cache backends read cache tags from.
+    """
+    for header, separator in get_cache_tag_headers().items():
+        included_tags = []
+        length = 0
+        for tag in tags:
+            length += len(tag) + len(separator)
+            if length > MAX_CACHE_TAG_HEADER_LENGTH:
+                break
+            included_tags.append(tag)
+        response[header] = separator.join(included_tags)
@@ -0,0 +1,182 @@
+"""
+A queue that coalesces frontend cache purges, so that purging many pages in quick
+succession (such as when publishing pages in bulk) sends a few large purge requests
+to each backend, rather than a request per page.
+
+URLs are added to the queue when the current transaction is committed, and are
+sent to ``purge_urls_from_cache_task`` together once the queue has been collecting
+URLs for ``WAGTAILFRONTENDCACHE_PURGE_WINDOW`` seconds, or holds more than
+``WAGTAILFRONTENDCACHE_PURGE_QUEUE_SIZE`` URLs. Duplicate URLs are only purged once.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger("wagtail.frontendcache")
+
+
+class PurgeQueue:
+    """
+    Collects URLs to purge within a process, grouped by the ``backend_settings`` and
+    ``backends`` they are to be purged with.
+    """
+
+    def __init__(self, window: float, max_size: int = 10000):
+        self.window = window
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._groups = []
+        self._pending_count = 0
+        self._first_added_at = None
+        self._timer = None
+
+        self.added_count = 0
+        self.duplicate_count = 0
+        self.flush_count = 0
+        self.flushed_count = 0
+
+    def add(self, urls, backend_settings=None, backends=None) -> None:
+        """
+        Queue ``urls`` to be purged once the current transaction is committed.
+        URLs added within a transaction that is rolled back are not purged.
+        """
+        urls = list(urls)
+        if urls:
+            transaction.on_commit(
+                partial(self._add_committed, urls, backend_settings, backends)
+            )
+
+    def _add_committed(self, urls, backend_settings, backends):
+        with self._lock:
+            for group_settings, group_backends, group_urls in self._groups:
+                if group_settings == backend_settings and group_backends == backends:
+                    break
+            else:
+                group_urls = set()
+                self._groups.append((backend_settings, backends, group_urls))
+
+            count = len(group_urls)
+            group_urls.update(urls)
+            added = len(group_urls) - count
+            self.added_count += len(urls)
+            self.duplicate_count += len(urls) - added
+            self._pending_count += added
+
+            if self._first_added_at is None:
+                self._first_added_at = time.monotonic()
+                self._timer = threading.Timer(self.window, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+            is_full = self._pending_count >= self.max_size
+
+        if is_full:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Send all URLs in the queue to be purged now.
+        """
+        from .tasks import purge_urls_from_cache_task
+
+        with self._lock:
+            groups = self._groups
+            pending_count = self._pending_count
+            if self._timer is not None:
+                self._timer.cancel()
+            self._groups = []
+            self._pending_count = 0
+            self._first_added_at = None
+            self._timer = None
+
+            if groups:
+                self.flush_count += 1
+                self.flushed_count += pending_count
+
+        if not groups:
+            return
+
+        logger.info("Flushing %d URLs from the purge queue", pending_count)
+        for backend_settings, backends, urls in groups:
+            # Enqueue the task on commit, if flushed from within a transaction
+            transaction.on_commit(
+                partial(
+                    purge_urls_from_cache_task.enqueue,
+                    sorted(urls),
+                    backend_settings,
+                    backends,
+                )
+            )
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Close any database connections opened by this thread
+            connections.close_all()
+
+    def get_metrics(self) -> dict:
+        """
+        Return statistics about the queue in this process, for monitoring.
+
+        - ``pending_urls``: the number of URLs waiting to be purged
+        - ``pending_age``: how long (in seconds) the oldest of them has been waiting
+        - ``added_urls``: the number of URLs added to the queue, including duplicates
+        - ``duplicate_urls``: the number of URLs that were already waiting to be purged
+        - ``flushes``: the number of times URLs have been sent to be purged
+        - ``flushed_urls``: the number of URLs sent to be purged
+        """
+        with self._lock:
+            return {
+                "pending_urls": self._pending_count,
+                "pending_age": (
+                    time.monotonic() - self._first_added_at
+                    if self._first_added_at is not None
+                    else 0
+                ),
+                "added_urls": self.added_count,
+                "duplicate_urls": self.duplicate_count,
+                "flushes": self.flush_count,
+                "flushed_urls": self.flushed_count,
+            }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_purge_queue() -> PurgeQueue | None:
+    """
+    Return the purge queue for this process, as configured by the
+    ``WAGTAILFRONTENDCACHE_PURGE_WINDOW`` and ``WAGTAILFRONTENDCACHE_PURGE_QUEUE_SIZE``
+    settings, or ``None`` if it is disabled.
+    """
+    global _queue
+
+    window = getattr(settings, "WAGTAILFRONTENDCACHE_PURGE_WINDOW", None)
+    if not window:
+        return None
+    max_size = getattr(settings, "WAGTAILFRONTENDCACHE_PURGE_QUEUE_SIZE", 10000)
+
+    with _queue_lock:
+        if _queue is None or _queue.window != window or _queue.max_size != max_size:
+            if _queue is not None:
+                _queue.flush()
+            _queue = PurgeQueue(window, max_size)
+        return _queue
+
+
+@atexit.register
+def _flush_on_exit():
+    # Don't lose URLs waiting in the queue when a process (such as a management
+    # command) exits before its window has elapsed
+    if _queue is not None:
+        _queue.flush()
@@ -1,15 +1,158 @@
+import functools
+
 from django.apps import apps
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from wagtail.contrib.frontend_cache.utils import (
+    get_backends,
+    purge_page_from_cache,
+    purge_referencing_pages_from_cache,
+    purge_tags_from_cache,
+)
+from wagtail.signals import page_published, page_unpublished, unpublished
+
+# Fields that are saved on their own when a draft is saved or an object is locked,
+# without changing what is live on the site
+DRAFT_ONLY_FIELDS = {
+    "latest_revision",
+    "has_unpublished_changes",
+    "locked",
+    "locked_at",
+    "locked_by",
+}
+
+
+@functools.cache
+def get_url_backends():
+    """
+    Return the names of the backends that purge by URL rather than by cache tag.
+
+    Backends can be expensive to instantiate, so this is worked out once per process.
+    """
+    from wagtail.contrib.frontend_cache.cache_tags import cache_tags_enabled
+
+    tags_enabled = cache_tags_enabled()
+    return tuple(
+        name
+        for name, backend in get_backends().items()
+        if not (tags_enabled and backend.supports_cache_tags)
+    )
+
+
+@receiver(setting_changed)
+def clear_url_backends_cache(*, setting, **kwargs):
+    if setting in (
+        "WAGTAILFRONTENDCACHE",
+        "WAGTAILFRONTENDCACHE_LOCATION",
+        "WAGTAILFRONTENDCACHE_CACHE_TAGS",
+    ):
+        get_url_backends.cache_clear()
+
 
-from wagtail.contrib.frontend_cache.utils import purge_page_from_cache
-from wagtail.signals import page_published, page_unpublished
+def purge_page(page):
+    from wagtail.contrib.frontend_cache.cache_tags import (
+        cache_tags_enabled,
+        get_cache_tag,
+    )
+
+    if not cache_tags_enabled():
+        purge_page_from_cache(page)
+        return
+
+    # Backends that support cache tags purge the page, and every page that
+    # references it, by its tag. Other backends purge the page's URLs.
+    url_backends = get_url_backends()
+    if url_backends:
+        purge_page_from_cache(page, backends=list(url_backends))
+    purge_tags_from_cache([get_cache_tag(page)])
 
 
 def page_published_signal_handler(instance, **kwargs):
-    purge_page_from_cache(instance)
+    purge_page(instance)
 
 
 def page_unpublished_signal_handler(instance, **kwargs):
-    purge_page_from_cache(instance)
+    purge_page(instance)
+
+
+@functools.cache
+def _get_shown_model_classes():
+    classes = []
+
+    if apps.is_installed("wagtail.images"):
+        from wagtail.images.models import AbstractImage
+
+        classes.append(AbstractImage)
+
+    if apps.is_installed("wagtail.documents"):
+        from wagtail.documents.models import AbstractDocument
+
+        classes.append(AbstractDocument)
+
+    return tuple(classes)
+
+
+def is_shown_on_pages(model):
+    """
+    Should pages that show instances of ``model`` be purged when they change?
+    This applies to images, documents and snippets.
+    """
+    return hasattr(model, "snippet_viewset") or issubclass(
+        model, _get_shown_model_classes()
+    )
+
+
+def object_changed_signal_handler(sender, instance, **kwargs):
+    # This is connected for all models, as snippets can be registered at any time,
+    # so return as early as possible for the models it doesn't apply to
+    if not is_shown_on_pages(sender):
+        return
+
+    from wagtail.contrib.frontend_cache.cache_tags import (
+        cache_tags_enabled,
+        get_cache_tag,
+    )
+
+    if cache_tags_enabled():
+        purge_tags_from_cache([get_cache_tag(instance)])
+
+    # Pages that show the object are found through the reference index for
+    # backends that can't purge them by its cache tag
+    url_backends = get_url_backends()
+    if url_backends:
+        purge_referencing_pages_from_cache([instance], backends=list(url_backends))
+
+
+def object_saved_signal_handler(sender, instance, update_fields=None, **kwargs):
+    if not is_shown_on_pages(sender):
+        return
+
+    from wagtail.models import DraftStateMixin
+
+    # Saving a draft doesn't change what pages show. Unpublishing is handled
+    # by object_changed_signal_handler, through the unpublished signal.
+    if isinstance(instance, DraftStateMixin) and (
+        not instance.live
+        or (update_fields is not None and set(update_fields) <= DRAFT_ONLY_FIELDS)
+    ):
+        return
+
+    object_changed_signal_handler(sender, instance, **kwargs)
+
+
+def object_deleted_signal_handler(sender, instance, **kwargs):
+    if not is_shown_on_pages(sender):
+        return
+
+    from wagtail.models import DraftStateMixin
+
+    # Pages don't show objects that aren't live
+    if isinstance(instance, DraftStateMixin) and not instance.live:
+        return
+
+    object_changed_signal_handler(sender, instance, **kwargs)
 
 
 def register_signal_handlers():
@@ -21,3 +164,7 @@ def register_signal_handlers():
     for model in indexed_models:
         page_published.connect(page_published_signal_handler, sender=model)
         page_unpublished.connect(page_unpublished_signal_handler, sender=model)
+
+    post_save.connect(object_saved_signal_handler)
+    post_delete.connect(object_deleted_signal_handler)
+    unpublished.connect(object_changed_signal_handler)
@@ -62,7 +62,8 @@ def purge_urls_from_cache_task(urls, backend_settings=None, backends=None):
 
     urls_by_hostname = defaultdict(list)
 
-    for url in urls:
+    # Only purge each URL once
+    for url in dict.fromkeys(urls):
         urls_by_hostname[urlsplit(url).netloc].append(url)
 
     for hostname, urls in urls_by_hostname.items():
@@ -80,4 +81,23 @@ def purge_urls_from_cache_task(urls, backend_settings=None, backends=None):
             for url in urls:
                 logger.info("[%s] Purging URL: %s", backend_name, url)
 
-            backend.purge_batch(urls)
+            batch_count = backend.purge_in_batches(urls)
+            logger.info(
+                "[%s] Purged %d URLs in %d batches",
+                backend_name,
+                len(urls),
+                batch_count,
+            )
+
+
+@task()
+def purge_tags_from_cache_task(tags, backend_settings=None, backends=None):
+    if not tags:
+        return
+
+    for backend_name, backend in get_backends(backend_settings, backends).items():
+        if not backend.supports_cache_tags:
+            continue
+
+        logger.info("[%s] Purging cache tags: %s", backend_name, ", ".join(tags))
+        backend.purge_tags_in_batches(tags)
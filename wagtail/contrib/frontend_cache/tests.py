@@ -1,10 +1,13 @@
+import uuid
 from unittest import mock
 from urllib.error import HTTPError, URLError
 
 import requests
 from azure.mgmt.cdn import CdnManagementClient
 from azure.mgmt.frontdoor import FrontDoorManagementClient
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 from django.test import SimpleTestCase, TestCase
 from django.test.utils import override_settings
 
@@ -16,9 +19,17 @@ from wagtail.contrib.frontend_cache.backends import (
     CloudfrontBackend,
     HTTPBackend,
 )
-from wagtail.contrib.frontend_cache.utils import get_backends
-from wagtail.models import Page
-from wagtail.test.testapp.models import EventIndex, EventPage
+from wagtail.contrib.frontend_cache.queue import get_purge_queue
+from wagtail.contrib.frontend_cache.signal_handlers import get_url_backends
+from wagtail.contrib.frontend_cache.utils import (
+    get_backends,
+    get_cache_tag_headers,
+    get_referencing_pages,
+)
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Page, ReferenceIndex
+from wagtail.test.testapp.models import Advert, DraftStateModel, EventIndex, EventPage
 
 from .utils import (
     PurgeBatch,
@@ -466,6 +477,16 @@ class MockBackend(BaseBackend):
         PURGED_URLS.add(url)
 
 
+PURGED_BATCHES = []
+
+
+class MockBatchBackend(BaseBackend):
+    batch_size = 2
+
+    def purge_batch(self, urls):
+        PURGED_BATCHES.append(urls)
+
+
 class MockCloudflareBackend(CloudflareBackend):
     def _purge_urls(self, urls):
         if len(urls) > self.CHUNK_SIZE:
@@ -766,6 +787,72 @@ class TestCachePurgingSignals(TestCase):
             {"http://localhost/en/events/", "http://localhost/en/events/past/"},
         )
 
+    def test_purge_referencing_pages_on_image_change(self):
+        image = Image.objects.create(
+            title="Christmas", file=get_test_image_file(), collection_id=1
+        )
+        page = EventPage.objects.get(url_path="/home/events/christmas/")
+        page.feed_image = image
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
+
+        PURGED_URLS.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            image.save()
+        self.assertEqual(PURGED_URLS, {"http://localhost/events/christmas/"})
+
+        # Pages that aren't live aren't purged
+        page.unpublish()
+        PURGED_URLS.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.assertEqual(PURGED_URLS, set())
+
+    def test_purge_referencing_pages_through_snippets(self):
+        image = Image.objects.create(
+            title="Christmas", file=get_test_image_file(), collection_id=1
+        )
+        advert = Advert.objects.create(text="Christmas sale")
+        page = EventPage.objects.get(url_path="/home/events/christmas/")
+        page.advert_placements.create(advert=advert, colour="red")
+        ReferenceIndex.create_or_update_for_object(page)
+
+        # The test Advert model doesn't reference images, so record a reference
+        # from the advert to the image directly
+        advert_content_type = ContentType.objects.get_for_model(Advert)
+        ReferenceIndex.objects.create(
+            content_type=advert_content_type,
+            base_content_type=advert_content_type,
+            object_id=str(advert.pk),
+            to_content_type=ContentType.objects.get_for_model(Image),
+            to_object_id=str(image.pk),
+            model_path="image",
+            content_path="image",
+            content_path_hash=uuid.uuid4(),
+        )
+
+        self.assertEqual(list(get_referencing_pages([image])), [page.page_ptr])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.save()
+        self.assertEqual(PURGED_URLS, {"http://localhost/events/christmas/"})
+
+    def test_no_purge_of_pages_referencing_pages(self):
+        image = Image.objects.create(
+            title="Christmas", file=get_test_image_file(), collection_id=1
+        )
+        page = EventPage.objects.get(url_path="/home/events/christmas/")
+        page.feed_image = image
+        page.save()
+        ReferenceIndex.create_or_update_for_object(page)
+        linking_page = EventPage.objects.get(url_path="/home/events/saint-patrick/")
+        linking_page.body = f'<p><a linktype="page" id="{page.pk}">Christmas</a></p>'
+        linking_page.save()
+        ReferenceIndex.create_or_update_for_object(linking_page)
+
+        # The linking page doesn't show the image
+        self.assertEqual(list(get_referencing_pages([image])), [page.page_ptr])
+
 
 class TestPurgeBatchClass(TestCase):
     # Tests the .add_*() methods on PurgeBatch. The .purge() method is tested
@@ -851,3 +938,307 @@ class TestPurgeBatchClass(TestCase):
             "Couldn't purge 'http://localhost/events/' from Cloudflare. HTTPError: 500",
             log_output.output[0],
         )
+
+
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "batch": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBatchBackend",
+        },
+    },
+    WAGTAILFRONTENDCACHE_PURGE_WINDOW=60,
+)
+class TestPurgeQueue(TestCase):
+    def setUp(self):
+        PURGED_BATCHES.clear()
+        self.queue = get_purge_queue()
+
+    def tearDown(self):
+        self.queue.flush()
+
+    def test_disabled_by_default(self):
+        with override_settings(WAGTAILFRONTENDCACHE_PURGE_WINDOW=None):
+            self.assertIsNone(get_purge_queue())
+
+    def test_purges_are_coalesced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_urls_from_cache(["http://localhost/foo", "http://localhost/bar"])
+            purge_url_from_cache("http://localhost/foo")
+            purge_url_from_cache("http://localhost/baz")
+
+        self.assertEqual(PURGED_BATCHES, [])
+        metrics = self.queue.get_metrics()
+        self.assertEqual(metrics["pending_urls"], 3)
+        self.assertEqual(metrics["added_urls"], 4)
+        self.assertEqual(metrics["duplicate_urls"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.queue.flush()
+
+        # The URLs are sent together, in batches of the backend's batch size
+        self.assertEqual(
+            PURGED_BATCHES,
+            [
+                ["http://localhost/bar", "http://localhost/baz"],
+                ["http://localhost/foo"],
+            ],
+        )
+        metrics = self.queue.get_metrics()
+        self.assertEqual(metrics["pending_urls"], 0)
+        self.assertEqual(metrics["flushes"], 1)
+        self.assertEqual(metrics["flushed_urls"], 3)
+
+    def test_purges_are_grouped_by_backend(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_url_from_cache("http://localhost/foo")
+            purge_url_from_cache("http://localhost/bar", backends=["batch"])
+            purge_url_from_cache("http://localhost/baz", backends=["other"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.queue.flush()
+
+        self.assertEqual(
+            PURGED_BATCHES, [["http://localhost/foo"], ["http://localhost/bar"]]
+        )
+
+    def test_rolled_back_purges_are_discarded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    purge_url_from_cache("http://localhost/foo")
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(self.queue.get_metrics()["pending_urls"], 0)
+
+    @override_settings(WAGTAILFRONTENDCACHE_PURGE_QUEUE_SIZE=3)
+    def test_flushed_when_full(self):
+        self.queue = get_purge_queue()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_urls_from_cache(["http://localhost/foo", "http://localhost/bar"])
+        self.assertEqual(PURGED_BATCHES, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_urls_from_cache(["http://localhost/baz"])
+        self.assertEqual(len(PURGED_BATCHES), 2)
+
+
+class TestBackendBatching(SimpleTestCase):
+    def setUp(self):
+        PURGED_BATCHES.clear()
+
+    def test_purge_in_batches(self):
+        backend = MockBatchBackend({"BATCH_SIZE": 3})
+        urls = [f"http://localhost/{i}" for i in range(7)]
+
+        self.assertEqual(backend.purge_in_batches(urls), 3)
+        self.assertEqual(PURGED_BATCHES, [urls[:3], urls[3:6], urls[6:]])
+
+    def test_purge_nothing_in_batches(self):
+        # Without a batch size, all URLs would be purged in a single batch
+        backend = MockBatchBackend({"BATCH_SIZE": None})
+
+        self.assertEqual(backend.purge_in_batches([]), 0)
+        self.assertEqual(PURGED_BATCHES, [])
+
+    @mock.patch("wagtail.contrib.frontend_cache.backends.base.time.sleep")
+    def test_rate_limit(self, sleep):
+        backend = MockBatchBackend({"RATE_LIMIT": 0.5})
+        backend.purge_in_batches([f"http://localhost/{i}" for i in range(6)])
+
+        # Two seconds between each of the three batches
+        self.assertEqual(sleep.call_count, 2)
+        self.assertAlmostEqual(sleep.call_args[0][0], 2, places=1)
+
+
+PURGED_TAGS = set()
+
+
+class MockTagBackend(MockBackend):
+    cache_tag_header = "Cache-Tag"
+    cache_tag_separator = ","
+
+    def purge_tags(self, tags):
+        PURGED_TAGS.update(tags)
+
+
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "cdn": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockTagBackend",
+        },
+        "varnish": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBackend",
+        },
+    },
+    WAGTAILFRONTENDCACHE_CACHE_TAGS=True,
+)
+class TestCacheTags(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        PURGED_URLS.clear()
+        PURGED_TAGS.clear()
+
+    def test_get_cache_tag_headers(self):
+        self.assertEqual(get_cache_tag_headers(), {"Cache-Tag": ","})
+        self.assertEqual(
+            get_cache_tag_headers(
+                backend_settings={
+                    "varnish": {
+                        "BACKEND": "wagtail.contrib.frontend_cache.backends.HTTPBackend",
+                        "LOCATION": "http://localhost:8000",
+                        "CACHE_TAG_HEADER": "xkey",
+                    },
+                }
+            ),
+            {"xkey": " "},
+        )
+
+    def test_page_response_has_cache_tags(self):
+        page = EventPage.objects.get(url_path="/home/events/christmas/")
+        image = Image.objects.create(
+            title="Christmas", file=get_test_image_file(), collection_id=1
+        )
+        page.feed_image = image
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
+
+        response = self.client.get("/events/christmas/")
+
+        self.assertEqual(response.status_code, 200)
+        tags = response["Cache-Tag"].split(",")
+        self.assertEqual(tags[0], f"wagtailcore.page-{page.pk}")
+        self.assertIn(f"wagtailimages.image-{image.pk}", tags)
+        self.assertNotIn("Surrogate-Key", response)
+
+    @override_settings(WAGTAILFRONTENDCACHE_CACHE_TAGS=False)
+    def test_no_cache_tags_when_disabled(self):
+        response = self.client.get("/events/christmas/")
+
+        self.assertNotIn("Cache-Tag", response)
+
+    def test_purge_tag_on_publish(self):
+        page = EventPage.objects.get(url_path="/home/events/christmas/")
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
+
+        # The tag backend purges by the page's tag, the other backend by URL
+        self.assertEqual(PURGED_TAGS, {f"wagtailcore.page-{page.pk}"})
+        self.assertEqual(PURGED_URLS, {"http://localhost/events/christmas/"})
+
+    def test_purge_tag_on_image_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = Image.objects.create(
+                title="Christmas", file=get_test_image_file(), collection_id=1
+            )
+        self.assertEqual(PURGED_TAGS, {f"wagtailimages.image-{image.pk}"})
+
+        PURGED_TAGS.clear()
+        image_pk = image.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.assertEqual(PURGED_TAGS, {f"wagtailimages.image-{image_pk}"})
+
+    def test_no_purge_for_other_models(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            EventIndex.objects.get(url_path="/home/events/").save()
+        self.assertEqual(PURGED_TAGS, set())
+
+    def test_purge_tag_only_when_live_snippet_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet = DraftStateModel.objects.create(text="Draft", live=False)
+            snippet.save_revision()
+        tag = f"tests.draftstatemodel-{snippet.pk}"
+        self.assertEqual(PURGED_TAGS, set())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet.latest_revision.publish()
+        self.assertEqual(PURGED_TAGS, {tag})
+        snippet.refresh_from_db()
+
+        # Saving a draft of a live snippet doesn't change what pages show
+        PURGED_TAGS.clear()
+        snippet.text = "Changed"
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet.save_revision()
+        self.assertEqual(PURGED_TAGS, set())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet.unpublish()
+        self.assertEqual(PURGED_TAGS, {tag})
+
+        PURGED_TAGS.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet.delete()
+        self.assertEqual(PURGED_TAGS, set())
+
+    def test_backends_are_instantiated_once(self):
+        image = Image.objects.create(
+            title="Christmas", file=get_test_image_file(), collection_id=1
+        )
+        get_url_backends.cache_clear()
+        with mock.patch(
+            "wagtail.contrib.frontend_cache.signal_handlers.get_backends",
+            wraps=get_backends,
+        ) as get_backends_mock:
+            image.save()
+            image.save()
+        self.assertEqual(get_backends_mock.call_count, 1)
+
+    @mock.patch("wagtail.contrib.frontend_cache.backends.cloudflare.requests.delete")
+    def test_cloudflare_purge_tags(self, requests_delete_mock):
+        backend = CloudflareBackend(
+            {
+                "BEARER_TOKEN": "this is a token",
+                "ZONEID": "this is a zone id",
+            }
+        )
+        tags = [f"wagtailcore.page-{i}" for i in range(35)]
+
+        self.assertTrue(backend.supports_cache_tags)
+        self.assertEqual(backend.purge_tags_in_batches(tags), 2)
+        self.assertEqual(
+            requests_delete_mock.call_args_list[0].kwargs["json"], {"tags": tags[:30]}
+        )
+        self.assertEqual(
+            requests_delete_mock.call_args_list[1].kwargs["json"], {"tags": tags[30:]}
+        )
+
+    def test_purge_no_tags_in_batches(self):
+        backend = MockTagBackend({})
+
+        self.assertEqual(backend.purge_tags_in_batches([]), 0)
+        self.assertEqual(PURGED_TAGS, set())
+
+    def test_http_cache_tags_are_opt_in(self):
+        backend = HTTPBackend({"LOCATION": "http://localhost:8000"})
+        self.assertFalse(backend.supports_cache_tags)
+
+        backend = HTTPBackend(
+            {"LOCATION": "http://localhost:8000", "CACHE_TAG_HEADER": "Surrogate-Key"}
+        )
+        self.assertTrue(backend.supports_cache_tags)
+        self.assertEqual(backend.tag_purge_header, "Surrogate-Key")
+
+    @mock.patch("wagtail.contrib.frontend_cache.backends.http.urlopen")
+    def test_http_purge_tags(self, urlopen_mock):
+        backend = HTTPBackend(
+            {
+                "LOCATION": "http://localhost:8000",
+                "CACHE_TAG_HEADER": "Surrogate-Key",
+                "TAG_PURGE_METHOD": "BAN",
+                "TAG_PURGE_HEADER": "X-Ban-Tags",
+            }
+        )
+        backend.purge_tags(["wagtailcore.page-1", "wagtailimages.image-2"])
+
+        (purge_request,), _call_kwargs = urlopen_mock.call_args
+        self.assertEqual(purge_request.full_url, "http://localhost:8000/")
+        self.assertEqual(purge_request.get_method(), "BAN")
+        self.assertEqual(
+            purge_request.get_header("X-ban-tags"),
+            "wagtailcore.page-1 wagtailimages.image-2",
+        )
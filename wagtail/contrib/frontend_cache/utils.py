@@ -11,7 +11,7 @@ class InvalidFrontendCacheBackendError(ImproperlyConfigured):
     pass
 
 
-def get_backends(backend_settings=None, backends=None):
+def _get_backend_settings(backend_settings=None):
     # Get backend settings from WAGTAILFRONTENDCACHE setting
     if backend_settings is None:
         backend_settings = getattr(settings, "WAGTAILFRONTENDCACHE", None)
@@ -28,32 +28,50 @@ def get_backends(backend_settings=None, backends=None):
                 },
             }
 
-    # No settings found, return empty list
-    if backend_settings is None:
-        return {}
+    return backend_settings or {}
+
 
+def _import_backend(backend):
+    try:
+        return import_string(backend)
+    except ImportError as e:
+        raise InvalidFrontendCacheBackendError(
+            f"Could not find backend '{backend}': {e}"
+        )
+
+
+def get_backends(backend_settings=None, backends=None):
     backend_objects = {}
 
-    for backend_name, _backend_config in backend_settings.items():
+    for backend_name, _backend_config in _get_backend_settings(
+        backend_settings
+    ).items():
         if backends is not None and backend_name not in backends:
             continue
 
         backend_config = _backend_config.copy()
-        backend = backend_config.pop("BACKEND")
-
-        # Try to import the backend
-        try:
-            backend_cls = import_string(backend)
-        except ImportError as e:
-            raise InvalidFrontendCacheBackendError(
-                f"Could not find backend '{backend}': {e}"
-            )
-
+        backend_cls = _import_backend(backend_config.pop("BACKEND"))
         backend_objects[backend_name] = backend_cls(backend_config)
 
     return backend_objects
 
 
+def get_cache_tag_headers(backend_settings=None):
+    """
+    Return a dict mapping the names of the response headers that the configured
+    backends read cache tags from, to the separator between tags in each header.
+
+    Backends are not instantiated, so this is cheap enough to call for every response.
+    """
+    headers = {}
+    for backend_config in _get_backend_settings(backend_settings).values():
+        backend_cls = _import_backend(backend_config["BACKEND"])
+        header = backend_config.get("CACHE_TAG_HEADER", backend_cls.cache_tag_header)
+        if header:
+            headers[header] = backend_cls.cache_tag_separator
+    return headers
+
+
 def purge_url_from_cache(url, backend_settings=None, backends=None):
     """
     Purge a single URL from the frontend cache.
@@ -96,15 +114,45 @@ def purge_urls_from_cache(urls, backend_settings=None, backends=None):
 
     NOTE: This function also handles internationalization, creating language-specific URLs if
     ``WAGTAILFRONTENDCACHE_LANGUAGES`` is set and ``USE_I18N`` is ``True``.
+
+    If ``WAGTAILFRONTENDCACHE_PURGE_WINDOW`` is set, the URLs are added to a queue to be
+    purged together with other URLs, rather than straight away.
     """
+    from .queue import get_purge_queue
     from .tasks import purge_urls_from_cache_task
 
     if not urls:
         return
 
+    queue = get_purge_queue()
+    if queue is not None:
+        queue.add(urls, backend_settings, backends)
+        return
+
     purge_urls_from_cache_task.enqueue(list(urls), backend_settings, backends)
 
 
+def purge_tags_from_cache(tags, backend_settings=None, backends=None):
+    """
+    Purge every response with any of the given cache tags from the frontend cache.
+
+    :param tags: An iterable of cache tags to purge, as returned by ``get_cache_tag()``.
+    :type tags: iterable of str
+    :param backend_settings: Optional custom backend settings to use instead of those defined in ``settings.WAGTAILFRONTENDCACHE``.
+    :type backend_settings: dict, optional
+    :param backends: Optional list of strings referencing specific backends from ``settings.WAGTAILFRONTENDCACHE`` or provided as ``backend_settings``. Can be used to limit purge operations to specific backends.
+    :type backends: list, optional
+
+    Only backends that support cache tags purge anything. See ``WAGTAILFRONTENDCACHE_CACHE_TAGS``.
+    """
+    from .tasks import purge_tags_from_cache_task
+
+    if not tags:
+        return
+
+    purge_tags_from_cache_task.enqueue(list(tags), backend_settings, backends)
+
+
 def _get_page_cached_urls(page, cache_object=None):
     page_url = page.get_full_url(cache_object)
     if page_url is None:  # nothing to be done if the page has no routable URL
@@ -175,6 +223,80 @@ def purge_pages_from_cache(
     batch.purge(backend_settings, backends)
 
 
+def get_referencing_pages(objects):
+    """
+    Return a queryset of the live pages that reference any of ``objects``, as
+    recorded in the reference index. References are followed through other
+    objects too, so a page that shows a snippet is included when an image used
+    by that snippet changes.
+
+    :param objects: An iterable of model instances, which may be of different models.
+    :type objects: iterable of Model
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from wagtail.models import Page, ReferenceIndex
+
+    objects = list(objects)
+    page_content_type_id = ContentType.objects.get_for_model(Page).pk
+    page_ids = set()
+    seen = {
+        (ReferenceIndex._get_base_content_type(obj).pk, str(obj.pk)) for obj in objects
+    }
+
+    # Each iteration finds the objects that reference the previous ones, until
+    # every object that (indirectly) references the given objects has been found
+    while objects:
+        references = (
+            ReferenceIndex.get_references_to_in_bulk(objects)
+            .order_by()
+            .values_list("base_content_type_id", "object_id")
+            .distinct()
+        )
+        objects = []
+        for content_type_id, object_id in references:
+            if (content_type_id, object_id) in seen:
+                continue
+            seen.add((content_type_id, object_id))
+
+            if content_type_id == page_content_type_id:
+                page_ids.add(object_id)
+                continue
+
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model is not None:
+                objects.append(model(pk=object_id))
+
+    return Page.objects.live().filter(pk__in=page_ids)
+
+
+def purge_referencing_pages_from_cache(
+    objects, backend_settings=None, backends=None, *, cache_object=None
+):
+    """
+    Purge the live pages that reference any of the given objects (directly, or through
+    other objects) from the frontend cache, in a single batch.
+
+    :param objects: An iterable of model instances whose referencing pages should be purged.
+    :type objects: iterable of Model
+    :param backend_settings: Optional custom backend settings to use instead of those defined in ``settings.WAGTAILFRONTENDCACHE``.
+    :type backend_settings: dict, optional
+    :param backends: Optional list of strings matching keys from ``settings.WAGTAILFRONTENDCACHE`` or provided as ``backend_settings``. Can be used to limit purge operations to specific backends.
+    :type backends: list, optional
+    :param cache_object: Optional object to be passed to URL-related methods, to allow cached site root path data to be reused across multiple requests to this method. If not provided, the ``PurgeBatch`` object created by this method will be used instead.
+    :type cache_object: object, optional
+
+    This is useful when an object shown on pages, such as a snippet or image, has
+    changed. The pages are found with a query for each level of references.
+    """
+    purge_pages_from_cache(
+        get_referencing_pages(objects),
+        backend_settings,
+        backends,
+        cache_object=cache_object,
+    )
+
+
 class PurgeBatch:
     """Represents a list of URLs to be purged in a single request"""
 
@@ -0,0 +1,14 @@
+from wagtail import hooks
+
+from .cache_tags import add_cache_tag_headers, cache_tags_enabled, get_page_cache_tags
+
+
+@hooks.register("on_serve_page")
+def add_cache_tags_to_page_response(next_serve_page):
+    def inner(page, request, serve_args, serve_kwargs):
+        response = next_serve_page(page, request, serve_args, serve_kwargs)
+        if cache_tags_enabled():
+            add_cache_tag_headers(response, get_page_cache_tags(page))
+        return response
+
+    return inner
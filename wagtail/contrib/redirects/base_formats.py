@@ -1,5 +1,5 @@
 import csv
-from io import BytesIO, StringIO
+from io import BytesIO, StringIO, TextIOWrapper
 
 
 class Dataset(list):
@@ -42,7 +42,16 @@ class CSV:
         """
         Create dataset from csv data.
         """
-        return Dataset(csv.reader(StringIO(data), delimiter=delimiter))
+        return Dataset(self.iter_rows(StringIO(data), delimiter=delimiter))
+
+    def iter_rows(self, file, delimiter=",", encoding="utf-8"):
+        """
+        Iterate over the rows of csv data in a file, reading it as needed. Files
+        opened in binary mode are decoded with ``encoding``.
+        """
+        if isinstance(file.read(0), bytes):
+            file = TextIOWrapper(file, encoding=encoding, newline="")
+        return csv.reader(file, delimiter=delimiter)
 
 
 class TSV(CSV):
@@ -52,6 +61,12 @@ class TSV(CSV):
         """
         return super().create_dataset(data, delimiter="\t")
 
+    def iter_rows(self, file, encoding="utf-8"):
+        """
+        Iterate over the rows of tsv data in a file, reading it as needed.
+        """
+        return super().iter_rows(file, delimiter="\t", encoding=encoding)
+
 
 class XLSX:
     def is_binary(self):
@@ -64,12 +79,20 @@ class XLSX:
         """
         Create dataset from the first sheet of a xlsx workbook.
         """
+        return Dataset(self.iter_rows(BytesIO(data)))
+
+    def iter_rows(self, file):
+        """
+        Iterate over the rows of the first sheet of a xlsx workbook in a file,
+        reading it as needed.
+        """
         import openpyxl
 
-        workbook = openpyxl.load_workbook(BytesIO(data), read_only=True, data_only=True)
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
         sheet = workbook.worksheets[0]
         try:
-            return Dataset(tuple(cell.value for cell in row) for row in sheet.rows)
+            for row in sheet.rows:
+                yield tuple(cell.value for cell in row)
         finally:
             workbook.close()
 
@@ -0,0 +1,270 @@
+"""
+Bulk import of redirects from rows of tabular data, as read from CSV, TSV or XLSX
+files by the ``import_redirects`` management command and the admin import view.
+
+Rows are validated and saved in chunks, with a single query per chunk to find the
+existing redirects from the same paths, and ``bulk_create()`` / ``bulk_update()``
+to save them, so that memory use doesn't grow with the size of the file.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import connection, transaction
+from django.forms.utils import ErrorDict, ErrorList
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from wagtail.contrib.redirects.forms import RedirectForm
+from wagtail.contrib.redirects.lookup import invalidate_redirect_lookups
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.coreutils import BatchProcessor
+from wagtail.log_actions import get_active_log_context
+from wagtail.log_actions import registry as log_registry
+
+
+class RedirectImporter(BatchProcessor):
+    """
+    Imports redirects from rows of data, in which ``from_index`` and ``to_index``
+    are the columns of the path to redirect from, and of the URL to redirect to.
+
+    Rows are validated like ``RedirectForm`` would, and rows with invalid values,
+    or from a path that already has a redirect (from the database or an earlier
+    row), are reported to ``handle_error()`` and skipped. If ``overwrite`` is set,
+    existing redirects from the database are updated instead.
+
+    Up to ``max_size`` rows are held in memory, and saved together. The paths of
+    the rows imported so far are kept for the whole import, so that duplicates of
+    rows from earlier chunks are reported in the same way with ``dry_run`` as
+    without it.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        *,
+        from_index: int = 0,
+        to_index: int = 1,
+        site=None,
+        permanent: bool = True,
+        overwrite: bool = False,
+        dry_run: bool = False,
+        user=None,
+    ):
+        super().__init__(max_size)
+        self.from_index = from_index
+        self.to_index = to_index
+        self.site = site
+        self.permanent = permanent
+        self.overwrite = overwrite
+        self.dry_run = dry_run
+        self.user = user
+
+        self.created_count = 0
+        self.updated_count = 0
+        self.skipped_count = 0
+        self.error_count = 0
+
+        # The paths of the rows imported so far, from any chunk
+        self.seen_paths = set()
+
+    @property
+    def success_count(self) -> int:
+        return self.created_count + self.updated_count
+
+    def add(self, row: Sequence) -> None:
+        # Keep track of the (1-based) number of each row, for reporting
+        super().add((self.added_count + 1, row))
+
+    def import_rows(self, rows: Iterable[Sequence]) -> RedirectImporter:
+        """
+        Import redirects from all of ``rows``, saving the final chunk.
+        """
+        self.extend(rows)
+        self.process()
+        if self.success_count and not self.dry_run:
+            invalidate_redirect_lookups()
+        return self
+
+    def handle_error(self, row_number: int, from_link, to_link, errors: ErrorDict):
+        """
+        Called for each row that can't be imported. ``errors`` is in the same format
+        as the ``errors`` of a ``RedirectForm``.
+        """
+        pass
+
+    def confirm(self, row_number: int, from_link, to_link) -> bool:
+        """
+        Called for each valid row before it is saved. Return ``False`` to skip the row.
+        """
+        return True
+
+    def report_progress(self) -> None:
+        """
+        Called after each chunk of rows has been saved.
+        """
+        pass
+
+    def get_value(self, row, index):
+        return row[index] if index < len(row) else None
+
+    def clean_row(self, from_link, to_link) -> tuple[dict, ErrorDict]:
+        """
+        Validate the values of a row without querying the database, returning the
+        cleaned ``old_path`` and ``redirect_link``, and any errors.
+        """
+        cleaned_data = {}
+        errors = ErrorDict()
+        for field_name, value in [("old_path", from_link), ("redirect_link", to_link)]:
+            try:
+                cleaned_data[field_name] = RedirectForm.base_fields[field_name].clean(
+                    value
+                )
+            except ValidationError as e:
+                errors[field_name] = ErrorList(e.messages)
+
+        if "old_path" in cleaned_data:
+            old_path = Redirect.normalise_path(cleaned_data["old_path"])
+            try:
+                Redirect._meta.get_field("old_path").run_validators(old_path)
+            except ValidationError as e:
+                errors["old_path"] = ErrorList(e.messages)
+            else:
+                cleaned_data["old_path"] = old_path
+
+        return cleaned_data, errors
+
+    def get_duplicate_errors(self) -> ErrorDict:
+        if self.site is None:
+            # Matches RedirectForm.clean(), as unique_together ignores a null site
+            message = _("A redirect with this path already exists.")
+        else:
+            message = Redirect(site=self.site).unique_error_message(
+                Redirect, ("old_path", "site")
+            )
+        return ErrorDict(
+            {NON_FIELD_ERRORS: ErrorList(ValidationError(message).messages)}
+        )
+
+    def _do_processing(self):
+        if not self.items:
+            return
+
+        rows = []
+        for row_number, row in self.items:
+            from_link = self.get_value(row, self.from_index)
+            to_link = self.get_value(row, self.to_index)
+            cleaned_data, errors = self.clean_row(from_link, to_link)
+            rows.append((row_number, from_link, to_link, cleaned_data, errors))
+
+        old_paths = {
+            cleaned_data["old_path"]
+            for *values, cleaned_data, errors in rows
+            if not errors
+        }
+        existing = {
+            redirect.old_path: redirect
+            for redirect in Redirect.objects.filter(
+                site=self.site, old_path__in=old_paths
+            )
+        }
+
+        to_create = []
+        to_update = []
+        for row_number, from_link, to_link, cleaned_data, errors in rows:
+            if not errors:
+                old_path = cleaned_data["old_path"]
+                if old_path in self.seen_paths or (
+                    old_path in existing and not self.overwrite
+                ):
+                    errors = self.get_duplicate_errors()
+
+            if errors:
+                self.error_count += 1
+                self.handle_error(row_number, from_link, to_link, errors)
+                continue
+
+            if not self.confirm(row_number, from_link, to_link):
+                self.skipped_count += 1
+                continue
+
+            self.seen_paths.add(old_path)
+
+            if old_path in existing:
+                redirect = existing[old_path]
+                redirect.is_permanent = self.permanent
+                redirect.redirect_page = None
+                redirect.redirect_page_route_path = ""
+                redirect.redirect_link = cleaned_data["redirect_link"]
+                to_update.append(redirect)
+            else:
+                to_create.append(
+                    Redirect(
+                        old_path=old_path,
+                        site=self.site,
+                        is_permanent=self.permanent,
+                        redirect_link=cleaned_data["redirect_link"],
+                    )
+                )
+
+        if not self.dry_run:
+            with transaction.atomic():
+                self.save_redirects(to_create, to_update)
+
+        self.created_count += len(to_create)
+        self.updated_count += len(to_update)
+
+    def save_redirects(self, to_create, to_update):
+        Redirect.objects.bulk_create(to_create)
+        if to_create and not connection.features.can_return_rows_from_bulk_insert:
+            # The primary keys are needed for logging
+            pks = dict(
+                Redirect.objects.filter(
+                    site=self.site, old_path__in=[r.old_path for r in to_create]
+                ).values_list("old_path", "pk")
+            )
+            for redirect in to_create:
+                redirect.pk = pks[redirect.old_path]
+
+        Redirect.objects.bulk_update(
+            to_update,
+            [
+                "is_permanent",
+                "redirect_page",
+                "redirect_page_route_path",
+                "redirect_link",
+            ],
+        )
+
+        self.log_redirects(to_create, "wagtail.create")
+        self.log_redirects(to_update, "wagtail.edit")
+
+    def log_redirects(self, redirects, action):
+        log_entry_model = log_registry.get_log_model_for_model(Redirect)
+        if not redirects or log_entry_model is None:
+            return
+
+        log_context = get_active_log_context()
+        content_type = ContentType.objects.get_for_model(Redirect)
+        timestamp = timezone.now()
+        log_entry_model.objects.bulk_create(
+            [
+                log_entry_model(
+                    content_type=content_type,
+                    label=log_entry_model.objects.get_instance_title(redirect),
+                    action=action,
+                    timestamp=timestamp,
+                    data={},
+                    object_id=str(redirect.pk),
+                    user=self.user or log_context.user,
+                    uuid=log_context.uuid,
+                )
+                for redirect in redirects
+            ]
+        )
+
+    def post_process(self):
+        self.report_progress()
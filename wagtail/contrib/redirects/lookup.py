@@ -0,0 +1,320 @@
+"""
+Structures used by ``RedirectMiddleware`` to avoid querying the database for
+redirects that don't exist.
+
+With the ``WAGTAILREDIRECTS_LOOKUP_TABLE`` setting enabled, each process builds an
+in-memory table of all redirects from the database when it is first needed. The
+table is tagged with a version token held in the default cache, which is replaced
+whenever redirects change, so that every process rebuilds its table on the next
+lookup after a change.
+
+With the ``WAGTAILREDIRECTS_BLOOM_FILTER`` setting enabled, a compact Bloom filter
+of the redirect paths of each site is built and shared through the default cache
+instead. A path that is not in the filter definitely has no redirect; a path that
+is in the filter is looked up in the database as usual. New redirects are added to
+the shared filters as they are saved.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+LOOKUP_TABLE_VERSION_CACHE_KEY = "wagtail_redirects_lookup_table_version"
+BLOOM_FILTER_CACHE_KEY = "wagtail_redirects_bloom_filter"
+BLOOM_FILTER_VERSION_CACHE_KEY = "wagtail_redirects_bloom_filter_version"
+
+
+class RedirectLookupTable:
+    """
+    Maps the ``old_path`` of every redirect to its ID, for each site (with ``None``
+    for redirects that apply to all sites).
+    """
+
+    def __init__(self, version: str):
+        from wagtail.contrib.redirects.models import Redirect
+
+        self.version = version
+        self.redirect_ids_by_site: dict[int | None, dict[str, int]] = {}
+        for site_id, old_path, redirect_id in (
+            Redirect.objects.order_by()
+            .values_list("site_id", "old_path", "id")
+            .iterator(chunk_size=10000)
+        ):
+            self.redirect_ids_by_site.setdefault(site_id, {})[old_path] = redirect_id
+
+    def get(self, site, path: str) -> int | None:
+        """
+        Return the ID of the redirect from ``path`` on ``site``, or ``None`` if there
+        is no such redirect. Redirects specific to ``site`` take precedence over
+        redirects for all sites.
+        """
+        if site is not None:
+            redirect_id = self.redirect_ids_by_site.get(site.pk, {}).get(path)
+            if redirect_id is not None:
+                return redirect_id
+
+        redirect_id = self.redirect_ids_by_site.get(None, {}).get(path)
+        if redirect_id is not None or site is not None:
+            return redirect_id
+
+        # Without a site, redirects for any site apply
+        for redirect_ids in self.redirect_ids_by_site.values():
+            if path in redirect_ids:
+                return redirect_ids[path]
+        return None
+
+
+_lookup_table = None
+_lookup_table_lock = threading.Lock()
+
+
+def get_lookup_table() -> RedirectLookupTable | None:
+    """
+    Return the up-to-date lookup table for this process, rebuilding it if redirects
+    have changed since it was built, or ``None`` if the lookup table is disabled.
+    """
+    global _lookup_table
+
+    if not getattr(settings, "WAGTAILREDIRECTS_LOOKUP_TABLE", False):
+        return None
+
+    version = cache.get(LOOKUP_TABLE_VERSION_CACHE_KEY)
+    if version is None:
+        # Use add() so that we don't overwrite a token that has just been set by
+        # a concurrent invalidation
+        cache.add(LOOKUP_TABLE_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(LOOKUP_TABLE_VERSION_CACHE_KEY)
+
+    lookup_table = _lookup_table
+    if lookup_table is not None and lookup_table.version == version:
+        return lookup_table
+
+    with _lookup_table_lock:
+        # Another thread may have rebuilt the table while we waited for the lock
+        if _lookup_table is None or _lookup_table.version != version:
+            _lookup_table = RedirectLookupTable(version)
+        return _lookup_table
+
+
+def _set_lookup_table_version():
+    cache.set(LOOKUP_TABLE_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_lookup_table() -> None:
+    """
+    Mark the lookup tables of all processes as stale, so that they are rebuilt
+    before their next use.
+    """
+    if getattr(settings, "WAGTAILREDIRECTS_LOOKUP_TABLE", False):
+        _set_lookup_table_version()
+        # Processes may rebuild their tables from the old data until the change
+        # is committed, so mark them as stale again then
+        transaction.on_commit(_set_lookup_table_version)
+
+
+def invalidate_redirect_lookups() -> None:
+    """
+    Rebuild the lookup tables and Bloom filters of redirects before their next use.
+    Call this after changing redirects in ways that don't send the ``post_save``
+    and ``post_delete`` signals, such as ``bulk_create()`` or ``QuerySet.update()``.
+    """
+    invalidate_lookup_table()
+    if getattr(settings, "WAGTAILREDIRECTS_BLOOM_FILTER", False):
+        clear_bloom_filters()
+
+
+class BloomFilter:
+    """
+    A set of strings that may report false positives (at a rate of about
+    ``error_rate`` once it holds ``capacity`` strings), but never false negatives,
+    in a small fraction of the memory that the strings themselves would take.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(capacity, 1)
+        self.num_bits = max(
+            int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8
+        )
+        self.num_hashes = max(round(self.num_bits / self.capacity * math.log(2)), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _get_positions(self, value: str):
+        # Derive all of the bit positions from two hashes (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._get_positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(value)
+        )
+
+    @property
+    def is_full(self) -> bool:
+        return self.count > self.capacity
+
+
+def _get_bloom_filter_key(site_id):
+    return f"{BLOOM_FILTER_CACHE_KEY}:{site_id}"
+
+
+def build_bloom_filter(site_id) -> BloomFilter:
+    """
+    Build a Bloom filter of the ``old_path`` of every redirect for the site with
+    the given ID (or ``None`` for redirects that apply to all sites), with room for
+    as many redirects again to be added before it needs to be rebuilt.
+    """
+    from wagtail.contrib.redirects.models import Redirect
+
+    old_paths = Redirect.objects.filter(site_id=site_id).values_list(
+        "old_path", flat=True
+    )
+    bloom_filter = BloomFilter(
+        max(old_paths.count() * 2, 1000),
+        getattr(settings, "WAGTAILREDIRECTS_BLOOM_FILTER_ERROR_RATE", 0.01),
+    )
+    for old_path in old_paths.order_by().iterator(chunk_size=10000):
+        bloom_filter.add(old_path)
+    return bloom_filter
+
+
+class _BloomFilterLock:
+    # Held in the cache while building or updating a shared Bloom filter, so that
+    # concurrent updates don't overwrite each other's additions
+    timeout = 30
+    poll_interval = 0.05
+
+    def __init__(self, site_id):
+        self.key = _get_bloom_filter_key(site_id) + ":lock"
+        self.token = None
+
+    def __enter__(self):
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.timeout
+        while not cache.add(self.key, token, timeout=self.timeout):
+            if time.monotonic() >= deadline:
+                # The lock is still held after waiting for as long as it can be
+                # held, so carry on without it rather than blocking indefinitely
+                return
+            time.sleep(self.poll_interval)
+        self.token = token
+
+    def __exit__(self, *args):
+        # Only release the lock if it's still ours; if we never acquired it, or it
+        # expired and was taken by another process, it isn't ours to release
+        if self.token is not None and cache.get(self.key) == self.token:
+            cache.delete(self.key)
+        self.token = None
+
+
+class RedirectBloomFilters:
+    """
+    The Bloom filters of redirect paths for each site, as fetched from (or built
+    and stored in) the default cache at a particular version.
+    """
+
+    def __init__(self, version: str):
+        self.version = version
+        self.filters: dict[int | None, BloomFilter] = {}
+        self._lock = threading.Lock()
+
+    def _get_filter(self, site_id) -> BloomFilter:
+        with self._lock:
+            if site_id not in self.filters:
+                key = _get_bloom_filter_key(site_id)
+                bloom_filter = cache.get(key)
+                if bloom_filter is None:
+                    with _BloomFilterLock(site_id):
+                        # Another process may have built the filter while we
+                        # waited for the lock
+                        bloom_filter = cache.get(key)
+                        if bloom_filter is None:
+                            bloom_filter = build_bloom_filter(site_id)
+                            cache.set(key, bloom_filter, timeout=None)
+                self.filters[site_id] = bloom_filter
+            return self.filters[site_id]
+
+    def might_have_redirect(self, site, path: str) -> bool:
+        """
+        Return ``False`` if there is definitely no redirect from ``path`` on ``site``.
+        """
+        if site is None:
+            # Redirects for any site apply, and only the filters of known sites
+            # are built, so we can't rule anything out
+            return True
+        return path in self._get_filter(None) or path in self._get_filter(site.pk)
+
+
+_bloom_filters = None
+
+
+def get_bloom_filters() -> RedirectBloomFilters | None:
+    """
+    Return the up-to-date Bloom filters of redirect paths for this process, or
+    ``None`` if the Bloom filter is disabled.
+    """
+    global _bloom_filters
+
+    if not getattr(settings, "WAGTAILREDIRECTS_BLOOM_FILTER", False):
+        return None
+
+    version = cache.get(BLOOM_FILTER_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(BLOOM_FILTER_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(BLOOM_FILTER_VERSION_CACHE_KEY)
+
+    bloom_filters = _bloom_filters
+    if bloom_filters is None or bloom_filters.version != version:
+        bloom_filters = _bloom_filters = RedirectBloomFilters(version)
+    return bloom_filters
+
+
+def add_to_bloom_filter(redirect) -> None:
+    """
+    Add the path of a saved redirect to the shared Bloom filter of its site. This
+    must be called after the redirect has been committed to the database, so that
+    a filter built concurrently either includes it, or is stored before it is added.
+    """
+    if not getattr(settings, "WAGTAILREDIRECTS_BLOOM_FILTER", False):
+        return
+
+    key = _get_bloom_filter_key(redirect.site_id)
+    with _BloomFilterLock(redirect.site_id):
+        bloom_filter = cache.get(key)
+        if bloom_filter is not None and redirect.old_path not in bloom_filter:
+            bloom_filter.add(redirect.old_path)
+            if bloom_filter.is_full:
+                # Too many redirects have been added since the filter was built
+                # for it to be effective, so rebuild it on the next lookup
+                cache.delete(key)
+            else:
+                cache.set(key, bloom_filter, timeout=None)
+            cache.set(BLOOM_FILTER_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def clear_bloom_filters() -> None:
+    """
+    Delete the shared Bloom filters of all sites, so that they are rebuilt before
+    their next use.
+    """
+    from wagtail.models import Site
+
+    site_ids = [None, *Site.objects.values_list("pk", flat=True)]
+    cache.delete_many([_get_bloom_filter_key(site_id) for site_id in site_ids])
+    cache.set(BLOOM_FILTER_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
@@ -1,9 +1,10 @@
 import os
+from itertools import chain, islice
 
 from django.core.management.base import BaseCommand
 
 from wagtail.contrib.redirects.base_formats import Dataset
-from wagtail.contrib.redirects.forms import RedirectForm
+from wagtail.contrib.redirects.importer import RedirectImporter
 from wagtail.contrib.redirects.utils import (
     get_format_cls_by_extension,
     get_supported_extensions,
@@ -71,6 +72,17 @@ class Command(BaseCommand):
         parser.add_argument(
             "--limit", help="Limit import to num items", type=int, default=None
         )
+        parser.add_argument(
+            "--overwrite",
+            action="store_true",
+            help="Update existing redirects from the same paths, rather than skipping them",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            help="Number of rows to validate and save at a time",
+            type=int,
+            default=1000,
+        )
 
     def handle(self, *args, **options):
         src = options["src"]
@@ -85,10 +97,10 @@ class Command(BaseCommand):
         offset = options.pop("offset")
         limit = options.pop("limit")
 
-        errors = []
-        successes = 0
-        skipped = 0
-        total = 0
+        overwrite = options.pop("overwrite")
+        chunk_size = options.pop("chunk_size")
+        verbosity = options["verbosity"]
+
         site = None
 
         if site_id:
@@ -111,14 +123,26 @@ class Command(BaseCommand):
             raise Exception(f"Invalid format '{extension}'")
         input_format = import_format_cls()
 
-        if extension in ["xls", "xlsx"]:
-            mode = "rb"
-        else:
-            mode = "r"
+        importer = CommandRedirectImporter(
+            chunk_size,
+            stdout=self.stdout,
+            ask=ask,
+            verbosity=verbosity,
+            from_index=from_index,
+            to_index=to_index,
+            site=site,
+            permanent=permanent,
+            overwrite=overwrite,
+            dry_run=dry_run,
+        )
 
-        with open(src, mode) as fh:
-            imported_data = input_format.create_dataset(fh.read())
-            sample_data = Dataset(imported_data[:4], imported_data.headers)
+        with open(src, input_format.get_read_mode()) as fh:
+            # Rows are read from the file as they are imported, rather than all
+            # at once, so only the sample rows are read up front
+            rows = iter(input_format.iter_rows(fh))
+            headers = next(rows, [])
+            sample_rows = list(islice(rows, 4))
+            sample_data = Dataset(sample_rows, headers)
 
             self.stdout.write("Sample data:")
             self.stdout.write(str(sample_data))
@@ -130,73 +154,70 @@ class Command(BaseCommand):
 
             self.stdout.write("Importing redirects:")
 
-            if offset:
-                imported_data = imported_data[offset:]
-            if limit:
-                imported_data = imported_data[:limit]
-
-            for row in imported_data:
-                total += 1
-
-                from_link = row[from_index]
-                to_link = row[to_index]
-
-                data = {
-                    "old_path": from_link,
-                    "redirect_link": to_link,
-                    "is_permanent": permanent,
-                }
-
-                if site:
-                    data["site"] = site.pk
-
-                form = RedirectForm(data)
-                if not form.is_valid():
-                    error = form.errors.as_text().replace("\n", "")
-                    self.stdout.write(
-                        "{}. Error: {} -> {} (Reason: {})".format(
-                            total,
-                            from_link,
-                            to_link,
-                            error,
-                        )
-                    )
-                    errors.append(error)
-                    continue
-
-                if ask:
-                    answer = get_input(
-                        "{}. Found {} -> {} Create? y/N: ".format(
-                            total,
-                            from_link,
-                            to_link,
-                        )
-                    )
-
-                    if not answer.lower().startswith("y"):
-                        skipped += 1
-                        continue
-                else:
-                    self.stdout.write(
-                        "{}. {} -> {}".format(
-                            total,
-                            from_link,
-                            to_link,
-                        )
-                    )
-
-                if dry_run:
-                    successes += 1
-                    continue
-
-                form.save()
-                successes += 1
+            rows = islice(
+                chain(sample_rows, rows),
+                offset or 0,
+                (offset or 0) + limit if limit else None,
+            )
+            importer.import_rows(rows)
 
         self.stdout.write("\n")
-        self.stdout.write(f"Found: {total}")
-        self.stdout.write(f"Created: {successes}")
-        self.stdout.write(f"Skipped : {skipped}")
-        self.stdout.write(f"Errors: {len(errors)}")
+        self.stdout.write(f"Found: {importer.added_count}")
+        self.stdout.write(f"Created: {importer.created_count}")
+        if overwrite:
+            self.stdout.write(f"Updated: {importer.updated_count}")
+        self.stdout.write(f"Skipped : {importer.skipped_count}")
+        self.stdout.write(f"Errors: {importer.error_count}")
+
+
+class CommandRedirectImporter(RedirectImporter):
+    """
+    Reports each row to the command output, and asks whether to import each
+    valid row if ``ask`` is set.
+    """
+
+    def __init__(self, *args, stdout, ask=False, verbosity=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stdout = stdout
+        self.ask = ask
+        self.verbosity = verbosity
+
+    def handle_error(self, row_number, from_link, to_link, errors):
+        self.stdout.write(
+            "{}. Error: {} -> {} (Reason: {})".format(
+                row_number,
+                from_link,
+                to_link,
+                errors.as_text().replace("\n", ""),
+            )
+        )
+
+    def confirm(self, row_number, from_link, to_link):
+        if self.ask:
+            answer = get_input(
+                "{}. Found {} -> {} Create? y/N: ".format(
+                    row_number,
+                    from_link,
+                    to_link,
+                )
+            )
+            return answer.lower().startswith("y")
+
+        self.stdout.write(
+            "{}. {} -> {}".format(
+                row_number,
+                from_link,
+                to_link,
+            )
+        )
+        return True
+
+    def report_progress(self):
+        if self.verbosity > 1:
+            self.stdout.write(
+                f"Processed {self.added_count} rows "
+                f"({self.success_count} imported, {self.error_count} errors)"
+            )
 
 
 def get_input(msg):  # pragma: no cover
@@ -5,9 +5,24 @@ from django.utils.deprecation import MiddlewareMixin
 from django.utils.encoding import uri_to_iri
 
 from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects.lookup import get_bloom_filters, get_lookup_table
 from wagtail.models import Site
 
 
+def _get_lookup_table(request):
+    # Check whether the lookup table is up to date once per request, rather than
+    # for each path variant we look up
+    if not hasattr(request, "_wagtail_redirect_lookup_table"):
+        request._wagtail_redirect_lookup_table = get_lookup_table()
+    return request._wagtail_redirect_lookup_table
+
+
+def _get_bloom_filters(request):
+    if not hasattr(request, "_wagtail_redirect_bloom_filters"):
+        request._wagtail_redirect_bloom_filters = get_bloom_filters()
+    return request._wagtail_redirect_bloom_filters
+
+
 def _get_redirect(request, path):
     if (
         "\0" in path
@@ -15,6 +30,18 @@ def _get_redirect(request, path):
         return None
 
     site = Site.find_for_request(request)
+
+    lookup_table = _get_lookup_table(request)
+    if lookup_table is not None:
+        redirect_id = lookup_table.get(site, path)
+        if redirect_id is None:
+            return None
+        return models.Redirect.objects.filter(pk=redirect_id).first()
+
+    bloom_filters = _get_bloom_filters(request)
+    if bloom_filters is not None and not bloom_filters.might_have_redirect(site, path):
+        return None
+
     try:
         return models.Redirect.get_for_site(site).get(old_path=path)
     except models.Redirect.MultipleObjectsReturned:
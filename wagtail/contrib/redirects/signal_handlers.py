@@ -3,12 +3,18 @@ from collections.abc import Iterable
 
 from django.apps import apps
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
 
 from wagtail.contrib.frontend_cache.utils import PurgeBatch
 from wagtail.coreutils import BatchCreator, get_dummy_request
 from wagtail.models import Page, Site
 
+from .lookup import (
+    add_to_bloom_filter,
+    invalidate_lookup_table,
+    invalidate_redirect_lookups,
+)
 from .models import Redirect
 
 logger = logging.getLogger(__name__)
@@ -30,6 +36,9 @@ class BatchRedirectCreator(BatchCreator):
         Redirect.objects.filter(automatically_created=True).filter(clashes_q).delete()
 
     def post_process(self):
+        # bulk_create() doesn't send post_save signals
+        invalidate_redirect_lookups()
+
         if not apps.is_installed("wagtail.contrib.frontend_cache"):
             return
 
@@ -43,6 +52,14 @@ class BatchRedirectCreator(BatchCreator):
         batch.purge()
 
 
+def invalidate_lookup_table_on_change(**kwargs):
+    invalidate_lookup_table()
+
+
+def add_to_bloom_filter_on_save(instance, **kwargs):
+    transaction.on_commit(lambda: add_to_bloom_filter(instance))
+
+
 def autocreate_redirects_on_slug_change(
     instance_before: Page, instance: Page, **kwargs
 ):
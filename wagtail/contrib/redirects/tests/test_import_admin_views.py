@@ -1,11 +1,12 @@
 import os
+from unittest import mock
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from wagtail.contrib.redirects.models import Redirect
-from wagtail.models import Site
+from wagtail.models import ModelLogEntry, Site
 from wagtail.test.utils import WagtailTestUtils
 
 TEST_ROOT = os.path.abspath(os.path.dirname(__file__))
@@ -16,7 +17,7 @@ TEST_ROOT = os.path.abspath(os.path.dirname(__file__))
 )
 class TestImportAdminViews(WagtailTestUtils, TestCase):
     def setUp(self):
-        self.login()
+        self.user = self.login()
 
     def get(self, params={}):
         return self.client.get(reverse("wagtailredirects:start_import"), params)
@@ -114,6 +115,37 @@ class TestImportAdminViews(WagtailTestUtils, TestCase):
             )
             self.assertEqual(Redirect.objects.all().count(), 2)
 
+    @mock.patch("wagtail.contrib.redirects.views.IMPORT_PREVIEW_ROWS", 2)
+    def test_large_import(self):
+        rows = "".join(f"/path-{i},http://{i}.test/\n" for i in range(5))
+        upload_file = SimpleUploadedFile("example.csv", f"from,to\n{rows}".encode())
+
+        response = self.post({"import_file": upload_file})
+
+        # Only the first rows are shown
+        self.assertTemplateUsed(response, "wagtailredirects/confirm_import.html")
+        self.assertEqual(len(response.context["dataset"]), 2)
+        self.assertContains(response, "Showing the first 2 of 5 rows.")
+
+        import_response = self.post_import(
+            {
+                **response.context["form"].initial,
+                "from_index": 0,
+                "to_index": 1,
+                "permanent": True,
+            },
+            follow=True,
+        )
+
+        self.assertTemplateUsed(import_response, "wagtailredirects/index.html")
+        self.assertEqual(Redirect.objects.count(), 5)
+        self.assertEqual(
+            ModelLogEntry.objects.filter(
+                action="wagtail.create", user=self.user
+            ).count(),
+            5,
+        )
+
     def test_import_step_with_offset_columns(self):
         f = f"{TEST_ROOT}/files/example_offset_columns.csv"
         (_, filename) = os.path.split(f)
@@ -5,10 +5,12 @@ from unittest.mock import patch
 
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from wagtail.contrib.redirects.models import Redirect
-from wagtail.models import Site
+from wagtail.models import ModelLogEntry, Site
 
 TEST_ROOT = os.path.abspath(os.path.dirname(__file__))
 
@@ -348,3 +350,106 @@ class TestImportCommand(TestCase):
         self.assertEqual(redirects[0].old_path, "/one")
         self.assertEqual(redirects[0].redirect_link, "http://one.test/")
         self.assertIs(redirects[0].is_permanent, True)
+
+    def test_import_in_chunks(self):
+        invalid_file = tempfile.NamedTemporaryFile(mode="w+", encoding="utf-8")
+        invalid_file.write("from,to\n")
+        for i in range(10):
+            invalid_file.write(f"/path-{i}/,http://{i}.test/\n")
+        # Duplicates of rows in an earlier chunk and the same chunk
+        invalid_file.write("/path-1,http://duplicate.test/\n")
+        invalid_file.write("/path-9,http://duplicate.test/\n")
+        invalid_file.seek(0)
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                "import_redirects",
+                src=invalid_file.name,
+                format="csv",
+                chunk_size=4,
+                verbosity=2,
+                stdout=out,
+            )
+
+        self.assertEqual(Redirect.objects.count(), 10)
+        self.assertEqual(
+            Redirect.objects.get(old_path="/path-9").redirect_link, "http://9.test/"
+        )
+        self.assertIn("Found: 12", out.getvalue())
+        self.assertIn("Created: 10", out.getvalue())
+        self.assertIn("Errors: 2", out.getvalue())
+        self.assertIn("Processed 8 rows (8 imported, 0 errors)", out.getvalue())
+        self.assertIn(
+            "11. Error: /path-1 -> http://duplicate.test/ "
+            "(Reason: * __all__  * A redirect with this path already exists.)",
+            out.getvalue(),
+        )
+
+        # Existing redirects are looked up once per chunk, rather than once per row
+        redirect_selects = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and Redirect._meta.db_table in query["sql"]
+        ]
+        self.assertEqual(len(redirect_selects), 3)
+
+        # Each created redirect is logged
+        self.assertEqual(
+            ModelLogEntry.objects.filter(action="wagtail.create").count(), 10
+        )
+
+    def test_duplicates_from_earlier_chunks_are_reported_on_dry_run(self):
+        invalid_file = tempfile.NamedTemporaryFile(mode="w+", encoding="utf-8")
+        invalid_file.write("from,to\n")
+        for i in range(4):
+            invalid_file.write(f"/path-{i}/,http://{i}.test/\n")
+        # Duplicate of a row in an earlier chunk, which isn't in the database
+        invalid_file.write("/path-1,http://duplicate.test/\n")
+        invalid_file.seek(0)
+
+        out = StringIO()
+        call_command(
+            "import_redirects",
+            src=invalid_file.name,
+            format="csv",
+            chunk_size=2,
+            dry_run=True,
+            stdout=out,
+        )
+
+        self.assertEqual(Redirect.objects.count(), 0)
+        self.assertIn("Created: 4", out.getvalue())
+        self.assertIn("Errors: 1", out.getvalue())
+
+    def test_overwrite_updates_existing_redirects(self):
+        Redirect.objects.create(old_path="/alpha", redirect_link="http://old.test/")
+
+        invalid_file = tempfile.NamedTemporaryFile(mode="w+", encoding="utf-8")
+        invalid_file.write("from,to\n")
+        invalid_file.write("/alpha/,http://omega.test/\n")
+        invalid_file.write("/beta/,http://omega.test/\n")
+        invalid_file.seek(0)
+
+        out = StringIO()
+        call_command(
+            "import_redirects",
+            src=invalid_file.name,
+            format="csv",
+            permanent=False,
+            overwrite=True,
+            stdout=out,
+        )
+
+        self.assertEqual(Redirect.objects.count(), 2)
+        redirect = Redirect.objects.get(old_path="/alpha")
+        self.assertEqual(redirect.redirect_link, "http://omega.test/")
+        self.assertIs(redirect.is_permanent, False)
+        self.assertIn("Created: 1", out.getvalue())
+        self.assertIn("Updated: 1", out.getvalue())
+        self.assertTrue(
+            ModelLogEntry.objects.filter(
+                action="wagtail.edit", object_id=str(redirect.pk)
+            ).exists()
+        )
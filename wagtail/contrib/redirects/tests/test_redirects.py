@@ -1,14 +1,26 @@
 from io import BytesIO
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from openpyxl.reader.excel import load_workbook
 
 from wagtail.admin.admin_url_finder import AdminURLFinder
 from wagtail.contrib.frontend_cache.tests import PURGED_URLS
 from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects.lookup import (
+    BloomFilter,
+    _BloomFilterLock,
+    get_bloom_filters,
+    get_lookup_table,
+    invalidate_redirect_lookups,
+)
+from wagtail.contrib.redirects.signal_handlers import BatchRedirectCreator
 from wagtail.log_actions import registry as log_registry
 from wagtail.models import Page, Site
 from wagtail.test.routablepage.models import RoutablePageTest
@@ -597,6 +609,214 @@ class TestRedirects(TestCase):
         self.assertIs(redirect.is_permanent, True)
 
 
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    WAGTAILREDIRECTS_LOOKUP_TABLE=True,
+)
+class TestRedirectsWithLookupTable(TestRedirects):
+    # Runs all of the TestRedirects tests again, with redirects looked up in the
+    # in-memory lookup table
+
+    def setUp(self):
+        cache.clear()
+
+    def get_redirect_queries(self, queries):
+        return [
+            query
+            for query in queries.captured_queries
+            if models.Redirect._meta.db_table in query["sql"]
+        ]
+
+    def test_miss_does_not_query_redirects(self):
+        models.Redirect.objects.create(old_path="/redirectme", redirect_link="/")
+        get_lookup_table()
+        site = Site.objects.get(is_default_site=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/no-redirect-here/?foo=bar", SERVER_NAME=site.hostname
+            )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.get_redirect_queries(queries), [])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/redirectme/", SERVER_NAME=site.hostname)
+        self.assertEqual(len(self.get_redirect_queries(queries)), 1)
+        self.assertRedirects(
+            response, "/", status_code=301, fetch_redirect_response=False
+        )
+
+    def test_lookup_table_is_reused_until_redirects_change(self):
+        lookup_table = get_lookup_table()
+        self.assertIs(get_lookup_table(), lookup_table)
+
+        redirect = models.Redirect.objects.create(
+            old_path="/redirectme", redirect_link="/"
+        )
+        self.assertIsNot(get_lookup_table(), lookup_table)
+        self.assertEqual(get_lookup_table().get(None, "/redirectme"), redirect.pk)
+
+        lookup_table = get_lookup_table()
+        redirect.delete()
+        self.assertIsNot(get_lookup_table(), lookup_table)
+        self.assertIsNone(get_lookup_table().get(None, "/redirectme"))
+
+    def test_lookup_table_is_rebuilt_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect = models.Redirect.objects.create(
+                old_path="/redirectme", redirect_link="/"
+            )
+            # Simulate another process rebuilding its table before the commit
+            lookup_table = get_lookup_table()
+
+        self.assertIsNot(get_lookup_table(), lookup_table)
+        self.assertEqual(get_lookup_table().get(None, "/redirectme"), redirect.pk)
+
+    def test_lookup_table_is_invalidated_by_bulk_changes(self):
+        lookup_table = get_lookup_table()
+        models.Redirect.objects.update(is_permanent=False)
+        self.assertIs(get_lookup_table(), lookup_table)
+
+        invalidate_redirect_lookups()
+        self.assertIsNot(get_lookup_table(), lookup_table)
+
+        lookup_table = get_lookup_table()
+        batch = BatchRedirectCreator(max_size=10)
+        batch.add(old_path="/redirectme", redirect_link="/")
+        batch.process()
+        self.assertIsNot(get_lookup_table(), lookup_table)
+
+    def test_site_specific_redirects_take_precedence(self):
+        site = Site.objects.get(is_default_site=True)
+        other_site = Site.objects.create(
+            hostname="other.example.com", port=80, root_page=site.root_page
+        )
+        for_all_sites = models.Redirect.objects.create(old_path="/redirectme")
+        for_site = models.Redirect.objects.create(old_path="/redirectme", site=site)
+
+        lookup_table = get_lookup_table()
+        self.assertEqual(lookup_table.get(site, "/redirectme"), for_site.pk)
+        self.assertEqual(lookup_table.get(other_site, "/redirectme"), for_all_sites.pk)
+        self.assertIsNone(lookup_table.get(site, "/not-a-redirect"))
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    WAGTAILREDIRECTS_BLOOM_FILTER=True,
+)
+class TestRedirectsWithBloomFilter(TestRedirects):
+    # Runs all of the TestRedirects tests again, with redirect misses ruled out
+    # by the Bloom filter
+
+    def setUp(self):
+        cache.clear()
+
+        # Saved redirects are added to the Bloom filter once they are committed,
+        # so run on-commit callbacks straight away, as if each save was committed
+        patcher = mock.patch(
+            "wagtail.contrib.redirects.signal_handlers.transaction.on_commit",
+            side_effect=lambda func: func(),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_redirect_queries(self, queries):
+        return [
+            query
+            for query in queries.captured_queries
+            if models.Redirect._meta.db_table in query["sql"]
+        ]
+
+    def test_miss_does_not_query_redirects(self):
+        models.Redirect.objects.create(old_path="/redirectme", redirect_link="/")
+        site = Site.objects.get(is_default_site=True)
+        get_bloom_filters().might_have_redirect(site, "/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/no-redirect-here/?foo=bar", SERVER_NAME=site.hostname
+            )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.get_redirect_queries(queries), [])
+
+        response = self.client.get("/redirectme/", SERVER_NAME=site.hostname)
+        self.assertRedirects(
+            response, "/", status_code=301, fetch_redirect_response=False
+        )
+
+    def test_saved_redirects_are_added_to_filter(self):
+        site = Site.objects.get(is_default_site=True)
+        self.assertFalse(get_bloom_filters().might_have_redirect(site, "/redirectme"))
+
+        models.Redirect.objects.create(
+            old_path="/redirectme", redirect_link="/", site=site
+        )
+
+        self.assertTrue(get_bloom_filters().might_have_redirect(site, "/redirectme"))
+
+    def test_filters_are_rebuilt_after_bulk_changes(self):
+        site = Site.objects.get(is_default_site=True)
+        self.assertFalse(get_bloom_filters().might_have_redirect(site, "/redirectme"))
+
+        models.Redirect.objects.bulk_create(
+            [models.Redirect(old_path="/redirectme", redirect_link="/")]
+        )
+        invalidate_redirect_lookups()
+
+        self.assertTrue(get_bloom_filters().might_have_redirect(site, "/redirectme"))
+
+
+class TestBloomFilter(TestCase):
+    def test_no_false_negatives(self):
+        bloom_filter = BloomFilter(1000)
+        paths = [f"/path/{i}" for i in range(1000)]
+        for path in paths:
+            bloom_filter.add(path)
+
+        self.assertTrue(all(path in bloom_filter for path in paths))
+        self.assertFalse(bloom_filter.is_full)
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom_filter.add(f"/path/{i}")
+
+        false_positives = sum(f"/other/{i}" in bloom_filter for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_is_full(self):
+        bloom_filter = BloomFilter(2)
+        for path in ["/a", "/b", "/c"]:
+            bloom_filter.add(path)
+
+        self.assertTrue(bloom_filter.is_full)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestBloomFilterLock(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    def test_lock_is_released(self):
+        lock = _BloomFilterLock(None)
+        with lock:
+            self.assertIsNotNone(cache.get(lock.key))
+        self.assertIsNone(cache.get(lock.key))
+
+    def test_lock_held_elsewhere_is_not_released(self):
+        lock = _BloomFilterLock(None)
+        cache.set(lock.key, "other", timeout=None)
+
+        with mock.patch.object(_BloomFilterLock, "timeout", 0):
+            with lock:
+                pass
+
+        # The lock wasn't acquired, so it's left for its holder to release
+        self.assertEqual(cache.get(lock.key), "other")
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 )
@@ -27,6 +27,7 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # Copied from: https://raw.githubusercontent.com/django-import-export/django-import-export/5795e114210adf250ac6e146db2fa413f38875de/import_export/tmp_storages.py
 import os
 import tempfile
+from io import BytesIO
 from uuid import uuid4
 
 from django.core.cache import cache
@@ -44,6 +45,20 @@ class BaseStorage:
     def read(self, read_mode="r"):
         raise NotImplementedError
 
+    def save_chunks(self, chunks, mode="w"):
+        """
+        Save data from an iterable of chunks, without holding all of it in
+        memory where the storage allows.
+        """
+        self.save(b"".join(chunks), mode)
+
+    def open_stream(self):
+        """
+        Return a binary file object to read the data from, without reading all
+        of it into memory where the storage allows.
+        """
+        return BytesIO(self.read("rb"))
+
     def remove(self):
         raise NotImplementedError
 
@@ -65,6 +80,14 @@ class TempFolderStorage(BaseStorage):
         with self.open(mode=mode) as file:
             return file.read()
 
+    def save_chunks(self, chunks, mode="w"):
+        with self.open(mode=mode) as file:
+            for chunk in chunks:
+                file.write(chunk)
+
+    def open_stream(self):
+        return self.open(mode="rb")
+
     def remove(self):
         os.remove(self.get_full_path())
 
@@ -104,6 +127,9 @@ class MediaStorage(BaseStorage):
         with default_storage.open(self.get_full_path(), mode=read_mode) as f:
             return f.read()
 
+    def open_stream(self):
+        return default_storage.open(self.get_full_path(), mode="rb")
+
     def remove(self):
         default_storage.delete(self.get_full_path())
 
@@ -8,11 +8,7 @@ def write_to_file_storage(import_file, input_format):
     FileStorage = get_file_storage()
     file_storage = FileStorage()
 
-    data = b""
-    for chunk in import_file.chunks():
-        data += chunk
-
-    file_storage.save(data, input_format.get_read_mode())
+    file_storage.save_chunks(import_file.chunks(), input_format.get_read_mode())
     return file_storage
 
 
@@ -1,10 +1,9 @@
 import os
+from itertools import chain, islice
 
 from django.core.exceptions import SuspiciousOperation
-from django.db import transaction
 from django.shortcuts import redirect, render
 from django.urls import reverse
-from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy, ngettext
@@ -17,6 +16,7 @@ from wagtail.admin.ui.tables import Column, StatusTagColumn, TitleColumn
 from wagtail.admin.views import generic
 from wagtail.admin.widgets.button import Button
 from wagtail.contrib.frontend_cache.utils import PurgeBatch, purge_urls_from_cache
+from wagtail.contrib.redirects.base_formats import Dataset
 from wagtail.contrib.redirects.filters import RedirectsReportFilterSet
 from wagtail.contrib.redirects.forms import (
     ConfirmImportForm,
@@ -24,6 +24,7 @@ from wagtail.contrib.redirects.forms import (
     ImportForm,
     RedirectForm,
 )
+from wagtail.contrib.redirects.importer import RedirectImporter
 from wagtail.contrib.redirects.models import Redirect
 from wagtail.contrib.redirects.permissions import permission_policy
 from wagtail.contrib.redirects.utils import (
@@ -33,11 +34,13 @@ from wagtail.contrib.redirects.utils import (
     get_supported_extensions,
     write_to_file_storage,
 )
-from wagtail.log_actions import log
 from wagtail.models import Site
 
 permission_checker = PermissionPolicyChecker(permission_policy)
 
+# The number of rows of an import file to show on the confirmation page
+IMPORT_PREVIEW_ROWS = 100
+
 
 class RedirectTargetColumn(Column):
     cell_template_name = "wagtailredirects/redirect_target_cell.html"
@@ -210,7 +213,6 @@ class CreateView(generic.CreateView):
 @permission_checker.require_any("add")
 def start_import(request):
     supported_extensions = get_supported_extensions()
-    from_encoding = "utf-8"
 
     query_string = request.GET.get("q", "")
 
@@ -256,10 +258,11 @@ def start_import(request):
     file_storage = write_to_file_storage(import_file, input_format)
 
     try:
-        data = file_storage.read(input_format.get_read_mode())
-        if not input_format.is_binary() and from_encoding:
-            data = force_str(data, from_encoding)
-        dataset = input_format.create_dataset(data)
+        with file_storage.open_stream() as file:
+            rows = iter(input_format.iter_rows(file))
+            dataset = Dataset(islice(rows, IMPORT_PREVIEW_ROWS + 1))
+            # Read through the rest of the file to check that it can be imported
+            total_rows = len(dataset) + sum(1 for row in rows)
     except UnicodeDecodeError as e:
         messages.error(
             request,
@@ -288,6 +291,7 @@ def start_import(request):
         {
             "form": ConfirmImportForm(dataset.headers, initial=initial),
             "dataset": dataset,
+            "total_rows": total_rows,
         },
     )
 
@@ -296,7 +300,6 @@ def start_import(request):
 @require_http_methods(["POST"])
 def process_import(request):
     supported_extensions = get_supported_extensions()
-    from_encoding = "utf-8"
 
     management_form = ConfirmImportManagementForm(request.POST)
     if not management_form.is_valid():
@@ -313,39 +316,38 @@ def process_import(request):
     FileStorage = get_file_storage()
     file_storage = FileStorage(name=management_form.cleaned_data["import_file_name"])
 
-    data = file_storage.read(input_format.get_read_mode())
-    if not input_format.is_binary() and from_encoding:
-        data = force_str(data, from_encoding)
-    dataset = input_format.create_dataset(data)
-
-    # Now check if the rest of the management form is valid
-    form = ConfirmImportForm(
-        dataset.headers,
-        request.POST,
-        request.FILES,
-        initial=management_form.cleaned_data,
-    )
+    with file_storage.open_stream() as file:
+        rows = iter(input_format.iter_rows(file))
+        dataset = Dataset(islice(rows, IMPORT_PREVIEW_ROWS + 1))
 
-    if not form.is_valid():
-        return render(
-            request,
-            "wagtailredirects/confirm_import.html",
+        # Now check if the rest of the management form is valid
+        form = ConfirmImportForm(
+            dataset.headers,
+            request.POST,
+            request.FILES,
+            initial=management_form.cleaned_data,
+        )
+
+        if not form.is_valid():
+            return render(
+                request,
+                "wagtailredirects/confirm_import.html",
+                {
+                    "form": form,
+                    "dataset": dataset,
+                },
+            )
+
+        import_summary = create_redirects_from_dataset(
+            chain(dataset, rows),
             {
-                "form": form,
-                "dataset": dataset,
+                "from_index": int(form.cleaned_data["from_index"]),
+                "to_index": int(form.cleaned_data["to_index"]),
+                "permanent": form.cleaned_data["permanent"],
+                "site": form.cleaned_data["site"],
             },
         )
 
-    import_summary = create_redirects_from_dataset(
-        dataset,
-        {
-            "from_index": int(form.cleaned_data["from_index"]),
-            "to_index": int(form.cleaned_data["to_index"]),
-            "permanent": form.cleaned_data["permanent"],
-            "site": form.cleaned_data["site"],
-        },
-    )
-
     file_storage.remove()
 
     if import_summary["errors_count"] > 0:
@@ -368,42 +370,32 @@ def process_import(request):
     return redirect("wagtailredirects:index")
 
 
-def create_redirects_from_dataset(dataset, config):
-    errors = []
-    successes = 0
-    total = 0
-
-    for row in dataset:
-        total += 1
-
-        from_link = row[config["from_index"]]
-        to_link = row[config["to_index"]]
+class AdminRedirectImporter(RedirectImporter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors = []
 
-        data = {
-            "old_path": from_link,
-            "redirect_link": to_link,
-            "is_permanent": config["permanent"],
-        }
+    def handle_error(self, row_number, from_link, to_link, errors):
+        self.errors.append([from_link, to_link, to_readable_errors(errors.as_text())])
 
-        if config["site"]:
-            data["site"] = config["site"].pk
 
-        form = RedirectForm(data)
-        if not form.is_valid():
-            error = to_readable_errors(form.errors.as_text())
-            errors.append([from_link, to_link, error])
-            continue
-
-        with transaction.atomic():
-            redirect = form.save()
-            log(instance=redirect, action="wagtail.create")
-        successes += 1
+def create_redirects_from_dataset(dataset, config):
+    """
+    Import redirects from the rows of ``dataset``, which may be any iterable of rows,
+    such as one that reads them from a file as needed.
+    """
+    importer = AdminRedirectImporter(
+        from_index=config["from_index"],
+        to_index=config["to_index"],
+        site=config["site"],
+        permanent=config["permanent"],
+    ).import_rows(dataset)
 
     return {
-        "errors": errors,
-        "errors_count": len(errors),
-        "successes": successes,
-        "total": total,
+        "errors": importer.errors,
+        "errors_count": importer.error_count,
+        "successes": importer.success_count,
+        "total": importer.added_count,
     }
 
 
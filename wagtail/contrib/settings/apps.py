@@ -5,3 +5,8 @@ class WagtailSettingsAppConfig(AppConfig):
     name = "wagtail.contrib.settings"
     label = "wagtailsettings"
     verbose_name = "Wagtail settings"
+
+    def ready(self):
+        from .signal_handlers import register_signal_handlers
+
+        register_signal_handlers()
@@ -1,4 +1,8 @@
-from django.db import models
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
 from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 
@@ -16,6 +20,15 @@ __all__ = [
 ]
 
 
+def get_shared_settings_cache():
+    """
+    Return the cache that settings instances are shared between requests through,
+    as set by the ``WAGTAILSETTINGS_CACHE`` setting, or ``None`` if it is not set.
+    """
+    alias = getattr(settings, "WAGTAILSETTINGS_CACHE", None)
+    return caches[alias] if alias else None
+
+
 class AbstractSetting(models.Model):
     """
     The abstract base model for settings. Subclasses must be registered using
@@ -55,6 +68,49 @@ class AbstractSetting(models.Model):
         """
         return f"_{cls._meta.app_label}.{cls._meta.model_name}".lower()
 
+    @classmethod
+    def get_shared_cache_key(cls, site_id=None):
+        """
+        Returns the key that an instance is stored under in the shared cache.
+        """
+        key = f"wagtail_settings:{cls._meta.label_lower}"
+        if site_id is not None:
+            key += f":{site_id}"
+        return key
+
+    @classmethod
+    def _get_shared(cls, key, fetch):
+        # Return the instance from the shared cache, or fetch it and store it there.
+        # Instances are stored before anything is attached to them (such as the
+        # request), so that it isn't shared between requests.
+        shared_cache = get_shared_settings_cache()
+        if shared_cache is None:
+            return fetch()
+
+        instance = shared_cache.get(key)
+        if instance is None:
+            instance = fetch()
+            shared_cache.set(key, instance)
+        return instance
+
+    def _get_instance_shared_cache_key(self):
+        return self.get_shared_cache_key()
+
+    def clear_shared_cache(self):
+        """
+        Removes this instance from the shared cache, so that the next request
+        fetches it from the database. This is called whenever a setting is saved
+        or deleted.
+        """
+        shared_cache = get_shared_settings_cache()
+        if shared_cache is None:
+            return
+
+        key = self._get_instance_shared_cache_key()
+        shared_cache.delete(key)
+        # Requests may store the old values again until the change is committed
+        transaction.on_commit(partial(shared_cache.delete, key))
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Per-instance page URL cache
@@ -135,7 +191,12 @@ class BaseSiteSetting(AbstractSetting):
         if hasattr(request, attr_name):
             return getattr(request, attr_name)
         site = Site.find_for_request(request)
-        site_settings = cls.for_site(site)
+        if site is None:
+            site_settings = cls.for_site(site)
+        else:
+            site_settings = cls._get_shared(
+                cls.get_shared_cache_key(site.pk), partial(cls.for_site, site)
+            )
         # to allow more efficient page url generation
         site_settings._request = request
         setattr(request, attr_name, site_settings)
@@ -147,6 +208,9 @@ class BaseSiteSetting(AbstractSetting):
         state.pop("_request", None)
         return state
 
+    def _get_instance_shared_cache_key(self):
+        return self.get_shared_cache_key(self.site_id)
+
     @classmethod
     def for_site(cls, site):
         """
@@ -202,14 +266,14 @@ class BaseGenericSetting(AbstractSetting):
         # We can only cache on the request, so if there is no request then
         # we know there's nothing in the cache.
         if request_or_site is None or isinstance(request_or_site, Site):
-            return cls._get_or_create()
+            return cls._get_shared(cls.get_shared_cache_key(), cls._get_or_create)
 
         # Check if we already have this in the cache and return it if so.
         attr_name = cls.get_cache_attr_name()
         if hasattr(request_or_site, attr_name):
             return getattr(request_or_site, attr_name)
 
-        obj = cls._get_or_create()
+        obj = cls._get_shared(cls.get_shared_cache_key(), cls._get_or_create)
 
         # Cache for next time.
         setattr(request_or_site, attr_name, obj)
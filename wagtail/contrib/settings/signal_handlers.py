@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+
+def clear_shared_cache_signal_handler(instance, **kwargs):
+    from wagtail.contrib.settings.models import AbstractSetting
+
+    if isinstance(instance, AbstractSetting):
+        instance.clear_shared_cache()
+
+
+def register_signal_handlers():
+    post_save.connect(clear_shared_cache_signal_handler)
+    post_delete.connect(clear_shared_cache_signal_handler)
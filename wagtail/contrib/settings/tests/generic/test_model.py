@@ -1,7 +1,12 @@
+from django.conf import settings
+from django.core.cache import caches
 from django.test import TestCase, override_settings
 
 from wagtail.models import Site
-from wagtail.test.testapp.models import ImportantPagesGenericSetting
+from wagtail.test.testapp.models import (
+    ImportantPagesGenericSetting,
+    TestGenericSetting,
+)
 
 from .base import GenericSettingsTestMixin
 
@@ -121,3 +126,55 @@ class GenericSettingModelTestCase(GenericSettingsTestMixin, TestCase):
             str(ImportantPagesGenericSetting.load()),
             "important pages settings",
         )
+
+
+@override_settings(
+    ALLOWED_HOSTS=["localhost", "other"],
+    CACHES={
+        **settings.CACHES,
+        "settings": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "wagtail-generic-settings-tests",
+        },
+    },
+    WAGTAILSETTINGS_CACHE="settings",
+)
+class GenericSettingSharedCacheTestCase(GenericSettingsTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        caches["settings"].clear()
+
+    def test_load_uses_shared_cache(self):
+        TestGenericSetting.load()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                TestGenericSetting.load().title, "Default GenericSettings title"
+            )
+            self.assertEqual(
+                TestGenericSetting.load(request_or_site=self.other_site),
+                self.default_settings,
+            )
+
+        request = self.get_request()
+        Site.find_for_request(request)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                TestGenericSetting.load(request_or_site=request),
+                self.default_settings,
+            )
+
+    def test_save_clears_shared_cache(self):
+        TestGenericSetting.load()
+
+        self.default_settings.title = "New title"
+        self.default_settings.save()
+
+        self.assertEqual(TestGenericSetting.load().title, "New title")
+
+    def test_delete_clears_shared_cache(self):
+        TestGenericSetting.load()
+
+        self.default_settings.delete()
+
+        self.assertNotEqual(TestGenericSetting.load().pk, self.default_settings.pk)
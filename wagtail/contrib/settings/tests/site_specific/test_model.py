@@ -1,5 +1,7 @@
 import pickle
 
+from django.conf import settings
+from django.core.cache import caches
 from django.test import RequestFactory, TestCase, override_settings
 
 from wagtail.models import Site
@@ -223,3 +225,81 @@ class SettingModelTestCase(SiteSettingsTestMixin, TestCase):
                 self.assertEqual(settings.get_page_url("test_attribute"), "")
                 # when called indirectly via shortcut
                 self.assertEqual(settings.page_url.test_attribute, "")
+
+
+@override_settings(
+    ALLOWED_HOSTS=["localhost", "other"],
+    CACHES={
+        **settings.CACHES,
+        "settings": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "wagtail-settings-tests",
+        },
+    },
+    WAGTAILSETTINGS_CACHE="settings",
+)
+class SharedCacheTestCase(SiteSettingsTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        caches["settings"].clear()
+
+    def get_request(self, site=None):
+        request = super().get_request(site=site)
+        # force site query beforehand
+        Site.find_for_request(request)
+        return request
+
+    def get_settings_for_new_request(self, site=None):
+        return TestSiteSetting.for_request(self.get_request(site=site))
+
+    def test_for_request_uses_shared_cache(self):
+        self.get_settings_for_new_request()
+
+        # later requests don't query the database
+        request = self.get_request()
+        with self.assertNumQueries(0):
+            settings = TestSiteSetting.for_request(request)
+        self.assertEqual(settings, self.default_settings)
+        self.assertEqual(settings.title, "Site title")
+
+        # settings of other sites are cached separately
+        settings = self.get_settings_for_new_request(site=self.other_site)
+        self.assertEqual(settings.title, "Other title")
+
+    def test_shared_cache_does_not_store_request(self):
+        request = self.get_request()
+        TestSiteSetting.for_request(request)
+        cached = caches["settings"].get(
+            TestSiteSetting.get_shared_cache_key(self.default_site.pk)
+        )
+        self.assertEqual(cached.title, "Site title")
+        self.assertFalse(hasattr(cached, "_request"))
+
+    def test_save_clears_shared_cache(self):
+        self.get_settings_for_new_request()
+
+        self.default_settings.title = "New title"
+        self.default_settings.save()
+
+        self.assertEqual(self.get_settings_for_new_request().title, "New title")
+        self.assertEqual(
+            self.get_settings_for_new_request(site=self.other_site).title,
+            "Other title",
+        )
+
+    def test_delete_clears_shared_cache(self):
+        self.get_settings_for_new_request()
+
+        self.default_settings.delete()
+
+        # a new instance is created with the default values
+        settings = self.get_settings_for_new_request()
+        self.assertNotEqual(settings.pk, self.default_settings.pk)
+        self.assertEqual(settings.title, "")
+
+    @override_settings(WAGTAILSETTINGS_CACHE=None)
+    def test_shared_cache_disabled(self):
+        self.get_settings_for_new_request()
+        request = self.get_request()
+        with self.assertNumQueries(1):
+            TestSiteSetting.for_request(request)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from wagtail.contrib.sitemaps.pregenerated import PregeneratedSitemap
+from wagtail.models import Site
+
+
+class Command(BaseCommand):
+    help = "Write the sitemaps of all sites to storage, to be served by the pre-generated sitemap views."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--site",
+            action="append",
+            dest="site_ids",
+            type=int,
+            help="ID of a site to generate the sitemap of. Can be given more than once. Defaults to all sites.",
+        )
+
+    def handle(self, **options):
+        sites = Site.objects.select_related("root_page").order_by("pk")
+        if options["site_ids"]:
+            sites = sites.filter(pk__in=options["site_ids"])
+
+        for site in sites:
+            manifest = PregeneratedSitemap(site).generate()
+            if options["verbosity"] > 0:
+                self.stdout.write(
+                    "%s: wrote %d URLs in %d sitemap files"
+                    % (
+                        site,
+                        sum(shard["url_count"] for shard in manifest["shards"]),
+                        len(manifest["shards"]),
+                    )
+                )
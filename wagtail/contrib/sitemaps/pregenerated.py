@@ -0,0 +1,436 @@
+"""
+Pre-generated sitemaps, for sites that are too large to build a sitemap from the
+database on each request.
+
+The sitemap of each site is written to storage as gzipped shards of up to
+``WAGTAILSITEMAPS_SHARD_SIZE`` URLs each, with pages in ``path`` order, along
+with a manifest that records the range of paths in each shard. The
+``generate_sitemaps`` management command writes all of the shards of a site, and
+with ``WAGTAILSITEMAPS_PREGENERATE`` enabled, only the shards that hold pages that
+have been published, unpublished, moved or deleted are rewritten afterwards.
+
+Shards are never overwritten. Rewritten shards are saved under new names, which
+the manifest is then switched to, and the shards they replace are kept until the
+following update, so that requests that loaded the previous manifest can still
+serve them.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import json
+import os
+import tempfile
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import (
+    FileSystemStorage,
+    InvalidStorageError,
+    default_storage,
+    storages,
+)
+from django.http import HttpRequest
+from django.utils import timezone
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+
+from .sitemap_generator import iter_sitemap_urls
+
+SITEMAPS_LOCATION = "sitemaps"
+MANIFEST_NAME = "manifest.json"
+
+# The maximum number of URLs in a sitemap file, as set by the sitemap protocol
+DEFAULT_SHARD_SIZE = 50000
+
+# Sorts after every character used in page paths, so that the paths of all of a
+# page's descendants are less than its path followed by this
+PATH_END = "~"
+
+
+def pregeneration_enabled() -> bool:
+    return getattr(settings, "WAGTAILSITEMAPS_PREGENERATE", False)
+
+
+def get_sitemap_storage():
+    """
+    Obtain the storage object for pre-generated sitemaps, as set by the
+    ``WAGTAILSITEMAPS_STORAGE`` setting, or the default storage.
+    """
+    storage = getattr(settings, "WAGTAILSITEMAPS_STORAGE", default_storage)
+    if isinstance(storage, str):
+        try:
+            # First see if the string is a storage alias
+            storage = storages[storage]
+        except InvalidStorageError:
+            # Otherwise treat the string as a dotted path
+            try:
+                storage = import_string(storage)()
+            except ImportError:
+                raise ImproperlyConfigured(
+                    "WAGTAILSITEMAPS_STORAGE must be either a valid storage alias or dotted module path."
+                )
+
+    return storage
+
+
+def _format_lastmod(lastmod) -> str:
+    # Matches the "Y-m-d" format of Django's sitemap.xml template
+    if isinstance(lastmod, datetime.datetime):
+        if timezone.is_aware(lastmod):
+            lastmod = timezone.localtime(lastmod)
+        lastmod = lastmod.date()
+    return lastmod.isoformat()
+
+
+def _get_url_xml(url_info) -> str:
+    xml = "<url><loc>%s</loc>" % escape(url_info["location"])
+    if url_info.get("lastmod"):
+        xml += "<lastmod>%s</lastmod>" % _format_lastmod(url_info["lastmod"])
+    if url_info.get("changefreq"):
+        xml += "<changefreq>%s</changefreq>" % escape(url_info["changefreq"])
+    if url_info.get("priority"):
+        xml += "<priority>%s</priority>" % escape(url_info["priority"])
+    return xml + "</url>\n"
+
+
+class _SitemapLock:
+    # Held in the cache while updating the sitemap of a site, so that concurrent
+    # updates don't overwrite each other's shards and manifest
+    timeout = 600
+    # How long refreshes wait for the lock before leaving their changes for the
+    # current holder, as they may run within the request that made the change
+    wait_timeout = 5
+    poll_interval = 0.1
+
+    def __init__(self, site_id):
+        self.key = f"wagtail-sitemaps-{site_id}:lock"
+        self.token = None
+
+    def acquire(self, wait_timeout=None) -> bool:
+        """
+        Try to acquire the lock for up to ``wait_timeout`` seconds, or until it's
+        released or expires if ``wait_timeout`` is ``None``. Returns whether the
+        lock was acquired.
+        """
+        token = uuid.uuid4().hex
+        deadline = None if wait_timeout is None else time.monotonic() + wait_timeout
+        while not cache.add(self.key, token, timeout=self.timeout):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+        self.token = token
+        return True
+
+    def release(self):
+        # Only release the lock if it's still ours, rather than one that was taken
+        # by another process after ours expired
+        if self.token is not None and cache.get(self.key) == self.token:
+            cache.delete(self.key)
+        self.token = None
+
+
+class PregeneratedSitemap:
+    """
+    The pre-generated sitemap of a ``Site``.
+
+    The manifest lists the shards in order, and each shard holds the pages from its
+    ``first_path`` up to the ``first_path`` of the next shard. The first shard starts
+    from an empty path, so that every page path falls within a shard.
+    """
+
+    def __init__(self, site, storage=None, shard_size: int | None = None):
+        self.site = site
+        self.storage = storage or get_sitemap_storage()
+        self.shard_size = shard_size or getattr(
+            settings, "WAGTAILSITEMAPS_SHARD_SIZE", DEFAULT_SHARD_SIZE
+        )
+        self.location = f"{SITEMAPS_LOCATION}/{site.pk}"
+
+        # Passed to get_sitemap_urls() as the request for every page, so that the
+        # site root paths are looked up once and cached on it
+        self.request = HttpRequest()
+        self.request.META["SERVER_NAME"] = site.hostname
+        self.request.META["SERVER_PORT"] = str(site.port)
+        self.request._wagtail_site = site
+
+    def get_shard_path(self, name: str) -> str:
+        return f"{self.location}/sitemap-{name}.xml.gz"
+
+    def load_manifest(self) -> dict | None:
+        """
+        Return the manifest of the sitemap, or ``None`` if it hasn't been generated.
+        """
+        path = f"{self.location}/{MANIFEST_NAME}"
+        if not self.storage.exists(path):
+            return None
+        with self.storage.open(path, "rb") as f:
+            return json.loads(f.read())
+
+    def save_manifest(self, manifest: dict) -> None:
+        """
+        Replace the manifest of the sitemap, in a single step where the storage
+        allows it, so that requests never find it missing or partly written.
+        """
+        path = f"{self.location}/{MANIFEST_NAME}"
+        content = ContentFile(json.dumps(manifest).encode("utf-8"))
+        if isinstance(self.storage, FileSystemStorage):
+            # Write the manifest alongside the current one, then move it into place
+            temp_path = self.storage.save(f"{path}.{uuid.uuid4().hex}.tmp", content)
+            os.replace(self.storage.path(temp_path), self.storage.path(path))
+        elif self.storage.get_available_name(path) == path:
+            # The storage overwrites existing files, such as with a single upload
+            # to cloud storage
+            self.storage.save(path, content)
+        else:
+            self._save(path, content)
+
+    def _save(self, path, content):
+        # Storages don't overwrite existing files, but save under a new name
+        if self.storage.exists(path):
+            self.storage.delete(path)
+        self.storage.save(path, content)
+
+    def _switch_manifest(self, manifest: dict, old_manifest: dict | None, replaced):
+        """
+        Save ``manifest`` in place of ``old_manifest``. ``replaced`` holds the names
+        of the shards of ``old_manifest`` that ``manifest`` no longer uses.
+        """
+        manifest["replaced_shards"] = list(replaced)
+        self.save_manifest(manifest)
+
+        # Requests that loaded the old manifest may still be serving the shards
+        # that have just been replaced, but not those replaced by the update before
+        if old_manifest is not None:
+            for name in old_manifest.get("replaced_shards", []):
+                self.storage.delete(self.get_shard_path(name))
+
+    def get_pages(self, start_path: str = "", end_path: str | None = None):
+        """
+        Return the pages that belong in the sitemap with a path from ``start_path``
+        up to ``end_path``, in ``path`` order.
+        """
+        pages = (
+            self.site.root_page.get_descendants(inclusive=True)
+            .live()
+            .public()
+            .filter(path__gte=start_path)
+        )
+        if end_path is not None:
+            pages = pages.filter(path__lt=end_path)
+        return pages.order_by("path")
+
+    def iter_entries(self, start_path: str = "", end_path: str | None = None):
+        """
+        Yield ``(path, url_info)`` for each URL in the sitemap of the pages from
+        ``start_path`` up to ``end_path``, streaming the pages from the database.
+        """
+        return iter_sitemap_urls(self.get_pages(start_path, end_path), self.request)
+
+    def write_shard(self, name: str, entries) -> dict:
+        """
+        Write the sitemap file of a shard, returning its entry for the manifest.
+        """
+        lastmods = set()
+        with tempfile.TemporaryFile() as f:
+            with gzip.GzipFile(fileobj=f, mode="wb") as gz:
+                gz.write(
+                    b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                    b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                )
+                for path, url_info in entries:
+                    gz.write(_get_url_xml(url_info).encode("utf-8"))
+                    lastmods.add(url_info.get("lastmod"))
+                gz.write(b"</urlset>\n")
+
+            f.seek(0)
+            path = self.get_shard_path(name)
+            # New shard names aren't used by any manifest, but may have been
+            # written by an update that didn't complete
+            self._save(path, File(f, name=path))
+
+        return {
+            "name": name,
+            "first_path": entries[0][0] if entries else "",
+            "url_count": len(entries),
+            "lastmod": (
+                _format_lastmod(max(lastmods))
+                if lastmods and None not in lastmods
+                else None
+            ),
+        }
+
+    def _write_shards(self, manifest, entries):
+        """
+        Write ``entries`` into new shards of up to ``shard_size`` URLs. A page's URLs
+        are never split between shards.
+        """
+        shards = []
+        shard_entries = []
+        for entry in entries:
+            if len(shard_entries) >= self.shard_size and (
+                entry[0] != shard_entries[-1][0]
+            ):
+                shards.append(self._write_new_shard(manifest, shard_entries))
+                shard_entries = []
+            shard_entries.append(entry)
+
+        if shard_entries or not shards:
+            shards.append(self._write_new_shard(manifest, shard_entries))
+
+        return shards
+
+    def _write_new_shard(self, manifest, entries):
+        manifest["next_shard_id"] += 1
+        return self.write_shard(str(manifest["next_shard_id"]), entries)
+
+    def lock(self):
+        return _SitemapLock(self.site.pk)
+
+    @property
+    def _pending_refresh_key(self):
+        return f"wagtail-sitemaps-{self.site.pk}:pending"
+
+    def _add_pending_refresh(self, paths, subtree_paths):
+        pending = cache.get(self._pending_refresh_key) or {
+            "paths": [],
+            "subtree_paths": [],
+        }
+        pending["paths"] += list(paths)
+        pending["subtree_paths"] += list(subtree_paths)
+        cache.set(self._pending_refresh_key, pending, timeout=None)
+
+    def _pop_pending_refresh(self):
+        pending = cache.get(self._pending_refresh_key)
+        if pending is not None:
+            cache.delete(self._pending_refresh_key)
+        return pending
+
+    def generate(self) -> dict:
+        """
+        Write all of the shards of the sitemap, and its manifest.
+        """
+        lock = self.lock()
+        lock.acquire()
+        try:
+            # Every page is written, including those left to be refreshed
+            self._pop_pending_refresh()
+
+            old_manifest = self.load_manifest()
+            manifest = {
+                "next_shard_id": old_manifest["next_shard_id"] if old_manifest else 0,
+                "shards": [],
+            }
+            manifest["shards"] = self._write_shards(manifest, self.iter_entries())
+            manifest["shards"][0]["first_path"] = ""
+            self._switch_manifest(
+                manifest,
+                old_manifest,
+                [shard["name"] for shard in old_manifest["shards"]]
+                if old_manifest
+                else [],
+            )
+        finally:
+            lock.release()
+
+        self._refresh_pending()
+        return manifest
+
+    def refresh(self, paths=(), subtree_paths=()) -> dict | None:
+        """
+        Rewrite the shards that hold any of the pages with the given ``paths``, or
+        with the given ``subtree_paths`` or any of their descendants. Does nothing if
+        the sitemap hasn't been generated.
+
+        If another update holds the lock for longer than ``wait_timeout``, the pages
+        are left for it to refresh once it's done, and ``None`` is returned.
+        """
+        lock = self.lock()
+        if not lock.acquire(wait_timeout=lock.wait_timeout):
+            self._add_pending_refresh(paths, subtree_paths)
+            # The holder may have released the lock before it could see the
+            # pages we left, in which case we refresh them ourselves
+            if not lock.acquire(wait_timeout=0):
+                return None
+            paths = subtree_paths = ()
+
+        try:
+            pending = self._pop_pending_refresh()
+            if pending is not None:
+                paths = [*paths, *pending["paths"]]
+                subtree_paths = [*subtree_paths, *pending["subtree_paths"]]
+            manifest = self._refresh(paths, subtree_paths)
+        finally:
+            lock.release()
+
+        self._refresh_pending()
+        return manifest
+
+    def _refresh_pending(self):
+        # Refreshes that couldn't get the lock may have left their pages while
+        # we held it
+        if cache.get(self._pending_refresh_key) is not None:
+            self.refresh()
+
+    def _refresh(self, paths, subtree_paths) -> dict | None:
+        old_manifest = self.load_manifest()
+        if old_manifest is None:
+            return None
+
+        shards = old_manifest["shards"]
+        ranges = [(path, path) for path in paths] + [
+            (path, path + PATH_END) for path in subtree_paths
+        ]
+
+        manifest = {"next_shard_id": old_manifest["next_shard_id"], "shards": []}
+        replaced = []
+        for i, shard in enumerate(shards):
+            start = shard["first_path"] if i else ""
+            end = shards[i + 1]["first_path"] if i + 1 < len(shards) else None
+            if not any(
+                start <= range_end and (end is None or range_start < end)
+                for range_start, range_end in ranges
+            ):
+                manifest["shards"].append(shard)
+                continue
+
+            rewritten = self._write_shards(manifest, self.iter_entries(start, end))
+            replaced.append(shard["name"])
+            # Keep the range of the shard, even if its first page has gone
+            rewritten[0]["first_path"] = start
+            if rewritten[0]["url_count"] == 0 and i > 0:
+                # Merge the range of an empty shard into the one before it. The
+                # new shard isn't in any manifest yet, so it can go straight away
+                self.storage.delete(self.get_shard_path(rewritten[0]["name"]))
+                rewritten = rewritten[1:]
+            manifest["shards"].extend(rewritten)
+
+        self._switch_manifest(manifest, old_manifest, replaced)
+        return manifest
+
+    def open_shard(self, name: str):
+        return self.storage.open(self.get_shard_path(name), "rb")
+
+
+def get_sites_for_paths(paths=(), subtree_paths=()):
+    """
+    Return the sites whose sitemaps include any of the pages with the given
+    ``paths``, or with the given ``subtree_paths`` or any of their descendants.
+    """
+    from wagtail.models import Site
+
+    sites = []
+    for site in Site.objects.select_related("root_page"):
+        root_path = site.root_page.path
+        if any(path.startswith(root_path) for path in paths) or any(
+            path.startswith(root_path) or root_path.startswith(path)
+            for path in subtree_paths
+        ):
+            sites.append(site)
+    return sites
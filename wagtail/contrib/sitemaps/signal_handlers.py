@@ -0,0 +1,81 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+
+from wagtail.contrib.sitemaps.pregenerated import pregeneration_enabled
+from wagtail.signals import (
+    page_published,
+    page_slug_changed,
+    page_unpublished,
+    post_page_move,
+    pre_page_move,
+)
+
+
+def refresh_sitemaps(paths=(), subtree_paths=()):
+    """
+    Rewrite the pre-generated sitemap shards that hold the pages with the given
+    ``paths``, or the given ``subtree_paths`` and their descendants, once the
+    current transaction is committed.
+    """
+    from wagtail.contrib.sitemaps.tasks import refresh_sitemaps_task
+
+    transaction.on_commit(
+        partial(refresh_sitemaps_task.enqueue, list(paths), list(subtree_paths))
+    )
+
+
+def page_published_signal_handler(instance, **kwargs):
+    if pregeneration_enabled():
+        refresh_sitemaps(paths=[instance.path])
+
+
+def page_unpublished_signal_handler(instance, **kwargs):
+    if pregeneration_enabled():
+        refresh_sitemaps(paths=[instance.path])
+
+
+def page_slug_changed_signal_handler(instance, **kwargs):
+    # The URLs of all of the page's descendants change with its slug
+    if pregeneration_enabled():
+        refresh_sitemaps(subtree_paths=[instance.path])
+
+
+def page_moved_signal_handler(instance, **kwargs):
+    # Sent before the move with the old path, and after it with the new path
+    if pregeneration_enabled():
+        refresh_sitemaps(subtree_paths=[instance.path])
+
+
+def page_deleted_signal_handler(instance, origin=None, **kwargs):
+    if not pregeneration_enabled():
+        return
+
+    # Deleting a page deletes all of its descendants too, so collect the paths of
+    # all of the pages deleted together, and refresh the sitemaps once
+    deletion = origin if origin is not None else instance
+    deleted_paths = getattr(deletion, "_sitemap_deleted_paths", None)
+    if deleted_paths is None:
+        deleted_paths = deletion._sitemap_deleted_paths = []
+        transaction.on_commit(partial(_refresh_deleted_subtrees, deleted_paths))
+    deleted_paths.append(instance.path)
+
+
+def _refresh_deleted_subtrees(deleted_paths):
+    subtree_paths = []
+    for path in sorted(deleted_paths):
+        if not subtree_paths or not path.startswith(subtree_paths[-1]):
+            subtree_paths.append(path)
+    refresh_sitemaps(subtree_paths=subtree_paths)
+
+
+def register_signal_handlers():
+    from wagtail.models import Page
+
+    page_published.connect(page_published_signal_handler)
+    page_unpublished.connect(page_unpublished_signal_handler)
+    page_slug_changed.connect(page_slug_changed_signal_handler)
+    pre_page_move.connect(page_moved_signal_handler)
+    post_page_move.connect(page_moved_signal_handler)
+    post_delete.connect(page_deleted_signal_handler, sender=Page)
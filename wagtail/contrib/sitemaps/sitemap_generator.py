@@ -1,10 +1,95 @@
 from django.contrib.sitemaps import Sitemap as DjangoSitemap
+from django.db.models.query import ModelIterable
 
 # Note: avoid importing models here. This module is imported from __init__.py
 # which causes it to be loaded early in startup if wagtail.contrib.sitemaps is
 # included in INSTALLED_APPS (not required, but developers are likely to add it
 # anyhow) leading to an AppRegistryNotReady exception.
 
+# The fields of the base Page model that the default get_sitemap_urls() uses
+SITEMAP_PAGE_FIELDS = [
+    "path",
+    "content_type",
+    "url_path",
+    "last_published_at",
+    "latest_revision_created_at",
+]
+
+
+def uses_default_sitemap_urls(model) -> bool:
+    """
+    Return whether the sitemap URLs of pages of ``model`` only depend on the fields
+    of the base ``Page`` model, as it doesn't override any of the methods used to
+    build them.
+    """
+    from wagtail.models import Page
+
+    return all(
+        getattr(model, name) is getattr(Page, name)
+        for name in ["get_sitemap_urls", "get_full_url", "get_url_parts"]
+    )
+
+
+def iter_sitemap_urls(pages, request=None, chunk_size=2000):
+    """
+    Yield ``(path, url_info)`` for each of the sitemap URLs of ``pages``, in order.
+
+    Pages are read as base ``Page`` instances with only the fields that the default
+    ``get_sitemap_urls()`` uses, and only the pages of types that override it are
+    loaded as specific pages, with a query for each chunk and type. Passing a
+    ``request`` lets ``get_full_url()`` look up the site root paths once, rather
+    than once per page.
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    uses_default_by_content_type = {}
+
+    def uses_default(content_type_id):
+        if content_type_id not in uses_default_by_content_type:
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            uses_default_by_content_type[content_type_id] = (
+                model is None or uses_default_sitemap_urls(model)
+            )
+        return uses_default_by_content_type[content_type_id]
+
+    base_pages = pages.only(*SITEMAP_PAGE_FIELDS)
+    if base_pages.is_specific:
+        base_pages._iterable_class = ModelIterable
+
+    chunk = []
+    for page in base_pages.iterator(chunk_size=chunk_size):
+        chunk.append(page)
+        if len(chunk) >= chunk_size:
+            yield from _iter_chunk_sitemap_urls(chunk, uses_default, request)
+            chunk = []
+    yield from _iter_chunk_sitemap_urls(chunk, uses_default, request)
+
+
+def _iter_chunk_sitemap_urls(pages, uses_default, request):
+    from wagtail.models import Page
+
+    specific_ids = [page.pk for page in pages if not uses_default(page.content_type_id)]
+    specific_pages = (
+        Page.objects.filter(pk__in=specific_ids)
+        .defer_streamfields()
+        .specific()
+        .in_bulk()
+        if specific_ids
+        else {}
+    )
+
+    for page in pages:
+        if uses_default(page.content_type_id):
+            url_info_items = page.get_sitemap_urls(request)
+        elif page.pk in specific_pages:
+            url_info_items = specific_pages[page.pk].get_sitemap_urls(request)
+        else:
+            # The page has been deleted since it was listed
+            continue
+
+        for url_info in url_info_items:
+            yield page.path, url_info
+
 
 class Sitemap(DjangoSitemap):
     def __init__(self, request=None):
@@ -37,16 +122,24 @@ class Sitemap(DjangoSitemap):
             .specific()
         )
 
+    def get_url_info_items(self, object_list):
+        from wagtail.query import PageQuerySet
+
+        if isinstance(object_list, PageQuerySet):
+            # Only load the specific pages that need it
+            for path, url_info in iter_sitemap_urls(object_list, self.request):
+                yield url_info
+        else:
+            for item in object_list.iterator():
+                yield from item.get_sitemap_urls(self.request)
+
     def _urls(self, page, protocol, domain):
         urls = []
         last_mods = set()
 
-        for item in self.paginator.page(page).object_list.iterator():
-            url_info_items = item.get_sitemap_urls(self.request)
-
-            for url_info in url_info_items:
-                urls.append(url_info)
-                last_mods.add(url_info.get("lastmod"))
+        for url_info in self.get_url_info_items(self.paginator.page(page).object_list):
+            urls.append(url_info)
+            last_mods.add(url_info.get("lastmod"))
 
         # last_mods might be empty if the whole site is private
         if last_mods and None not in last_mods:
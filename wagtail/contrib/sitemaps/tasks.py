@@ -0,0 +1,9 @@
+from django_tasks import task
+
+from .pregenerated import PregeneratedSitemap, get_sites_for_paths
+
+
+@task()
+def refresh_sitemaps_task(paths, subtree_paths):
+    for site in get_sites_for_paths(paths, subtree_paths):
+        PregeneratedSitemap(site).refresh(paths, subtree_paths)
@@ -1,14 +1,22 @@
 import datetime
+import gzip
+import os
+import tempfile
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage, storages
+from django.core.management import call_command
 from django.test import RequestFactory, TestCase, override_settings
 from django.utils import timezone
 
 from wagtail.models import Page, PageViewRestriction, Site
 from wagtail.test.testapp.models import EventIndex, SimplePage
 
+from .pregenerated import PregeneratedSitemap
 from .sitemap_generator import Sitemap
 
 
@@ -106,7 +114,7 @@ class TestSitemapGenerator(TestCase):
         req_protocol = request.scheme
 
         sitemap = Sitemap()
-        with self.assertNumQueries(17):
+        with self.assertNumQueries(15):
             urls = [
                 url["location"]
                 for url in sitemap.get_urls(1, django_site, req_protocol)
@@ -124,7 +132,7 @@ class TestSitemapGenerator(TestCase):
         # pre-seed find_for_request cache, so that it's not counted towards the query count
         Site.find_for_request(request)
 
-        with self.assertNumQueries(14):
+        with self.assertNumQueries(12):
             urls = [
                 url["location"]
                 for url in sitemap.get_urls(1, django_site, req_protocol)
@@ -139,7 +147,7 @@ class TestSitemapGenerator(TestCase):
         req_protocol = request.scheme
 
         sitemap = Sitemap()
-        with self.assertNumQueries(19):
+        with self.assertNumQueries(17):
             urls = [
                 url["location"]
                 for url in sitemap.get_urls(1, django_site, req_protocol)
@@ -158,7 +166,7 @@ class TestSitemapGenerator(TestCase):
         # pre-seed find_for_request cache, so that it's not counted towards the query count
         Site.find_for_request(request)
 
-        with self.assertNumQueries(16):
+        with self.assertNumQueries(14):
             urls = [
                 url["location"]
                 for url in sitemap.get_urls(1, django_site, req_protocol)
@@ -188,6 +196,31 @@ class TestSitemapGenerator(TestCase):
         self.assertIn("http://localhost/events/", urls)  # Main view
         self.assertIn("http://localhost/events/past/", urls)  # Sub view
 
+    def test_get_urls_matches_specific_pages(self):
+        request, django_site = self.get_request_and_django_site("/sitemap.xml")
+        self.home_page.add_child(
+            instance=SimplePage(title="Café", slug="café", content="hello", live=True)
+        )
+        self.home_page.add_child(
+            instance=EventIndex(title="Events", slug="events", live=True)
+        )
+
+        sitemap = Sitemap(request)
+        urls = sitemap.get_urls(1, django_site, request.scheme)
+
+        # The URLs of pages that don't override get_sitemap_urls() are built
+        # without loading the specific pages, but must be the same
+        expected_urls = [
+            url_info
+            for page in sitemap.items()
+            for url_info in page.get_sitemap_urls(request)
+        ]
+        self.assertEqual(
+            [(url["location"], url["lastmod"]) for url in urls],
+            [(url["location"], url["lastmod"]) for url in expected_urls],
+        )
+        self.assertIn("http://localhost/caf%C3%A9/", [url["location"] for url in urls])
+
     def test_lastmod_uses_last_published_date(self):
         request, django_site = self.get_request_and_django_site("/sitemap.xml")
         req_protocol = request.scheme
@@ -284,3 +317,281 @@ class TestSitemapView(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "application/xml")
+
+
+@override_settings(
+    WAGTAILSITEMAPS_STORAGE="sitemaps",
+    WAGTAILSITEMAPS_SHARD_SIZE=2,
+    WAGTAILSITEMAPS_PREGENERATE=True,
+)
+class TestPregeneratedSitemap(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        # Start each test with empty storage
+        self.enterContext(
+            override_settings(
+                STORAGES={
+                    **settings.STORAGES,
+                    "sitemaps": {
+                        "BACKEND": "django.core.files.storage.InMemoryStorage"
+                    },
+                }
+            )
+        )
+        self.site = Site.objects.get(is_default_site=True)
+        self.home_page = self.site.root_page
+        self.pages = [
+            self.home_page.add_child(
+                instance=SimplePage(
+                    title=f"Page {i}", slug=f"page-{i}", content="hello", live=True
+                )
+            )
+            for i in range(4)
+        ]
+        self.sitemap = PregeneratedSitemap(self.site)
+
+    def get_shard_content(self, name):
+        with storages["sitemaps"].open(self.sitemap.get_shard_path(name)) as f:
+            return gzip.decompress(f.read()).decode()
+
+    def get_locations(self):
+        manifest = self.sitemap.load_manifest()
+        return [
+            location
+            for shard in manifest["shards"]
+            for location in self.get_shard_content(shard["name"]).split("<loc>")[1:]
+        ]
+
+    def get_all_urls(self):
+        return [
+            url_info["location"]
+            for page in self.home_page.get_descendants(inclusive=True)
+            .live()
+            .public()
+            .order_by("path")
+            .specific()
+            for url_info in page.get_sitemap_urls()
+        ]
+
+    def test_generate(self):
+        manifest = self.sitemap.generate()
+
+        self.assertEqual(
+            sum(shard["url_count"] for shard in manifest["shards"]),
+            len(self.get_all_urls()),
+        )
+        self.assertEqual(len(manifest["shards"]), 8)
+        self.assertEqual(manifest["shards"][0]["first_path"], "")
+        self.assertEqual(
+            [location.split("</loc>")[0] for location in self.get_locations()],
+            self.get_all_urls(),
+        )
+
+    def test_refresh_on_publish(self):
+        self.sitemap.generate()
+        page = self.home_page.add_child(
+            instance=SimplePage(
+                title="New page", slug="new-page", content="hello", live=False
+            )
+        )
+
+        with mock.patch.object(
+            PregeneratedSitemap,
+            "write_shard",
+            autospec=True,
+            side_effect=PregeneratedSitemap.write_shard,
+        ) as write_shard:
+            with self.captureOnCommitCallbacks(execute=True):
+                page.save_revision().publish()
+
+        # Only the shard that holds the page is rewritten
+        self.assertEqual(write_shard.call_count, 1)
+        manifest = self.sitemap.load_manifest()
+        self.assertIn(
+            "http://localhost/new-page/",
+            self.get_shard_content(manifest["shards"][-1]["name"]),
+        )
+
+    def test_refresh_on_unpublish(self):
+        self.sitemap.generate()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pages[0].unpublish()
+
+        self.assertNotIn(
+            "http://localhost/page-0/",
+            "".join(self.get_locations()),
+        )
+        self.assertIn("http://localhost/page-1/", "".join(self.get_locations()))
+
+    def test_refresh_on_delete(self):
+        self.sitemap.generate()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pages[2].delete()
+            self.pages[3].delete()
+
+        locations = "".join(self.get_locations())
+        self.assertNotIn("http://localhost/page-2/", locations)
+        self.assertNotIn("http://localhost/page-3/", locations)
+        self.assertIn("http://localhost/page-1/", locations)
+
+    def test_refresh_on_move(self):
+        self.sitemap.generate()
+        events_page = Page.objects.get(url_path="/home/events/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pages[0].move(events_page, pos="last-child")
+
+        locations = "".join(self.get_locations())
+        self.assertNotIn("http://localhost/page-0/", locations)
+        self.assertIn("http://localhost/events/page-0/", locations)
+
+    def test_refresh_on_slug_change(self):
+        self.sitemap.generate()
+        events_page = Page.objects.get(url_path="/home/events/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            events_page.slug = "whats-on"
+            events_page.save()
+
+        # The URLs of the page's descendants are refreshed too
+        locations = "".join(self.get_locations())
+        self.assertNotIn("http://localhost/events/christmas/", locations)
+        self.assertIn("http://localhost/whats-on/christmas/", locations)
+
+    def test_refresh_writes_new_shards(self):
+        old_manifest = self.sitemap.generate()
+        old_name = old_manifest["shards"][-1]["name"]
+
+        manifest = self.sitemap.refresh(paths=[self.pages[-1].path])
+
+        # The replaced shard is kept for requests that loaded the old manifest
+        new_name = manifest["shards"][-1]["name"]
+        self.assertNotEqual(new_name, old_name)
+        self.assertEqual(manifest["replaced_shards"], [old_name])
+        self.assertTrue(
+            storages["sitemaps"].exists(self.sitemap.get_shard_path(old_name))
+        )
+
+        # ...until the next update
+        self.sitemap.refresh(paths=[self.pages[0].path])
+        self.assertFalse(
+            storages["sitemaps"].exists(self.sitemap.get_shard_path(old_name))
+        )
+        self.assertTrue(
+            storages["sitemaps"].exists(self.sitemap.get_shard_path(new_name))
+        )
+
+    def test_refresh_waits_for_lock(self):
+        self.sitemap.generate()
+        lock = self.sitemap.lock()
+        cache.set(lock.key, "other")
+
+        with mock.patch(
+            "wagtail.contrib.sitemaps.pregenerated.time.sleep",
+            side_effect=lambda seconds: cache.delete(lock.key),
+        ) as sleep:
+            self.sitemap.refresh(paths=[self.pages[0].path])
+
+        sleep.assert_called_once()
+        self.assertIsNone(cache.get(lock.key))
+
+    def test_refresh_leaves_pages_for_lock_holder(self):
+        self.sitemap.generate()
+        lock = self.sitemap.lock()
+        cache.set(lock.key, "other")
+
+        with (
+            mock.patch.object(PregeneratedSitemap, "write_shard") as write_shard,
+            mock.patch.object(type(lock), "wait_timeout", 0),
+        ):
+            self.assertIsNone(self.sitemap.refresh(paths=[self.pages[0].path]))
+
+        # Rather than waiting for the lock, the pages are left for its holder
+        write_shard.assert_not_called()
+        self.assertEqual(cache.get(lock.key), "other")
+        self.assertEqual(
+            cache.get(self.sitemap._pending_refresh_key),
+            {"paths": [self.pages[0].path], "subtree_paths": []},
+        )
+
+    def test_pages_left_for_lock_holder_are_refreshed(self):
+        self.sitemap.generate()
+        page = self.home_page.add_child(
+            instance=SimplePage(
+                title="New page", slug="new-page", content="hello", live=True
+            )
+        )
+        lock = self.sitemap.lock()
+        cache.set(lock.key, "other")
+        with mock.patch.object(type(lock), "wait_timeout", 0):
+            self.sitemap.refresh(paths=[page.path])
+
+        # The next update, of any pages, also refreshes those that were left
+        cache.delete(lock.key)
+        self.sitemap.refresh(paths=[self.pages[0].path])
+        self.assertIn("http://localhost/new-page/", "".join(self.get_locations()))
+        self.assertIsNone(cache.get(self.sitemap._pending_refresh_key))
+
+    def test_save_manifest_replaces_local_file(self):
+        with tempfile.TemporaryDirectory() as location:
+            sitemap = PregeneratedSitemap(
+                self.site, storage=FileSystemStorage(location=location)
+            )
+            sitemap.generate()
+            manifest = sitemap.generate()
+
+            self.assertEqual(sitemap.load_manifest(), manifest)
+            self.assertEqual(
+                sorted(
+                    name
+                    for name in os.listdir(os.path.join(location, sitemap.location))
+                    if not name.endswith(".xml.gz")
+                ),
+                ["manifest.json"],
+            )
+
+    def test_not_refreshed_before_generation(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pages[0].save_revision().publish()
+
+        self.assertIsNone(self.sitemap.load_manifest())
+
+    def test_generate_sitemaps_command(self):
+        call_command("generate_sitemaps", site_ids=[self.site.pk], verbosity=0)
+
+        self.assertIsNotNone(self.sitemap.load_manifest())
+
+    def test_index_view(self):
+        self.sitemap.generate()
+
+        response = self.client.get("/pregenerated-sitemap.xml")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/xml")
+        self.assertContains(
+            response, "<loc>http://testserver/pregenerated-sitemap-1.xml.gz</loc>"
+        )
+
+    def test_index_view_before_generation(self):
+        # Falls back to the sitemap built from the database
+        response = self.client.get("/pregenerated-sitemap.xml")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "<loc>http://localhost/page-0/</loc>")
+
+    def test_section_view(self):
+        self.sitemap.generate()
+
+        response = self.client.get("/pregenerated-sitemap-1.xml.gz")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn(
+            "<urlset", gzip.decompress(b"".join(response.streaming_content)).decode()
+        )
+
+        response = self.client.get("/pregenerated-sitemap-100.xml.gz")
+        self.assertEqual(response.status_code, 404)
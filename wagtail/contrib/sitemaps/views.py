@@ -1,7 +1,12 @@
+import datetime
 import inspect
 
 from django.contrib.sitemaps import views as sitemap_views
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from django.urls import reverse
 
+from .pregenerated import PregeneratedSitemap
 from .sitemap_generator import Sitemap
 
 
@@ -26,3 +31,53 @@ def prepare_sitemaps(request, sitemaps):
         else:
             initialised_sitemaps[name] = sitemap_cls
     return initialised_sitemaps
+
+
+def get_pregenerated_sitemap(request):
+    return PregeneratedSitemap(Sitemap(request).get_wagtail_site())
+
+
+@sitemap_views.x_robots_tag
+def pregenerated_index(
+    request,
+    template_name="sitemap_index.xml",
+    content_type="application/xml",
+    sitemap_url_name="wagtailsitemaps_pregenerated_section",
+):
+    """
+    Serve the index of the pre-generated sitemap of the current site, or the
+    sitemap itself, built from the database, if it hasn't been generated.
+    """
+    manifest = get_pregenerated_sitemap(request).load_manifest()
+    if manifest is None:
+        return sitemap(request)
+
+    sitemaps = [
+        sitemap_views.SitemapIndexItem(
+            request.build_absolute_uri(
+                reverse(sitemap_url_name, kwargs={"section": shard["name"]})
+            ),
+            shard["lastmod"] and datetime.date.fromisoformat(shard["lastmod"]),
+        )
+        for shard in manifest["shards"]
+    ]
+    return TemplateResponse(
+        request, template_name, {"sitemaps": sitemaps}, content_type=content_type
+    )
+
+
+@sitemap_views.x_robots_tag
+def pregenerated_section(request, section):
+    """
+    Serve a gzipped shard of the pre-generated sitemap of the current site.
+    """
+    pregenerated_sitemap = get_pregenerated_sitemap(request)
+    manifest = pregenerated_sitemap.load_manifest()
+    if manifest is None or section not in [
+        shard["name"] for shard in manifest["shards"]
+    ]:
+        raise Http404(f"No sitemap available for section: {section!r}")
+
+    return FileResponse(
+        pregenerated_sitemap.open_shard(section), content_type="application/gzip"
+    )
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import BaseValidator, MaxLengthValidator
 from django.db import models
+from django.db.models.fields.json import KeyTransform
 from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -214,7 +215,12 @@ class StreamField(models.Field):
 
     def get_prep_value(self, value):
         value = super().get_prep_value(value)
-        if (
+        if isinstance(value, StreamValue) and "_raw_json" in value.__dict__:
+            # The value hasn't been accessed since it was loaded from the database,
+            # so there are no changes to prepare and its JSON can be written back
+            # without parsing it into blocks
+            return value._get_raw_json_data()
+        elif (
             isinstance(value, StreamValue)
             and not (value)
             and value.raw_text is not None
@@ -256,6 +262,16 @@ class StreamField(models.Field):
         # This means we are passing a deserialized value to StreamBlock.to_python,
         # which is a change from the previous behaviour. However, this is fine
         # because to_python can handle both serialized and deserialized values.
+
+        # Unless only part of the value is being fetched (with a KeyTransform),
+        # parsing the JSON is deferred until the content of the stream is first
+        # accessed, so that StreamFields that are loaded but never used (such as
+        # in listings) are not parsed at all.
+        if isinstance(value, (str, bytes)) and not isinstance(expression, KeyTransform):
+            result = StreamValue(self.stream_block, None, raw_json=value)
+            result._stream_field = self
+            return result
+
         value = self.json_field.from_db_value(value, expression, connection)
         return self.to_python(value)
 
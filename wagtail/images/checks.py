@@ -1,7 +1,9 @@
 import os
 from functools import lru_cache
 
-from django.core.checks import Warning, register
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.core.checks import Tags, Warning, register
 from willow.image import Image
 
 
@@ -54,3 +56,30 @@ def image_library_check(app_configs, **kwargs):
         )
 
     return errors
+
+
+@register(Tags.caches)
+def async_renditions_cache_check(app_configs, **kwargs):
+    from wagtail.images import get_image_model
+
+    errors = []
+
+    # The renditions cache records which renditions have been queued, so that each
+    # is only queued once while its task is waiting to run
+    if getattr(settings, "WAGTAILIMAGES_ASYNC_RENDITIONS", None) and isinstance(
+        get_image_model().get_rendition_model().cache_backend, DummyCache
+    ):
+        errors.append(
+            Warning(
+                "WAGTAILIMAGES_ASYNC_RENDITIONS is set, but the renditions cache is "
+                "a dummy cache",
+                hint=(
+                    "Missing renditions will be queued again on every request until "
+                    "they are generated. Configure a cache shared by all processes, "
+                    "such as Redis or Memcached, as the 'renditions' or 'default' cache."
+                ),
+                id="wagtailimages.W001",
+            )
+        )
+
+    return errors
@@ -1,4 +1,6 @@
 import logging
+from itertools import groupby
+from operator import attrgetter
 
 from django.core.management.base import BaseCommand
 from django.db import transaction
@@ -61,34 +63,47 @@ class Command(BaseCommand):
             )
 
         progress_bar_current = 1
-        for rendition in (
+        for image, image_renditions in groupby(
             # Pre-calculate the ids of the renditions to change,
             # otherwise `.iterator` never ends.
             renditions.filter(id__in=rendition_ids)
             .select_related("image")
-            .iterator(chunk_size=options["chunk_size"])
+            .order_by("image_id", "id")
+            .iterator(chunk_size=options["chunk_size"]),
+            key=attrgetter("image"),
         ):
+            image_renditions = list(image_renditions)
+            image_rendition_ids = ", ".join(
+                str(rendition.id) for rendition in image_renditions
+            )
             try:
                 with transaction.atomic():
-                    rendition_filter = rendition.filter
-                    rendition_image = rendition.image
+                    rendition_filters = []
+                    for rendition in image_renditions:
+                        rendition_filters.append(rendition.filter)
 
-                    # Delete the existing rendition
-                    rendition.delete()
+                        # Delete the existing rendition
+                        rendition.delete()
 
-                    _progress_bar = progress_bar(progress_bar_current, num_renditions)
-                    self.stdout.write(_progress_bar[0], ending=_progress_bar[1])
-                    progress_bar_current = progress_bar_current + 1
+                        _progress_bar = progress_bar(
+                            progress_bar_current, num_renditions
+                        )
+                        self.stdout.write(_progress_bar[0], ending=_progress_bar[1])
+                        progress_bar_current = progress_bar_current + 1
 
                     if not purge_only:
-                        # Create a new one
-                        rendition_image.get_rendition(rendition_filter)
+                        # Create new ones, decoding the original image only once
+                        image.get_renditions(*rendition_filters)
             except:  # noqa:E722
-                logger.exception("Error operating on rendition %d", rendition.id)
+                logger.exception(
+                    "Error operating on renditions %s", image_rendition_ids
+                )
                 self.stderr.write(
-                    self.style.ERROR(f"Failed to operate on rendition {rendition.id}")
+                    self.style.ERROR(
+                        f"Failed to operate on renditions {image_rendition_ids}"
+                    )
                 )
-                num_renditions -= 1
+                num_renditions -= len(image_renditions)
 
         if num_renditions:
             self.stdout.write(
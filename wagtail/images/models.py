@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import concurrent.futures
 import hashlib
 import itertools
 import logging
 import os.path
 import re
 import time
+import uuid
 from collections import OrderedDict, defaultdict, namedtuple
 from collections.abc import Iterable
 from contextlib import contextmanager
@@ -46,6 +46,12 @@ from wagtail.images.image_operations import (
     TransformOperation,
 )
 from wagtail.images.rect import Rect
+from wagtail.images.rendition_engines import (
+    DecodedImage,
+    decode_source_image,
+    get_rendition_engine,
+)
+from wagtail.images.source_image_cache import get_source_image_cache
 from wagtail.images.utils import to_svg_safe_spec
 from wagtail.models import CollectionMember, ReferenceIndex
 from wagtail.search import index
@@ -255,6 +261,63 @@ class WagtailImageField(models.ImageField):
     attr_class = WagtailImageFieldFile
 
 
+class RenditionLock:
+    """
+    A lock held in the renditions cache while a rendition is being generated, so
+    that concurrent requests for the same missing rendition wait for a single
+    process to generate it, rather than all generating it at once.
+
+    Enabled by the ``WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT`` setting, which is the
+    maximum number of seconds to wait for another process before generating the
+    rendition anyway.
+    """
+
+    poll_interval = 0.1
+
+    def __init__(self, image: AbstractImage, filter: Filter):
+        self.image = image
+        self.filter = filter
+        self.timeout = getattr(settings, "WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT", None)
+        self.token = None
+
+        Rendition = image.get_rendition_model()
+        self.cache = Rendition.cache_backend
+        self.key = (
+            Rendition.construct_cache_key(
+                image, filter.get_cache_key(image), filter.spec
+            )
+            + "-lock"
+        )
+
+    def acquire(self) -> bool:
+        token = uuid.uuid4().hex
+        if self.cache.add(self.key, token, timeout=self.timeout):
+            self.token = token
+            return True
+        return False
+
+    def release(self) -> None:
+        if self.token is not None and self.cache.get(self.key) == self.token:
+            self.cache.delete(self.key)
+        self.token = None
+
+    def wait(self) -> AbstractRendition | None:
+        """
+        Wait for the process holding the lock to release it, and return the
+        rendition it generated, or ``None`` if it did not finish in time.
+        """
+        deadline = time.monotonic() + self.timeout
+        while self.cache.get(self.key) is not None:
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+        return self.image.renditions.filter(
+            filter_spec=self.filter.spec,
+            focal_point_key=self.filter.get_cache_key(self.image),
+        ).first()
+
+
 class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Model):
     title = models.CharField(max_length=255, verbose_name=_("title"))
     """ Use local ImageField with Willow support.  """
@@ -526,12 +589,18 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         return filter
 
-    def get_rendition(self, filter: Filter | str) -> AbstractRendition:
+    def get_rendition(
+        self, filter: Filter | str, *, defer_missing: bool = False
+    ) -> AbstractRendition:
         """
         Returns a ``Rendition`` instance with a ``file`` field value (an
         image) reflecting the supplied ``filter`` value and focal point values
         from this object.
 
+        If ``defer_missing`` is ``True`` and the rendition does not exist yet,
+        it is queued to be generated in a background task, and an unsaved
+        placeholder rendition is returned instead (see ``queue_renditions()``).
+
         Note: If using custom image models, an instance of the custom rendition
         model will be returned.
         """
@@ -549,6 +618,8 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         try:
             rendition = self.find_existing_rendition(filter)
         except Rendition.DoesNotExist:
+            if defer_missing:
+                return self.queue_renditions(filter)[filter]
             rendition = self.create_rendition(filter)
             # Reuse this rendition if requested again from this object
             self._add_to_prefetched_renditions(rendition)
@@ -591,20 +662,48 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         Note: If using custom image models, an instance of the custom rendition
         model will be returned.
         """
-        # Because of unique constraints applied to the model, we use
-        # get_or_create() to guard against race conditions
-        rendition, created = self.renditions.get_or_create(
-            filter_spec=filter.spec,
-            focal_point_key=filter.get_cache_key(self),
-            defaults={"file": self.generate_rendition_file(filter)},
-        )
+        lock = RenditionLock(self, filter)
+        if lock.timeout:
+            if lock.acquire():
+                # The previous holder of the lock may have generated the rendition
+                # since it was looked up
+                rendition = self.renditions.filter(
+                    filter_spec=filter.spec,
+                    focal_point_key=filter.get_cache_key(self),
+                ).first()
+                if rendition is not None:
+                    lock.release()
+                    return rendition
+            else:
+                # Another process is already generating this rendition, so wait
+                # for it to finish and reuse its result
+                rendition = lock.wait()
+                if rendition is not None:
+                    return rendition
+
+        try:
+            # Because of unique constraints applied to the model, we use
+            # get_or_create() to guard against race conditions
+            rendition, created = self.renditions.get_or_create(
+                filter_spec=filter.spec,
+                focal_point_key=filter.get_cache_key(self),
+                defaults={"file": self.generate_rendition_file(filter)},
+            )
+        finally:
+            lock.release()
         return rendition
 
-    def get_renditions(self, *filters: Filter | str) -> dict[str, AbstractRendition]:
+    def get_renditions(
+        self, *filters: Filter | str, defer_missing: bool = False
+    ) -> dict[str, AbstractRendition]:
         """
         Returns a ``dict`` of ``Rendition`` instances with image files reflecting
         the supplied ``filters``, keyed by filter spec patterns.
 
+        If ``defer_missing`` is ``True``, renditions that do not exist yet are
+        queued to be generated in a background task, and unsaved placeholder
+        renditions are returned for them instead (see ``queue_renditions()``).
+
         Note: If using custom image models, instances of the custom rendition
         model will be returned.
         """
@@ -626,9 +725,13 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         # Create any renditions not found in prefetched values, cache or database
         not_found = [f for f in filters if f not in renditions]
-        for filter, rendition in self.create_renditions(*not_found).items():
-            self._add_to_prefetched_renditions(rendition)
-            renditions[filter] = rendition
+        if defer_missing:
+            placeholders = self.queue_renditions(*not_found)
+        else:
+            placeholders = {}
+            for filter, rendition in self.create_renditions(*not_found).items():
+                self._add_to_prefetched_renditions(rendition)
+                renditions[filter] = rendition
 
         # Update the cache
         cache_additions = {
@@ -642,9 +745,74 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         if cache_additions:
             Rendition.cache_backend.set_many(cache_additions)
 
+        renditions.update(placeholders)
+
         # Make sure key insertion order matches the input order.
         return {filter.spec: renditions[filter] for filter in filters}
 
+    def queue_renditions(self, *filters: Filter) -> dict[Filter, AbstractRendition]:
+        """
+        Queues a background task to generate renditions reflecting the supplied
+        ``filters``, and returns a ``dict`` of unsaved placeholder ``Rendition``
+        instances to use until they are available, keyed by ``Filter`` instance.
+
+        Placeholders have the ``width`` and ``height`` of the final rendition, and
+        their URL is determined by the ``WAGTAILIMAGES_ASYNC_RENDITIONS`` setting:
+        either the URL of the original image (``"original"``), or a URL to the
+        dynamic image serve view (``"serve"``).
+
+        A rendition is only queued again if it still does not exist after
+        ``WAGTAILIMAGES_ASYNC_RENDITIONS_TIMEOUT`` seconds. This is recorded in the
+        renditions cache, so each rendition is only queued once across processes if
+        that cache is shared between them; with a dummy cache, it is queued every time.
+        """
+        from wagtail.images.tasks import generate_renditions_task
+
+        Rendition = self.get_rendition_model()
+
+        to_queue = [
+            filter.spec
+            for filter in filters
+            if Rendition.cache_backend.add(
+                Rendition.construct_cache_key(
+                    self, filter.get_cache_key(self), filter.spec
+                )
+                + "-queued",
+                True,
+                timeout=getattr(
+                    settings, "WAGTAILIMAGES_ASYNC_RENDITIONS_TIMEOUT", 300
+                ),
+            )
+        ]
+        if to_queue:
+            generate_renditions_task.enqueue(
+                self._meta.app_label, self._meta.model_name, self.pk, to_queue
+            )
+
+        return {filter: self.get_placeholder_rendition(filter) for filter in filters}
+
+    def get_placeholder_rendition(self, filter: Filter) -> AbstractRendition:
+        """
+        Returns an unsaved ``Rendition`` instance with the dimensions of the
+        rendition for the supplied ``filter``, to display while the rendition
+        is being generated.
+        """
+        from wagtail.images.views.serve import generate_image_url
+
+        width, height = filter.get_transform(self).size
+        rendition = self.get_rendition_model()(
+            image=self,
+            filter_spec=filter.spec,
+            focal_point_key=filter.get_cache_key(self),
+            width=width,
+            height=height,
+        )
+        if getattr(settings, "WAGTAILIMAGES_ASYNC_RENDITIONS", None) == "serve":
+            rendition.placeholder_url = generate_image_url(self, filter.spec)
+        else:
+            rendition.placeholder_url = self.file.url
+        return rendition
+
     def find_existing_renditions(
         self, *filters: Filter
     ) -> dict[Filter, AbstractRendition]:
@@ -748,22 +916,15 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         return_value: dict[Filter, AbstractRendition] = {}
         filter_map: dict[str, Filter] = {f.spec: f for f in filters}
 
-        # Read file contents into memory
-        with self.open_file() as file:
-            original_image_bytes = file.read()
+        start_time = time.time()
 
-        to_create = []
+        # Generate the rendition files with the configured rendition engine, which
+        # decodes the original image once for the whole batch
+        to_create = list(
+            get_rendition_engine().generate_renditions(self, list(filters)).values()
+        )
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            for future in concurrent.futures.as_completed(
-                executor.submit(
-                    self.generate_rendition_instance,
-                    filter,
-                    BytesIO(original_image_bytes),
-                )
-                for filter in filters
-            ):
-                to_create.append(future.result())
+        generate_time = time.time() - start_time
 
         # Rendition generation can take a while. So, if other processes have created
         # identical renditions in the meantime, we should find them to avoid clashes.
@@ -802,26 +963,41 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         for file in files_for_deletion:
             file.delete(save=False)
 
+        logger.debug(
+            "Created %d renditions for image %d in %.1fms "
+            "(generate: %.1fms, save: %.1fms)",
+            len(filters),
+            self.pk,
+            (time.time() - start_time) * 1000,
+            generate_time * 1000,
+            (time.time() - start_time - generate_time) * 1000,
+        )
+
         return return_value
 
     def generate_rendition_instance(
-        self, filter: Filter, source: BytesIO
+        self, filter: Filter, source: BytesIO = None, *, decoded: DecodedImage = None
     ) -> AbstractRendition:
         """
         Use the supplied ``source`` image to create and return an
         **unsaved** ``Rendition`` instance, with a ``file`` value reflecting
         the supplied ``filter`` value and focal point values from this object.
+        A ``decoded`` image can be supplied instead of ``source``.
         """
         return self.get_rendition_model()(
             image=self,
             filter_spec=filter.spec,
             focal_point_key=filter.get_cache_key(self),
             file=self.generate_rendition_file(
-                filter, source=File(source, name=self.file.name)
+                filter,
+                source=File(source, name=self.file.name) if source else None,
+                decoded=decoded,
             ),
         )
 
-    def generate_rendition_file(self, filter: Filter, *, source: File = None) -> File:
+    def generate_rendition_file(
+        self, filter: Filter, *, source: File = None, decoded: DecodedImage = None
+    ) -> File:
         """
         Generates an in-memory image matching the supplied ``filter`` value
         and focal point value from this object, wraps it in a ``File`` object
@@ -832,6 +1008,8 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         If the contents of ``self.file`` has already been read into memory, the
         ``source`` keyword can be used to provide a reference to the in-memory
         ``File``, bypassing the need to reload the image contents from storage.
+        Similarly, the ``decoded`` keyword can be used to provide a ``DecodedImage``
+        that has already been decoded, which can be shared between several filters.
 
         NOTE: The responsibility of generating the new image from the original
         falls to the supplied ``filter`` object. If you want to do anything
@@ -855,6 +1033,7 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
                 self,
                 SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE),
                 source=source,
+                decoded=decoded,
             )
 
             logger.debug(
@@ -1051,117 +1230,128 @@ class Filter:
             with image.get_willow_image() as willow_image:
                 yield willow_image
 
-    def run(self, image: AbstractImage, output: BytesIO, source: File = None):
-        with self.get_willow_image(image, source) as willow:
-            original_format = willow.format_name
+    def run(
+        self,
+        image: AbstractImage,
+        output: BytesIO,
+        source: File = None,
+        decoded: DecodedImage = None,
+    ):
+        if decoded is None:
+            if source is None and get_source_image_cache() is not None:
+                decoded = decode_source_image(image)
+            else:
+                with self.get_willow_image(image, source) as willow:
+                    # Decoding also fixes the orientation of the image
+                    decoded = DecodedImage.from_willow(willow)
+        return self.run_decoded(image, output, decoded)
+
+    def run_decoded(self, image: AbstractImage, output: BytesIO, decoded: DecodedImage):
+        """
+        Apply this filter to a source image that has already been decoded, and
+        save the result to ``output``. ``decoded`` may be shared with other filters.
+        """
+        original_format = decoded.format_name
 
-            # Fix orientation of image
-            willow = willow.auto_orient()
+        # Transform the image
+        transform = self.get_transform(image, decoded.size)
+        willow = decoded.crop_and_resize(transform.get_rect().round(), transform.size)
 
-            # Transform the image
-            transform = self.get_transform(
-                image, (willow.image.width, willow.image.height)
-            )
-            willow = willow.crop(transform.get_rect().round())
-            willow = willow.resize(transform.size)
+        # Apply filters
+        env = {
+            "original-format": original_format,
+        }
+        for operation in self.filter_operations:
+            willow = operation.run(willow, image, env) or willow
 
-            # Apply filters
-            env = {
-                "original-format": original_format,
+        # Find the output format to use
+        if "output-format" in env:
+            # Developer specified an output format
+            output_format = env["output-format"]
+        else:
+            # Convert avif, bmp and webp to png, and heic to jpg, by default
+            default_conversions = {
+                "avif": "png",
+                "bmp": "png",
+                "webp": "png",
+                "heic": "jpeg",
             }
-            for operation in self.filter_operations:
-                willow = operation.run(willow, image, env) or willow
 
-            # Find the output format to use
-            if "output-format" in env:
-                # Developer specified an output format
-                output_format = env["output-format"]
-            else:
-                # Convert avif, bmp and webp to png, and heic to jpg, by default
-                default_conversions = {
-                    "avif": "png",
-                    "bmp": "png",
-                    "webp": "png",
-                    "heic": "jpeg",
-                }
-
-                # Convert unanimated GIFs to PNG as well
-                if not willow.has_animation():
-                    default_conversions["gif"] = "png"
-
-                # Allow the user to override the conversions
-                conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
-                default_conversions.update(conversion)
-
-                # Get the converted output format falling back to the original
-                output_format = default_conversions.get(
-                    original_format, original_format
-                )
+            # Convert unanimated GIFs to PNG as well
+            if not willow.has_animation():
+                default_conversions["gif"] = "png"
 
-            if output_format == "jpeg":
-                # Allow changing of JPEG compression quality
-                if "jpeg-quality" in env:
-                    quality = env["jpeg-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 85)
+            # Allow the user to override the conversions
+            conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
+            default_conversions.update(conversion)
 
-                # If the image has an alpha channel, give it a white background
-                if willow.has_alpha():
-                    willow = willow.set_background_color_rgb((255, 255, 255))
+            # Get the converted output format falling back to the original
+            output_format = default_conversions.get(original_format, original_format)
 
-                return willow.save_as_jpeg(
-                    output, quality=quality, progressive=True, optimize=True
-                )
-            elif output_format == "png":
-                return willow.save_as_png(output, optimize=True)
-            elif output_format == "gif":
-                return willow.save_as_gif(output)
-            elif output_format == "webp":
-                # Allow changing of WebP compression quality
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_webp(output, lossless=True)
-                elif "webp-quality" in env:
-                    quality = env["webp-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 80)
+        if output_format == "jpeg":
+            # Allow changing of JPEG compression quality
+            if "jpeg-quality" in env:
+                quality = env["jpeg-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 85)
 
-                return willow.save_as_webp(output, quality=quality)
-            elif output_format == "avif":
-                # Allow changing of AVIF compression quality
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_avif(output, lossless=True)
-                elif "avif-quality" in env:
-                    quality = env["avif-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_AVIF_QUALITY", 80)
-                return willow.save_as_avif(output, quality=quality)
-            elif output_format == "heic":
-                # Allow changing of HEIC compression quality. Safari is the only browser that supports HEIC,
-                # so there is little value in outputting it - for that reason, we make it work if someone
-                # explicitly requests it, but these settings are not documented.
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_heic(output, lossless=True)
-                elif "heic-quality" in env:
-                    quality = env["heic-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_HEIC_QUALITY", 80)
-                return willow.save_as_heic(output, quality=quality)
-            elif output_format == "svg":
-                return willow.save_as_svg(output)
-            elif output_format == "ico":
-                return willow.save_as_ico(output)
-            raise UnknownOutputImageFormatError(
-                f"Unknown output image format '{output_format}'"
+            # If the image has an alpha channel, give it a white background
+            if willow.has_alpha():
+                willow = willow.set_background_color_rgb((255, 255, 255))
+
+            return willow.save_as_jpeg(
+                output, quality=quality, progressive=True, optimize=True
             )
+        elif output_format == "png":
+            return willow.save_as_png(output, optimize=True)
+        elif output_format == "gif":
+            return willow.save_as_gif(output)
+        elif output_format == "webp":
+            # Allow changing of WebP compression quality
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_webp(output, lossless=True)
+            elif "webp-quality" in env:
+                quality = env["webp-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 80)
+
+            return willow.save_as_webp(output, quality=quality)
+        elif output_format == "avif":
+            # Allow changing of AVIF compression quality
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_avif(output, lossless=True)
+            elif "avif-quality" in env:
+                quality = env["avif-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_AVIF_QUALITY", 80)
+            return willow.save_as_avif(output, quality=quality)
+        elif output_format == "heic":
+            # Allow changing of HEIC compression quality. Safari is the only browser that supports HEIC,
+            # so there is little value in outputting it - for that reason, we make it work if someone
+            # explicitly requests it, but these settings are not documented.
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_heic(output, lossless=True)
+            elif "heic-quality" in env:
+                quality = env["heic-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_HEIC_QUALITY", 80)
+            return willow.save_as_heic(output, quality=quality)
+        elif output_format == "svg":
+            return willow.save_as_svg(output)
+        elif output_format == "ico":
+            return willow.save_as_ico(output)
+        raise UnknownOutputImageFormatError(
+            f"Unknown output image format '{output_format}'"
+        )
 
     def get_cache_key(self, image):
         vary_parts = []
@@ -1329,8 +1519,14 @@ class AbstractRendition(ImageFileMixin, models.Model):
 
     wagtail_reference_index_ignore = True
 
+    # The URL to use for unsaved placeholder renditions, for renditions
+    # that are still being generated (see AbstractImage.queue_renditions)
+    placeholder_url = None
+
     @property
     def url(self):
+        if self.placeholder_url:
+            return self.placeholder_url
         return self.file.url
 
     @property
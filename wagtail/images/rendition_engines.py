@@ -0,0 +1,233 @@
+"""
+Rendition engines generate a batch of renditions of a single source image, as
+requested by ``AbstractImage.create_renditions()``.
+
+The source image is decoded once per batch, and the decoded pixels are shared
+between all of the filters in the batch, rather than each filter decoding the
+original file again.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import threading
+import time
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import willow
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from wagtail.coreutils import accepts_kwarg
+from wagtail.images.source_image_cache import get_source_image_cache
+
+if TYPE_CHECKING:
+    from django.core.files import File
+
+    from wagtail.images.models import AbstractImage, AbstractRendition, Filter
+
+logger = logging.getLogger("wagtail.images")
+
+
+class DecodedImage:
+    """
+    A source image that has been decoded (and auto-oriented) once, so that it can be
+    shared between several filters.
+
+    Willow operations return new image objects rather than modifying the image they
+    are called on, so the decoded image can safely be used by several threads at once.
+
+    If ``reuse_resizes`` is enabled, filters that resize the whole image (without
+    cropping) are derived from the smallest larger whole-image resize planned for the
+    same batch, rather than from the original pixels. For example, ``width-400`` is
+    derived from ``width-800``. This is considerably faster for large originals, but
+    the output may differ very slightly from resizing the original directly.
+    """
+
+    def __init__(self, format_name: str, willow_image, *, reuse_resizes: bool = False):
+        self.format_name = format_name
+        self.willow = willow_image
+        self.reuse_resizes = reuse_resizes
+        self._planned_sizes: list[tuple[int, int]] = []
+        self._resizes = {}
+        self._locks: dict[tuple[int, int], threading.Lock] = {}
+
+    @classmethod
+    def from_willow(cls, willow_image, **kwargs) -> DecodedImage:
+        """
+        Decode and auto-orient an image that has been opened with Willow.
+        """
+        return cls(willow_image.format_name, willow_image.auto_orient(), **kwargs)
+
+    @classmethod
+    def open(cls, source: File, **kwargs) -> DecodedImage:
+        return cls.from_willow(willow.Image.open(source), **kwargs)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return (self.willow.image.width, self.willow.image.height)
+
+    def plan(self, image: AbstractImage, filters: list[Filter]) -> None:
+        """
+        Record the whole-image resizes that ``filters`` will need, so that each of
+        them can be derived from the next larger one.
+        """
+        if not self.reuse_resizes:
+            return
+
+        full_frame = (0, 0, *self.size)
+        sizes = set()
+        for filter in filters:
+            transform = filter.get_transform(image, self.size)
+            if tuple(transform.get_rect().round()) == full_frame:
+                sizes.add(tuple(transform.size))
+
+        # Largest first, so that the parent of a size is always found before it
+        self._planned_sizes = sorted(
+            sizes, key=lambda size: size[0] * size[1], reverse=True
+        )
+        self._locks = {size: threading.Lock() for size in self._planned_sizes}
+
+    def crop_and_resize(self, rect, size):
+        """
+        Return the decoded image cropped to ``rect`` and resized to ``size``.
+        """
+        size = tuple(size)
+        if size in self._locks and tuple(rect) == (0, 0, *self.size):
+            return self._get_resize(size)
+        return self.willow.crop(rect).resize(size)
+
+    def _get_resize(self, size):
+        with self._locks[size]:
+            if size not in self._resizes:
+                parent = self._get_parent_size(size)
+                if parent is None:
+                    source = self.willow.crop((0, 0, *self.size))
+                else:
+                    source = self._get_resize(parent)
+                self._resizes[size] = source.resize(size)
+            return self._resizes[size]
+
+    def _get_parent_size(self, size):
+        parent = None
+        for planned in self._planned_sizes:
+            if planned == size:
+                break
+            if planned[0] >= size[0] and planned[1] >= size[1]:
+                # Keep going, to find the smallest suitable size
+                parent = planned
+        return parent
+
+
+def decode_source_image(
+    image: AbstractImage, source: File = None, *, reuse_resizes: bool = False
+) -> DecodedImage:
+    """
+    Return the decoded original image of ``image``, read from ``source`` if given,
+    or from the file storage otherwise.
+
+    If the source image cache is enabled (see ``WAGTAILIMAGES_SOURCE_IMAGE_CACHE_SIZE``),
+    the image is only decoded once, even by concurrent requests, and is reused until
+    it is evicted from the cache.
+    """
+    cache = get_source_image_cache()
+    if cache is None:
+        return _decode(image, source, reuse_resizes)
+
+    with cache.lock(image):
+        cached = cache.get(image)
+        if cached is not None:
+            return DecodedImage(*cached, reuse_resizes=reuse_resizes)
+
+        decoded = _decode(image, source, reuse_resizes)
+        cache.set(image, decoded.format_name, decoded.willow)
+        return decoded
+
+
+def _decode(image, source, reuse_resizes):
+    if source is not None:
+        return DecodedImage.open(source, reuse_resizes=reuse_resizes)
+    with image.get_willow_image() as willow_image:
+        return DecodedImage.from_willow(willow_image, reuse_resizes=reuse_resizes)
+
+
+class BaseRenditionEngine:
+    """
+    Generates renditions for several filters applied to the same source image.
+    """
+
+    def __init__(self, workers: int = 3, reuse_resizes: bool = False):
+        self.workers = workers
+        self.reuse_resizes = reuse_resizes
+
+    def generate_renditions(
+        self, image: AbstractImage, filters: list[Filter]
+    ) -> dict[Filter, AbstractRendition]:
+        """
+        Return a dict of **unsaved** renditions for ``filters``, keyed by filter.
+        """
+        raise NotImplementedError
+
+
+class ThreadRenditionEngine(BaseRenditionEngine):
+    """
+    Decodes the source image once, and generates renditions from it using a pool
+    of threads. Most of the time spent decoding, resizing and encoding images is
+    spent in Pillow and other C libraries that release the GIL.
+
+    Each rendition is generated by the image's ``generate_rendition_instance()``
+    method, so that custom image models can still override it.
+    """
+
+    def generate_renditions(self, image, filters):
+        start_time = time.time()
+        if accepts_kwarg(image.generate_rendition_instance, "decoded"):
+            decoded = decode_source_image(image, reuse_resizes=self.reuse_resizes)
+            decoded.plan(image, filters)
+
+            def generate(filter):
+                return image.generate_rendition_instance(filter, decoded=decoded)
+
+        else:
+            # Overrides of generate_rendition_instance() that don't accept a
+            # decoded image are given the contents of the original file instead
+            with image.open_file() as file:
+                source_bytes = file.read()
+
+            def generate(filter):
+                return image.generate_rendition_instance(filter, BytesIO(source_bytes))
+
+        decode_time = time.time() - start_time
+
+        renditions = {}
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers
+        ) as executor:
+            futures = {executor.submit(generate, filter): filter for filter in filters}
+            for future in concurrent.futures.as_completed(futures):
+                renditions[futures[future]] = future.result()
+
+        logger.debug(
+            "Generated %d renditions for image %d (decode: %.1fms, render: %.1fms)",
+            len(filters),
+            image.pk,
+            decode_time * 1000,
+            (time.time() - start_time - decode_time) * 1000,
+        )
+        return renditions
+
+
+def get_rendition_engine() -> BaseRenditionEngine:
+    engine_class = import_string(
+        getattr(
+            settings,
+            "WAGTAILIMAGES_RENDITION_ENGINE",
+            "wagtail.images.rendition_engines.ThreadRenditionEngine",
+        )
+    )
+    return engine_class(
+        workers=getattr(settings, "WAGTAILIMAGES_RENDITION_WORKERS", 3),
+        reuse_resizes=getattr(settings, "WAGTAILIMAGES_REUSE_RENDITION_RESIZES", False),
+    )
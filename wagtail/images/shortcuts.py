@@ -1,6 +1,16 @@
+from django.conf import settings
+
 from wagtail.images.models import SourceImageIOError
 
 
+def defer_missing_renditions():
+    """
+    Whether missing renditions should be generated in a background task rather than
+    while rendering, as configured by the ``WAGTAILIMAGES_ASYNC_RENDITIONS`` setting.
+    """
+    return bool(getattr(settings, "WAGTAILIMAGES_ASYNC_RENDITIONS", None))
+
+
 def get_rendition_or_not_found(image, specs):
     """
     Tries to get / create the rendition for the image or renders a not-found image if it does not exist.
@@ -10,6 +20,8 @@ def get_rendition_or_not_found(image, specs):
     :return: Rendition
     """
     try:
+        if defer_missing_renditions():
+            return image.get_rendition(specs, defer_missing=True)
         return image.get_rendition(specs)
     except SourceImageIOError:
         # Image file is (probably) missing from /media/original_images - generate a dummy
@@ -32,6 +44,8 @@ def get_renditions_or_not_found(image, specs):
     :param specs: iterable of str or Filter
     """
     try:
+        if defer_missing_renditions():
+            return image.get_renditions(*specs, defer_missing=True)
         return image.get_renditions(*specs)
     except SourceImageIOError:
         Rendition = image.renditions.model
@@ -0,0 +1,303 @@
+"""
+A least-recently-used cache of decoded source images, so that generating several
+renditions of the same original image, across requests, only decodes it once.
+
+Decoded images are kept in memory within a process. If a scratch directory is
+configured, their pixels are also written to files in that directory, which other
+processes on the same server (such as other web server workers) memory-map
+rather than decoding the original image again.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Not available on Windows, where the scratch directory is not locked
+    fcntl = None
+
+# Pillow image modes that can be restored from raw pixel data alone
+SHAREABLE_MODES = {"1", "L", "LA", "I", "I;16", "F", "RGB", "RGBA", "RGBX", "CMYK"}
+
+JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def get_pillow_image(willow_image):
+    from willow.plugins.pillow import PillowImage
+
+    if isinstance(willow_image, PillowImage):
+        return willow_image.image
+
+
+def get_image_size_in_bytes(pillow_image):
+    bits = {"1": 1, "I": 32, "F": 32, "I;16": 16}.get(pillow_image.mode, 8)
+    bands = len(pillow_image.getbands())
+    return (pillow_image.width * pillow_image.height * bands * bits) // 8
+
+
+def encode_image_info(info):
+    """
+    Return the entries of a Pillow image's ``info`` dict that can be stored as JSON,
+    as ``[key, kind, value]`` lists. Bytes (such as ICC profiles and EXIF data) are
+    base64-encoded, and other values that JSON can't represent are left out.
+    """
+    entries = []
+    for key, value in info.items():
+        if not isinstance(key, str):
+            continue
+        if isinstance(value, bytes):
+            entries.append([key, "bytes", base64.b64encode(value).decode("ascii")])
+        elif isinstance(value, tuple) and all(
+            isinstance(item, JSON_SCALAR_TYPES) for item in value
+        ):
+            entries.append([key, "tuple", list(value)])
+        elif isinstance(value, JSON_SCALAR_TYPES):
+            entries.append([key, "value", value])
+    return entries
+
+
+def decode_image_info(entries):
+    info = {}
+    for key, kind, value in entries:
+        if kind == "bytes":
+            value = base64.b64decode(value, validate=True)
+        elif kind == "tuple":
+            value = tuple(value)
+        elif kind != "value":
+            raise ValueError(f"Unknown kind of image info: {kind!r}")
+        info[key] = value
+    return info
+
+
+class SourceImageCache:
+    """
+    Caches decoded (and auto-oriented) source images, keyed by the ``file_hash``
+    of the image, within a memory budget of ``max_size`` bytes. The same budget
+    applies to the scratch ``directory``, if given.
+    """
+
+    def __init__(self, max_size: int, directory: str | None = None):
+        self.max_size = max_size
+        self.directory = directory
+        self._images = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Maps each key to its lock and the number of threads holding or waiting
+        # for it, so that the lock can be removed when it is no longer in use
+        self._key_locks: dict[str, list] = {}
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def get_key(self, image) -> str | None:
+        # Images saved before file hashes were introduced can't be cached
+        return image.file_hash or None
+
+    def get_path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}.{suffix}")
+
+    @contextmanager
+    def lock(self, image):
+        """
+        Hold a lock for decoding ``image``, so that concurrent requests for the
+        same image (in this process, or other processes using the same scratch
+        directory) wait for the first one to decode it, then reuse the result.
+        """
+        key = self.get_key(image)
+        if key is None:
+            yield
+            return
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+
+        try:
+            with key_lock[0]:
+                if self.directory and fcntl is not None:
+                    lock_file = open(self.get_path(key, "lock"), "a")  # noqa: SIM115
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                else:
+                    lock_file = nullcontext()
+                with lock_file:
+                    yield
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if not key_lock[1]:
+                    del self._key_locks[key]
+
+    def get(self, image):
+        """
+        Return a ``(format_name, willow_image)`` tuple for the decoded ``image``,
+        or ``None`` if it is not in the cache.
+        """
+        key = self.get_key(image)
+        if key is None:
+            return None
+
+        with self._lock:
+            if key in self._images:
+                self._images.move_to_end(key)
+                format_name, willow_image, size = self._images[key]
+                return format_name, willow_image
+
+        if self.directory:
+            cached = self._read_file(key)
+            if cached is not None:
+                self._add(key, *cached)
+                return cached[:2]
+
+    def set(self, image, format_name: str, willow_image) -> None:
+        key = self.get_key(image)
+        pillow_image = get_pillow_image(willow_image)
+        if key is None or pillow_image is None:
+            # Only images decoded with Pillow can be cached
+            return
+
+        size = get_image_size_in_bytes(pillow_image)
+        if size > self.max_size:
+            return
+
+        self._add(key, format_name, willow_image, size)
+        if self.directory and pillow_image.mode in SHAREABLE_MODES:
+            self._write_file(key, format_name, pillow_image)
+
+    def clear(self) -> None:
+        """
+        Remove all images from the in-memory cache of this process.
+        """
+        with self._lock:
+            self._images.clear()
+            self._size = 0
+
+    def _add(self, key, format_name, willow_image, size):
+        with self._lock:
+            if key in self._images:
+                self._size -= self._images.pop(key)[2]
+            self._images[key] = (format_name, willow_image, size)
+            self._size += size
+
+            # Evict the least recently used images until we're within budget
+            while self._size > self.max_size:
+                _, (_, _, evicted_size) = self._images.popitem(last=False)
+                self._size -= evicted_size
+
+    def _read_file(self, key):
+        from PIL import Image as PILImage
+        from willow.plugins.pillow import PillowImage
+
+        # The scratch directory may be shared with other processes, so the metadata
+        # is stored as JSON, and any file that can't be read is treated as a miss
+        try:
+            with open(self.get_path(key, "meta"), "rb") as f:
+                meta = json.load(f)
+            format_name = meta["format"]
+            mode = meta["mode"]
+            width, height = meta["size"]
+            info = decode_image_info(meta["info"])
+            if (
+                not isinstance(format_name, str)
+                or mode not in SHAREABLE_MODES
+                or not isinstance(width, int)
+                or not isinstance(height, int)
+            ):
+                return None
+            with open(self.get_path(key, "pixels"), "rb") as f:
+                pixels = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+        try:
+            pillow_image = PILImage.frombuffer(
+                mode, (width, height), pixels, "raw", mode, 0, 1
+            )
+        except ValueError:
+            # The pixel data does not match the metadata
+            return None
+
+        # Mark the files as recently used
+        os.utime(self.get_path(key, "meta"))
+
+        pillow_image.info = info
+        return format_name, PillowImage(pillow_image), len(pixels)
+
+    def _write_file(self, key, format_name, pillow_image):
+        meta = json.dumps(
+            {
+                "format": format_name,
+                "mode": pillow_image.mode,
+                "size": list(pillow_image.size),
+                "info": encode_image_info(pillow_image.info),
+            }
+        ).encode()
+
+        # Write to temporary files, then move them into place, so that other
+        # processes never see partially written files
+        for suffix, data in [
+            ("pixels", pillow_image.tobytes()),
+            ("meta", meta),
+        ]:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.get_path(key, suffix))
+
+        self._prune_directory()
+
+    def _prune_directory(self):
+        # Remove the least recently used images from the scratch directory
+        # until it is within budget
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".meta"):
+                key = entry.name[: -len(".meta")]
+                try:
+                    size = os.path.getsize(self.get_path(key, "pixels"))
+                except OSError:
+                    continue
+                entries.append((entry.stat().st_mtime, key, size))
+                total_size += size
+
+        for _, key, size in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            for suffix in ("meta", "pixels", "lock"):
+                try:
+                    os.remove(self.get_path(key, suffix))
+                except OSError:
+                    pass
+            total_size -= size
+
+
+_cache = None
+
+
+def get_source_image_cache() -> SourceImageCache | None:
+    """
+    Return the source image cache for this process, as configured by the
+    ``WAGTAILIMAGES_SOURCE_IMAGE_CACHE_SIZE`` and ``WAGTAILIMAGES_SOURCE_IMAGE_CACHE_DIR``
+    settings, or ``None`` if it is disabled.
+    """
+    global _cache
+
+    max_size = getattr(settings, "WAGTAILIMAGES_SOURCE_IMAGE_CACHE_SIZE", 0)
+    directory = getattr(settings, "WAGTAILIMAGES_SOURCE_IMAGE_CACHE_DIR", None)
+    if not max_size:
+        return None
+
+    if _cache is None or _cache.max_size != max_size or _cache.directory != directory:
+        _cache = SourceImageCache(max_size, directory)
+    return _cache
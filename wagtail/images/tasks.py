@@ -16,3 +16,15 @@ def set_image_focal_point_task(app_label, model_name, pk):
             "focal_point_height",
         ]
     )
+
+
+@task()
+def generate_renditions_task(app_label, model_name, pk, filter_specs):
+    model = apps.get_model(app_label, model_name)
+    try:
+        instance = model.objects.get(pk=pk)
+    except model.DoesNotExist:
+        # The image was deleted before its renditions could be generated
+        return
+
+    instance.get_renditions(*filter_specs)
@@ -1,6 +1,7 @@
 import re
 import warnings
 from io import StringIO
+from unittest import mock
 
 from django.core import management
 from django.test import TestCase, override_settings
@@ -103,6 +104,30 @@ class TestUpdateImageRenditions(TestCase):
         total_renditions_now = len(renditions_now)
         self.assertEqual(total_renditions_now, total_renditions)
 
+    def test_image_renditions_generated_together_for_each_image(self):
+        self.image.get_rendition("width-100")
+        total_renditions = Rendition.objects.count()
+
+        with mock.patch.object(
+            Image,
+            "create_renditions",
+            autospec=True,
+            side_effect=Image.create_renditions,
+        ) as create_renditions:
+            output = self.run_command()
+
+        output_string = self.REAESC.sub("", output.read())
+        self.assertIn(
+            f"Successfully processed {total_renditions} rendition(s)\n", output_string
+        )
+        # Both renditions of the image are regenerated in a single batch
+        create_renditions.assert_called_once()
+        self.assertEqual(
+            {f.spec for f in create_renditions.call_args.args[1:]},
+            {"original", "width-100"},
+        )
+        self.assertEqual(Rendition.objects.count(), total_renditions)
+
     def test_image_renditions_with_purge_only(self):
         renditions = Rendition.objects.all()
         total_renditions = len(renditions)
@@ -21,11 +21,13 @@ from wagtail.images.models import (
     Filter,
     Picture,
     Rendition,
+    RenditionLock,
     ResponsiveImage,
     SourceImageIOError,
     get_rendition_storage,
 )
 from wagtail.images.rect import Rect
+from wagtail.images.rendition_engines import DecodedImage
 from wagtail.models import Collection, GroupCollectionPermission, Page, ReferenceIndex
 from wagtail.test.dummy_external_storage import (
     DummyExternalStorage,
@@ -833,6 +835,99 @@ class TestRenditions(TestCase):
         # But, we should see equality on the keys
         self.assertEqual(third_result.keys(), result.keys())
 
+    def test_create_renditions_decodes_original_once(self):
+        filter_list = [Filter(spec) for spec in self.SPECS]
+        with (
+            mock.patch.object(
+                DecodedImage, "from_willow", wraps=DecodedImage.from_willow
+            ) as decode_image,
+            mock.patch.object(Filter, "get_willow_image") as get_willow_image,
+        ):
+            result = self.image.create_renditions(*filter_list)
+
+        decode_image.assert_called_once()
+        get_willow_image.assert_not_called()
+        self.assertEqual(
+            {(rendition.width, rendition.height) for rendition in result.values()},
+            {(88, 66), (100, 75), (400, 300)},
+        )
+
+    @override_settings(WAGTAILIMAGES_REUSE_RENDITION_RESIZES=True)
+    def test_create_renditions_reusing_resizes(self):
+        filter_list = [
+            Filter(spec) for spec in ("width-400", "width-100", "fill-100x100")
+        ]
+        result = self.image.create_renditions(*filter_list)
+
+        self.assertEqual(
+            {
+                filter.spec: (rendition.width, rendition.height)
+                for filter, rendition in result.items()
+            },
+            {
+                "width-400": (400, 300),
+                "width-100": (100, 75),
+                "fill-100x100": (100, 100),
+            },
+        )
+
+    def test_decoded_image_plans_resizes_from_larger_resizes(self):
+        with self.image.open_file() as f:
+            decoded = DecodedImage.open(f, reuse_resizes=True)
+        decoded.plan(
+            self.image,
+            [
+                Filter(spec)
+                for spec in ("width-100", "width-400", "width-200", "fill-100x100")
+            ],
+        )
+
+        # The cropping filter is not planned for reuse
+        self.assertEqual(decoded._planned_sizes, [(400, 300), (200, 150), (100, 75)])
+        self.assertIsNone(decoded._get_parent_size((400, 300)))
+        self.assertEqual(decoded._get_parent_size((200, 150)), (400, 300))
+        self.assertEqual(decoded._get_parent_size((100, 75)), (200, 150))
+
+        with mock.patch.object(
+            decoded.willow, "crop", wraps=decoded.willow.crop
+        ) as crop:
+            resized = decoded.crop_and_resize((0, 0, 640, 480), (100, 75))
+            decoded.crop_and_resize((0, 0, 640, 480), (200, 150))
+
+        # The original is only cropped (copied) once, for the largest size
+        crop.assert_called_once()
+        self.assertEqual(resized.get_size(), (100, 75))
+
+    def test_create_renditions_uses_generate_rendition_instance(self):
+        filter_list = [Filter(spec) for spec in self.SPECS]
+        with mock.patch.object(
+            self.image,
+            "generate_rendition_instance",
+            wraps=self.image.generate_rendition_instance,
+        ) as generate_rendition_instance:
+            result = self.image.create_renditions(*filter_list)
+
+        self.assertEqual(generate_rendition_instance.call_count, 3)
+        self.assertEqual(len(result), 3)
+
+    def test_create_renditions_with_generate_rendition_instance_without_decoded(self):
+        generate_rendition_instance = self.image.generate_rendition_instance
+
+        def legacy_generate_rendition_instance(filter, source):
+            return generate_rendition_instance(filter, source)
+
+        self.image.generate_rendition_instance = legacy_generate_rendition_instance
+        filter_list = [Filter(spec) for spec in self.SPECS]
+        result = self.image.create_renditions(*filter_list)
+
+        self.assertEqual(
+            {
+                filter.spec: (rendition.width, rendition.height)
+                for filter, rendition in result.items()
+            },
+            {"height-66": (88, 66), "width-100": (100, 75), "width-400": (400, 300)},
+        )
+
     def test_alt_attribute(self):
         rendition = self.image.get_rendition("width-400")
         self.assertEqual(rendition.alt, "Test image")
@@ -1091,6 +1186,95 @@ class TestRenditions(TestCase):
         self.assertEqual(renditions["width-200"].url, filename2)
 
 
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=5,
+)
+class TestRenditionLock(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+        self.filter = Filter("width-400")
+
+    def test_lock_is_released_after_generating(self):
+        lock = RenditionLock(self.image, self.filter)
+
+        with mock.patch.object(
+            RenditionLock, "release", autospec=True, side_effect=RenditionLock.release
+        ) as release:
+            rendition = self.image.create_rendition(self.filter)
+
+        release.assert_called_once()
+        self.assertEqual(rendition.width, 400)
+        self.assertIsNone(lock.cache.get(lock.key))
+
+    def test_waits_for_rendition_generated_elsewhere(self):
+        other_lock = RenditionLock(self.image, self.filter)
+        self.assertTrue(other_lock.acquire())
+        file = self.image.generate_rendition_file(self.filter)
+
+        def finish_generating(seconds):
+            # Simulate the other process finishing while we wait
+            self.image.renditions.create(
+                filter_spec="width-400",
+                focal_point_key=self.filter.get_cache_key(self.image),
+                file=file,
+            )
+            other_lock.release()
+
+        with (
+            mock.patch(
+                "wagtail.images.models.time.sleep", side_effect=finish_generating
+            ),
+            mock.patch.object(
+                Image, "generate_rendition_file", autospec=True
+            ) as generate_rendition_file,
+        ):
+            rendition = self.image.create_rendition(self.filter)
+
+        generate_rendition_file.assert_not_called()
+        self.assertEqual(rendition.filter_spec, "width-400")
+        self.assertEqual(self.image.renditions.count(), 1)
+
+    def test_reuses_rendition_generated_before_acquiring_lock(self):
+        # Another process generated the rendition after this one looked for it,
+        # and released the lock before this one tried to acquire it
+        existing = self.image.create_rendition(self.filter)
+
+        with mock.patch.object(
+            Image, "generate_rendition_file", autospec=True
+        ) as generate_rendition_file:
+            rendition = self.image.create_rendition(self.filter)
+
+        generate_rendition_file.assert_not_called()
+        self.assertEqual(rendition.pk, existing.pk)
+        lock = RenditionLock(self.image, self.filter)
+        self.assertIsNone(lock.cache.get(lock.key))
+
+    @override_settings(WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=0.01)
+    def test_generates_rendition_after_timeout(self):
+        other_lock = RenditionLock(self.image, self.filter)
+        # The other process is stuck, and holds the lock for longer than we wait
+        other_lock.timeout = 60
+        self.assertTrue(other_lock.acquire())
+
+        rendition = self.image.create_rendition(self.filter)
+
+        self.assertEqual(rendition.width, 400)
+        # The lock held by the other process is left alone
+        self.assertEqual(other_lock.cache.get(other_lock.key), other_lock.token)
+
+    @override_settings(WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=None)
+    def test_disabled_by_default(self):
+        with mock.patch.object(RenditionLock, "acquire") as acquire:
+            self.image.create_rendition(self.filter)
+
+        acquire.assert_not_called()
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 )
@@ -1,13 +1,19 @@
-from django.test import TestCase
+from unittest import mock
 
+from django.test import TestCase, override_settings
+
+from wagtail.images.checks import async_renditions_cache_check
 from wagtail.images.models import Filter
 from wagtail.images.shortcuts import (
     get_rendition_or_not_found,
     get_renditions_or_not_found,
 )
+from wagtail.images.tasks import generate_renditions_task
 
 from .utils import Image, get_test_image_file
 
+Rendition = Image.get_rendition_model()
+
 
 class TestShortcuts(TestCase):
     fixtures = ["test.json"]
@@ -62,3 +68,86 @@ class TestShortcuts(TestCase):
         self.assertEqual(tuple(renditions.keys()), ("width-200", "width-400"))
         self.assertEqual(renditions["width-200"].file.name, "not-found")
         self.assertEqual(renditions["width-400"].file.name, "not-found")
+
+
+@override_settings(
+    WAGTAILIMAGES_ASYNC_RENDITIONS="original",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestAsyncRenditions(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+        Rendition.cache_backend.clear()
+        patcher = mock.patch("wagtail.images.tasks.generate_renditions_task")
+        self.task = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_queued_specs(self):
+        return [call.args[3] for call in self.task.enqueue.call_args_list]
+
+    def test_missing_rendition_is_queued(self):
+        rendition = get_rendition_or_not_found(self.image, "fill-100x50")
+
+        self.assertEqual(self.get_queued_specs(), [["fill-100x50"]])
+        self.assertFalse(Rendition.objects.exists())
+
+        # The placeholder has the final dimensions, and points to the original image
+        self.assertIsNone(rendition.pk)
+        self.assertEqual((rendition.width, rendition.height), (100, 50))
+        self.assertEqual(rendition.url, self.image.file.url)
+        self.assertIn('height="50"', rendition.img_tag())
+        self.assertIn('width="100"', rendition.img_tag())
+
+    def test_rendition_is_only_queued_once(self):
+        get_rendition_or_not_found(self.image, "width-400")
+        renditions = get_renditions_or_not_found(self.image, ("width-200", "width-400"))
+
+        self.assertEqual(self.get_queued_specs(), [["width-400"], ["width-200"]])
+        self.assertEqual(tuple(renditions.keys()), ("width-200", "width-400"))
+        self.assertEqual(renditions["width-200"].width, 200)
+        self.assertEqual(renditions["width-400"].width, 400)
+
+    @override_settings(WAGTAILIMAGES_ASYNC_RENDITIONS="serve")
+    def test_placeholder_with_serve_url(self):
+        rendition = get_rendition_or_not_found(self.image, "width-200")
+
+        self.assertEqual(rendition.width, 200)
+        self.assertRegex(
+            rendition.url, rf"^/images/[^/]+/{self.image.pk}/width-200/test[^/]*\.png$"
+        )
+
+    def test_existing_rendition_is_returned(self):
+        existing = self.image.get_rendition("width-400")
+
+        rendition = get_rendition_or_not_found(self.image, "width-400")
+
+        self.assertEqual(self.get_queued_specs(), [])
+        self.assertEqual(rendition, existing)
+        self.assertEqual(rendition.url, existing.file.url)
+
+    def test_task_generates_renditions(self):
+        self.task.enqueue.side_effect = generate_renditions_task.enqueue
+
+        # The immediate task backend generates the renditions once the current
+        # transaction is committed, and the placeholder is used in the meantime
+        with self.captureOnCommitCallbacks(execute=True):
+            rendition = get_rendition_or_not_found(self.image, "width-400")
+
+        self.assertIsNone(rendition.pk)
+        self.assertTrue(self.image.renditions.filter(filter_spec="width-400").exists())
+
+    def test_dummy_cache_check(self):
+        self.assertEqual(async_renditions_cache_check(None), [])
+
+        with override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            }
+        ):
+            errors = async_renditions_cache_check(None)
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].id, "wagtailimages.W001")
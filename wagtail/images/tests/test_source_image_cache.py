@@ -0,0 +1,183 @@
+import concurrent.futures
+import json
+import os
+import pickle
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from wagtail.images.rendition_engines import DecodedImage, decode_source_image
+from wagtail.images.source_image_cache import SourceImageCache, get_source_image_cache
+
+from .utils import Image, get_test_image_file, get_test_image_file_jpeg
+
+# A 640x480 RGBA image takes 1.2MB once decoded
+CACHE_SIZE = 2 * 1024 * 1024
+
+
+@override_settings(WAGTAILIMAGES_SOURCE_IMAGE_CACHE_SIZE=CACHE_SIZE)
+class TestSourceImageCache(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(colour="red"),
+        )
+        self.other_image = Image.objects.create(
+            title="Other test image",
+            file=get_test_image_file(colour="blue"),
+        )
+        self.image.get_file_hash()
+        self.other_image.get_file_hash()
+
+    def decode(self, cache, image):
+        with image.get_willow_image() as willow_image:
+            decoded = DecodedImage.from_willow(willow_image)
+        cache.set(image, decoded.format_name, decoded.willow)
+        return decoded
+
+    def test_disabled_by_default(self):
+        with override_settings(WAGTAILIMAGES_SOURCE_IMAGE_CACHE_SIZE=0):
+            self.assertIsNone(get_source_image_cache())
+
+    def test_renditions_decode_original_once(self):
+        get_source_image_cache().clear()
+
+        with mock.patch.object(
+            DecodedImage, "from_willow", wraps=DecodedImage.from_willow
+        ) as decode_image:
+            self.image.get_rendition("width-400")
+            self.image.get_rendition("fill-100x100")
+            self.image.get_renditions("width-200", "height-100")
+
+        decode_image.assert_called_once()
+        self.assertEqual(
+            self.image.get_rendition("fill-100x100").file.size,
+            self.other_image.get_rendition("fill-100x100").file.size,
+        )
+
+    def test_concurrent_requests_decode_original_once(self):
+        get_source_image_cache().clear()
+
+        with (
+            mock.patch.object(
+                DecodedImage, "from_willow", wraps=DecodedImage.from_willow
+            ) as decode_image,
+            concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor,
+        ):
+            decoded = list(executor.map(decode_source_image, [self.image] * 4))
+
+        decode_image.assert_called_once()
+        self.assertEqual(len({id(d.willow) for d in decoded}), 1)
+
+    def test_locks_are_removed_after_use(self):
+        cache = SourceImageCache(CACHE_SIZE)
+        with cache.lock(self.image):
+            with self.assertRaises(ValueError), cache.lock(self.other_image):
+                self.assertEqual(len(cache._key_locks), 2)
+                raise ValueError
+
+        self.assertEqual(cache._key_locks, {})
+
+    def test_least_recently_used_images_are_evicted(self):
+        cache = SourceImageCache(CACHE_SIZE)
+        self.decode(cache, self.image)
+        self.decode(cache, self.other_image)
+
+        self.assertIsNone(cache.get(self.image))
+        self.assertIsNotNone(cache.get(self.other_image))
+
+    def test_images_over_budget_are_not_cached(self):
+        cache = SourceImageCache(1024)
+        self.decode(cache, self.image)
+
+        self.assertIsNone(cache.get(self.image))
+
+    def test_images_without_file_hash_are_not_cached(self):
+        cache = SourceImageCache(CACHE_SIZE)
+        self.image.file_hash = ""
+        self.decode(cache, self.image)
+
+        self.assertIsNone(cache.get(self.image))
+
+    def test_shared_between_processes_with_scratch_directory(self):
+        image = Image.objects.create(
+            title="Test JPEG image",
+            file=get_test_image_file_jpeg(colour="green"),
+        )
+        image.get_file_hash()
+
+        with tempfile.TemporaryDirectory() as directory:
+            decoded = self.decode(SourceImageCache(CACHE_SIZE, directory), image)
+            self.assertTrue(
+                os.path.exists(os.path.join(directory, f"{image.file_hash}.pixels"))
+            )
+
+            # A separate cache instance, as used in another process, reads the
+            # decoded pixels from the scratch directory
+            format_name, willow_image = SourceImageCache(CACHE_SIZE, directory).get(
+                image
+            )
+
+            self.assertEqual(format_name, "jpeg")
+            self.assertEqual(willow_image.get_size(), (640, 480))
+            self.assertEqual(
+                willow_image.image.tobytes(), decoded.willow.image.tobytes()
+            )
+
+    def test_scratch_directory_metadata_is_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.image.get_willow_image() as willow_image:
+                decoded = DecodedImage.from_willow(willow_image)
+            decoded.willow.image.info.update(
+                {"icc_profile": b"\x00profile", "dpi": (72, 72), 1: "ignored"}
+            )
+            SourceImageCache(CACHE_SIZE, directory).set(
+                self.image, decoded.format_name, decoded.willow
+            )
+
+            with open(os.path.join(directory, f"{self.image.file_hash}.meta")) as f:
+                meta = json.load(f)
+            self.assertEqual(meta["mode"], decoded.willow.image.mode)
+            self.assertEqual(meta["size"], [640, 480])
+
+            format_name, willow_image = SourceImageCache(CACHE_SIZE, directory).get(
+                self.image
+            )
+            self.assertEqual(willow_image.image.info["icc_profile"], b"\x00profile")
+            self.assertEqual(willow_image.image.info["dpi"], (72, 72))
+            self.assertNotIn(1, willow_image.image.info)
+
+    def test_unreadable_scratch_directory_metadata_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.decode(SourceImageCache(CACHE_SIZE, directory), self.image)
+            meta_path = os.path.join(directory, f"{self.image.file_hash}.meta")
+
+            for meta in [
+                pickle.dumps(("png", "RGBA", (640, 480), {})),
+                b"not json",
+                json.dumps({"format": "png", "mode": "P", "size": [640, 480]}).encode(),
+                json.dumps(
+                    {"format": "png", "mode": "XYZ", "size": [640, 480], "info": []}
+                ).encode(),
+            ]:
+                with self.subTest(meta=meta):
+                    with open(meta_path, "wb") as f:
+                        f.write(meta)
+                    self.assertIsNone(
+                        SourceImageCache(CACHE_SIZE, directory).get(self.image)
+                    )
+
+    def test_scratch_directory_is_pruned_to_budget(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SourceImageCache(CACHE_SIZE, directory)
+            self.decode(cache, self.image)
+            self.decode(cache, self.other_image)
+
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                [
+                    f"{self.other_image.file_hash}.meta",
+                    f"{self.other_image.file_hash}.pixels",
+                ],
+            )
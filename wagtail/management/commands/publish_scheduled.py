@@ -1,9 +1,17 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from django.apps import apps
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import Min
 from django.utils import dateparse, timezone
 
 from wagtail.models import DraftStateMixin, Page, Revision
 
+logger = logging.getLogger("wagtail")
+
 
 def revision_date_expired(r):
     expiry_str = r.content.get("expire_at")
@@ -16,6 +24,47 @@ def revision_date_expired(r):
         return False
 
 
+def get_scheduled_models():
+    models = [Page]
+    models += [
+        model
+        for model in apps.get_models()
+        if issubclass(model, DraftStateMixin) and not issubclass(model, Page)
+    ]
+    return models
+
+
+def get_next_due_at(models, after=None):
+    """
+    Return the earliest time (later than ``after``, if given) at which a scheduled
+    revision is due to be published, or a live object of one of ``models`` is due to
+    expire, or ``None`` if nothing is scheduled.
+    """
+    revisions = Revision.objects.filter(approved_go_live_at__isnull=False)
+    if after is not None:
+        revisions = revisions.filter(approved_go_live_at__gt=after)
+    due_times = [revisions.aggregate(due_at=Min("approved_go_live_at"))["due_at"]]
+
+    for model in models:
+        objects = model.objects.filter(live=True, expire_at__isnull=False)
+        if after is not None:
+            objects = objects.filter(expire_at__gt=after)
+        due_times.append(objects.aggregate(due_at=Min("expire_at"))["due_at"])
+
+    due_times = [due_at for due_at in due_times if due_at is not None]
+    return min(due_times) if due_times else None
+
+
+def publish_revision(revision):
+    # Just run publish for the revision -- since the approved go live datetime
+    # is before now it will make the object live
+    revision.publish(log_action="wagtail.publish.scheduled")
+
+
+def unpublish_expired(obj):
+    obj.unpublish(set_expired=True, log_action="wagtail.unpublish.scheduled")
+
+
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument(
@@ -25,20 +74,65 @@ class Command(BaseCommand):
             default=False,
             help="Dry run -- don't change anything.",
         )
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            default=False,
+            help="Keep running, and publish or unpublish objects as they become due.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60,
+            help=(
+                "In daemon mode, the longest time (in seconds) to wait before "
+                "checking for newly scheduled objects. Defaults to 60."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help=(
+                "The number of objects to publish or unpublish in each database "
+                "transaction. Defaults to 100."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "The number of batches to process concurrently, each in its own "
+                "thread and database connection. Defaults to 1."
+            ),
+        )
 
     def handle(self, *args, **options):
-        dryrun = False
+        models = get_scheduled_models()
+
         if options["dryrun"]:
+            if options["daemon"]:
+                raise CommandError("--dryrun can't be used with --daemon.")
             self.stdout.write("Will do a dry run.")
-            dryrun = True
+            self.show_due(models)
+            return
 
-        models = [Page]
-        models += [
-            model
-            for model in apps.get_models()
-            if issubclass(model, DraftStateMixin) and not issubclass(model, Page)
-        ]
+        self.batch_size = max(options["batch_size"], 1)
+        self.workers = max(options["workers"], 1)
 
+        if options["daemon"]:
+            self.run_daemon(models, options["interval"])
+            return
+
+        failed_count = self.process_due(models, timezone.now())
+        if failed_count:
+            raise CommandError(
+                f"{failed_count} scheduled objects could not be published or "
+                "unpublished. See the log for details."
+            )
+
+    def show_due(self, models):
         # 1. get all expired objects with live = True
         expired_objects = []
         for model in models:
@@ -48,70 +142,167 @@ class Command(BaseCommand):
                 )
             ]
 
-        if dryrun:
-            self.stdout.write("\n---------------------------------")
-            if expired_objects:
-                self.stdout.write("Expired objects to be deactivated:")
-                self.stdout.write("Expiry datetime\t\tModel\t\tSlug\t\tName")
-                self.stdout.write("---------------\t\t-----\t\t----\t\t----")
-                for queryset in expired_objects:
-                    if queryset.model is Page:
-                        for obj in queryset:
-                            self.stdout.write(
-                                "{}\t{}\t{}\t{}".format(
-                                    obj.expire_at.strftime("%Y-%m-%d %H:%M"),
-                                    obj.specific_class.__name__,
-                                    obj.slug,
-                                    obj.title,
-                                )
+        self.stdout.write("\n---------------------------------")
+        if expired_objects:
+            self.stdout.write("Expired objects to be deactivated:")
+            self.stdout.write("Expiry datetime\t\tModel\t\tSlug\t\tName")
+            self.stdout.write("---------------\t\t-----\t\t----\t\t----")
+            for queryset in expired_objects:
+                if queryset.model is Page:
+                    for obj in queryset:
+                        self.stdout.write(
+                            "{}\t{}\t{}\t{}".format(
+                                obj.expire_at.strftime("%Y-%m-%d %H:%M"),
+                                obj.specific_class.__name__,
+                                obj.slug,
+                                obj.title,
                             )
-                    else:
-                        for obj in queryset:
-                            self.stdout.write(
-                                "{}\t{}\t{}\t\t{}".format(
-                                    obj.expire_at.strftime("%Y-%m-%d %H:%M"),
-                                    queryset.model.__name__,
-                                    "",
-                                    str(obj),
-                                )
+                        )
+                else:
+                    for obj in queryset:
+                        self.stdout.write(
+                            "{}\t{}\t{}\t\t{}".format(
+                                obj.expire_at.strftime("%Y-%m-%d %H:%M"),
+                                queryset.model.__name__,
+                                "",
+                                str(obj),
                             )
-            else:
-                self.stdout.write("No expired objects to be deactivated found.")
+                        )
         else:
-            # Unpublish the expired objects
-            for queryset in expired_objects:
-                # Cast to list to make sure the query is fully evaluated
-                # before unpublishing anything
-                for obj in list(queryset):
-                    obj.unpublish(
-                        set_expired=True, log_action="wagtail.unpublish.scheduled"
-                    )
+            self.stdout.write("No expired objects to be deactivated found.")
 
         # 2. get all revisions that need to be published
         revs_for_publishing = Revision.objects.filter(
             approved_go_live_at__lt=timezone.now()
         ).order_by("approved_go_live_at")
-        if dryrun:
-            self.stdout.write("\n---------------------------------")
-            if revs_for_publishing:
-                self.stdout.write("Revisions to be published:")
-                self.stdout.write("Go live datetime\tModel\t\tSlug\t\tName")
-                self.stdout.write("----------------\t-----\t\t----\t\t----")
-                for rp in revs_for_publishing:
-                    model = rp.content_type.model_class()
-                    rev_data = rp.content
-                    self.stdout.write(
-                        "{}\t{}\t{}\t\t{}".format(
-                            rp.approved_go_live_at.strftime("%Y-%m-%d %H:%M"),
-                            model.__name__,
-                            rev_data.get("slug", ""),
-                            rev_data.get("title", rp.object_str),
-                        )
+        self.stdout.write("\n---------------------------------")
+        if revs_for_publishing:
+            self.stdout.write("Revisions to be published:")
+            self.stdout.write("Go live datetime\tModel\t\tSlug\t\tName")
+            self.stdout.write("----------------\t-----\t\t----\t\t----")
+            for rp in revs_for_publishing:
+                model = rp.content_type.model_class()
+                rev_data = rp.content
+                self.stdout.write(
+                    "{}\t{}\t{}\t\t{}".format(
+                        rp.approved_go_live_at.strftime("%Y-%m-%d %H:%M"),
+                        model.__name__,
+                        rev_data.get("slug", ""),
+                        rev_data.get("title", rp.object_str),
                     )
-            else:
-                self.stdout.write("No objects to go live.")
+                )
         else:
-            for rp in revs_for_publishing:
-                # just run publish for the revision -- since the approved go
-                # live datetime is before now it will make the object live
-                rp.publish(log_action="wagtail.publish.scheduled")
+            self.stdout.write("No objects to go live.")
+
+    def process_due(self, models, now):
+        """
+        Unpublish the live objects of ``models`` that expired before ``now``, then
+        publish the revisions that were due to go live before ``now``. Returns the
+        number of objects that failed to be unpublished or published.
+        """
+        # 1. unpublish all expired objects with live = True
+        batches = []
+        for model in models:
+            pks = (
+                model.objects.filter(live=True, expire_at__lt=now)
+                .order_by("expire_at")
+                .values_list("pk", flat=True)
+            )
+            batches += [
+                (
+                    model.objects.filter(pk__in=batch, live=True, expire_at__lt=now),
+                    unpublish_expired,
+                )
+                for batch in self.get_batches(pks)
+            ]
+        failed_count = self.process_batches(batches)
+
+        # 2. publish all revisions that are due to go live. An object only has one
+        # revision with approved_go_live_at at a time, so each revision is for a
+        # different object
+        pks = (
+            Revision.objects.filter(approved_go_live_at__lt=now)
+            .order_by("approved_go_live_at")
+            .values_list("pk", flat=True)
+        )
+        batches = [
+            (
+                Revision.objects.filter(
+                    pk__in=batch, approved_go_live_at__lt=now
+                ).order_by("approved_go_live_at"),
+                publish_revision,
+            )
+            for batch in self.get_batches(pks)
+        ]
+        failed_count += self.process_batches(batches)
+
+        return failed_count
+
+    def get_batches(self, pks):
+        pks = list(pks)
+        for i in range(0, len(pks), self.batch_size):
+            yield pks[i : i + self.batch_size]
+
+    def process_batches(self, batches):
+        """
+        Process each ``(queryset, action)`` pair in ``batches``, concurrently if
+        more than one worker is configured. Returns the number of failed objects.
+        """
+        # SQLite only allows one write transaction at a time, so concurrent batches
+        # would fail to acquire the lock rather than run in parallel
+        if self.workers > 1 and len(batches) > 1 and connection.vendor != "sqlite":
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                return sum(executor.map(self._process_batch_in_thread, batches))
+
+        return sum(self.process_batch(queryset, action) for queryset, action in batches)
+
+    def _process_batch_in_thread(self, batch):
+        try:
+            return self.process_batch(*batch)
+        finally:
+            # Close the database connections opened by this thread
+            connections.close_all()
+
+    def process_batch(self, queryset, action):
+        """
+        Apply ``action`` to each object in ``queryset`` within a single transaction.
+        Each object is processed in its own savepoint, so that an object that fails
+        is rolled back and skipped without affecting the others. Returns the number
+        of objects that failed.
+        """
+        failed_count = 0
+        with transaction.atomic():
+            for obj in queryset.all():
+                try:
+                    with transaction.atomic():
+                        action(obj)
+                except Exception:
+                    logger.exception("Failed to process scheduled %r", obj)
+                    failed_count += 1
+        return failed_count
+
+    def get_wait_time(self, next_due_at, interval):
+        if next_due_at is None:
+            return interval
+        wait_time = (next_due_at - timezone.now()).total_seconds()
+        return min(max(wait_time, 0), interval)
+
+    def run_daemon(self, models, interval):
+        self.stdout.write(
+            "Publishing scheduled objects as they become due. Press CTRL+C to stop."
+        )
+        try:
+            while True:
+                if not connection.in_atomic_block:
+                    # Discard database connections that have been closed, or have
+                    # outlived CONN_MAX_AGE, as Django does around each request
+                    close_old_connections()
+
+                now = timezone.now()
+                self.process_due(models, now)
+
+                # Objects that failed remain due, and are retried after the interval
+                next_due_at = get_next_due_at(models, after=now)
+                time.sleep(self.get_wait_time(next_due_at, interval))
+        except KeyboardInterrupt:
+            pass
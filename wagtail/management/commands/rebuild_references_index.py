@@ -2,7 +2,7 @@ from django.apps import apps
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from wagtail.models import ReferenceIndex
+from wagtail.models import ReferenceIndex, ReferenceIndexContentHash
 from wagtail.signal_handlers import disable_reference_index_auto_update
 
 DEFAULT_CHUNK_SIZE = 1000
@@ -41,6 +41,10 @@ class Command(BaseCommand):
                 # Use `_raw_delete` to avoid loading instances into memory
                 all_references = ReferenceIndex.objects.all()
                 all_references._raw_delete(using=all_references.db)
+                # Content hashes are only meaningful alongside the references
+                # they were recorded with, so clear those too
+                all_content_hashes = ReferenceIndexContentHash.objects.all()
+                all_content_hashes._raw_delete(using=all_content_hashes.db)
 
             for model in apps.get_models():
                 if not ReferenceIndex.is_indexed(model):
@@ -48,14 +52,12 @@ class Command(BaseCommand):
 
                 self.write(str(model))
 
-                # Add items (chunk_size at a time)
-                for chunk in self.print_iter_progress(
-                    self.queryset_chunks(model.objects.all().order_by("pk"), chunk_size)
+                # Add items (chunk_size at a time). The table has just been emptied,
+                # so references can be bulk-inserted without checking for existing ones
+                for chunk_length in self.print_iter_progress(
+                    ReferenceIndex.rebuild_for_model(model, chunk_size=chunk_size)
                 ):
-                    for instance in chunk:
-                        ReferenceIndex.create_or_update_for_object(instance)
-
-                    object_count += len(chunk)
+                    object_count += chunk_length
 
                 self.print_newline()
 
@@ -87,20 +89,3 @@ class Command(BaseCommand):
                 self.write(" ", ending="")
 
             self.stdout.flush()
-
-    # Atomic so the count of models doesn't change as it is iterated
-    @transaction.atomic
-    def queryset_chunks(self, qs, chunk_size=DEFAULT_CHUNK_SIZE):
-        """
-        Yield a queryset in chunks of at most ``chunk_size``. The chunk yielded
-        will be a list, not a queryset. Iterating over the chunks is done in a
-        transaction so that the order and count of items in the queryset
-        remains stable.
-        """
-        i = 0
-        while True:
-            items = list(qs[i * chunk_size :][:chunk_size])
-            if not items:
-                break
-            yield items
-            i += 1
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+def create_url_path_index(apps, schema_editor):
+    """
+    Add an index on wagtailcore_page.url_path so that pages can be routed with a
+    single lookup on the full path (see ``WAGTAIL_SINGLE_QUERY_ROUTING``).
+
+    ``url_path`` is a TextField, which MySQL can only index with an explicit prefix
+    length; this isn't expressible as a Django ``models.Index``, so the index is
+    created with raw SQL.
+    """
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            "CREATE INDEX wagtailcore_page_url_path_idx ON wagtailcore_page (url_path(255))"
+        )
+    else:
+        schema_editor.execute(
+            "CREATE INDEX wagtailcore_page_url_path_idx ON wagtailcore_page (url_path)"
+        )
+
+
+def drop_url_path_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            "DROP INDEX wagtailcore_page_url_path_idx ON wagtailcore_page"
+        )
+    else:
+        schema_editor.execute("DROP INDEX wagtailcore_page_url_path_idx")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtailcore", "0095_groupsitepermission"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_url_path_index, drop_url_path_index),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("wagtailcore", "0096_page_url_path_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReferenceIndexContentHash",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.CharField(max_length=255, verbose_name="object id"),
+                ),
+                ("field_name", models.CharField(max_length=255)),
+                ("content_hash", models.CharField(max_length=32)),
+                (
+                    "base_content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("base_content_type", "object_id", "field_name")},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtailcore", "0097_referenceindexcontenthash"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="page",
+            index=models.Index(
+                fields=["live", "expire_at"], name="page_live_expire_at_idx"
+            ),
+        ),
+    ]
@@ -77,7 +77,7 @@ from .pages import (  # noqa: F401
 )
 from .panels import CommentPanelPlaceholder, PanelPlaceholder  # noqa: F401
 from .preview import PreviewableMixin  # noqa: F401
-from .reference_index import ReferenceIndex  # noqa: F401
+from .reference_index import ReferenceIndex, ReferenceIndexContentHash  # noqa: F401
 from .revisions import (  # noqa: F401
     PageRevisionsManager,
     Revision,
@@ -12,6 +12,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core import checks
 from django.core.exceptions import (
     FieldDoesNotExist,
+    ObjectDoesNotExist,
     ValidationError,
 )
 from django.db import models, transaction
@@ -58,7 +59,7 @@ from wagtail.signals import (
     page_slug_changed,
     pre_validate_delete,
 )
-from wagtail.url_routing import RouteResult
+from wagtail.url_routing import RouteCache, RouteResult
 from wagtail.utils.timestamps import ensure_utc
 
 from .audit_log import BaseLogEntry, BaseLogEntryManager, LogEntryQuerySet
@@ -70,7 +71,7 @@ from .locking import LockableMixin
 from .panels import CommentPanelPlaceholder, PanelPlaceholder
 from .preview import PreviewableMixin
 from .revisions import Revision, RevisionMixin
-from .sites import Site
+from .sites import Site, invalidate_site_lookup_table
 from .specific import SpecificMixin
 from .view_restrictions import BaseViewRestriction
 from .workflows import WorkflowMixin
@@ -499,11 +500,20 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
                     path_components = [
                         component for component in path.split("/") if component
                     ]
-                    request._wagtail_route_for_request = (
-                        site.root_page.localized.specific.route(
-                            request, path_components
+                    if route_cache := RouteCache.from_settings():
+                        request._wagtail_route_for_request = Page._route_with_cache(
+                            request, site, path_components, route_cache
+                        )
+                    elif getattr(settings, "WAGTAIL_SINGLE_QUERY_ROUTING", False):
+                        request._wagtail_route_for_request = Page._route_by_url_path(
+                            request, site.root_page.localized, path_components
+                        )
+                    else:
+                        request._wagtail_route_for_request = (
+                            site.root_page.localized.specific.route(
+                                request, path_components
+                            )
                         )
-                    )
                 else:
                     request._wagtail_route_for_request = None
             except Http404:
@@ -512,6 +522,106 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
         return request._wagtail_route_for_request
 
+    @staticmethod
+    def _route_by_url_path(
+        request: HttpRequest, root_page: Page, path_components: list[str]
+    ) -> RouteResult:
+        """
+        Equivalent to ``root_page.specific.route(request, path_components)``, but
+        fetches every page along the path with a single query on ``url_path``
+        rather than descending the tree one level at a time.
+        """
+        page, remaining_components = Page._get_route_handler(root_page, path_components)
+        return page.specific.route(request, remaining_components)
+
+    @staticmethod
+    def _route_with_cache(
+        request: HttpRequest,
+        site: Site,
+        path_components: list[str],
+        route_cache: RouteCache,
+    ) -> RouteResult:
+        """
+        Route the request using ``route_cache`` to look up the page responsible for
+        the path, falling back on ``_get_route_handler`` (and populating the cache)
+        if there is no valid entry.
+        """
+        cached_route = route_cache.get(site.pk, path_components)
+        if cached_route is not None:
+            page_id, content_type_id, remaining_components = cached_route
+            try:
+                model = ContentType.objects.get_for_id(content_type_id).model_class()
+                if model is not None:
+                    page = model._default_manager.get(id=page_id)
+                    return page.route(request, list(remaining_components))
+            except ObjectDoesNotExist:
+                # The page or its content type has been deleted since it was
+                # cached; fall through and resolve the route again
+                pass
+
+        root_page = site.root_page.localized
+        versions = route_cache.get_versions(root_page, path_components)
+        page, remaining_components = Page._get_route_handler(root_page, path_components)
+        route_cache.set(
+            site.pk,
+            path_components,
+            versions,
+            (page.pk, page.content_type_id, remaining_components),
+        )
+        return page.specific.route(request, remaining_components)
+
+    @staticmethod
+    def _get_route_handler(
+        root_page: Page, path_components: list[str]
+    ) -> tuple[Page, list[str]]:
+        """
+        Find the page whose ``route()`` method is responsible for the given path
+        components, underneath ``root_page``, along with the path components that
+        remain to be passed to it.
+
+        This is normally the page at the end of the path (with no remaining
+        components), but if a page along the path has a custom ``route()``
+        implementation (such as ``RoutablePageMixin``), routing is handed off to
+        that page with the remaining path components, exactly as the default
+        implementation of ``route()`` would. Raises ``Http404`` if no such page
+        exists.
+        """
+        candidate_url_paths = [root_page.url_path]
+        for component in path_components:
+            candidate_url_paths.append(candidate_url_paths[-1] + component + "/")
+
+        pages_by_depth = {
+            page.depth: page
+            for page in Page.objects.filter(
+                url_path__in=candidate_url_paths,
+                path__startswith=root_page.path,
+                depth__range=(root_page.depth, root_page.depth + len(path_components)),
+            ).order_by("depth", "path")
+        }
+        # The root page we were given may be a more complete (e.g. localized)
+        # instance than the one just fetched
+        pages_by_depth[root_page.depth] = root_page
+
+        parent = None
+        for i, url_path in enumerate(candidate_url_paths):
+            page = pages_by_depth.get(root_page.depth + i)
+            if page is None or page.url_path != url_path:
+                raise Http404
+
+            if parent is not None:
+                # Treebeard's get_parent will use the `_cached_parent_obj` attribute if it exists
+                page._cached_parent_obj = parent
+
+            specific_class = page.specific_class
+            if specific_class is not None and specific_class.route is not Page.route:
+                # Hand off to the custom route() implementation
+                return page, path_components[i:]
+
+            parent = page
+
+        # request is for the last page on the path
+        return page, []
+
     @staticmethod
     def find_for_request(request: HttpRequest, path: str) -> Page | None:
         """
@@ -771,6 +881,8 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         # always check if this page is a site root, even if it's new.
         if self.is_site_root():
             Site.clear_site_root_paths_cache()
+            # The site lookup table holds a copy of the root page
+            invalidate_site_lookup_table()
 
         # Log
         if is_new:
@@ -2032,6 +2144,10 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         verbose_name = _("page")
         verbose_name_plural = _("pages")
         unique_together = [("translation_key", "locale")]
+        indexes = [
+            # Used by the publish_scheduled command to find expired pages
+            models.Index(fields=["live", "expire_at"], name="page_live_expire_at_idx"),
+        ]
         # Make sure that we auto-create Permission objects that are defined in
         # PAGE_PERMISSION_TYPES, skipping the default_permissions from Django.
         permissions = [
@@ -1,9 +1,11 @@
+import json
 import uuid
-from itertools import groupby
+from itertools import groupby, islice
 
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRel
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import connection, models
 from django.db.models import CharField, Count, OuterRef, Subquery
 from django.db.models.functions import Cast, Coalesce
@@ -14,7 +16,8 @@ from modelcluster.fields import ParentalKey
 from modelcluster.models import ClusterableModel, get_all_child_relations
 from taggit.models import ItemBase
 
-from wagtail.blocks import StreamBlock
+from wagtail.blocks import StreamBlock, StreamValue
+from wagtail.coreutils import safe_md5
 from wagtail.fields import StreamField
 
 
@@ -115,6 +118,36 @@ class ReferenceIndexQuerySet(models.QuerySet):
         }
 
 
+class ReferenceIndexContentHash(models.Model):
+    """
+    Records a hash of the content of each StreamField on an object at the time its
+    references were last recorded in the ReferenceIndex, so that the (potentially
+    expensive) extraction of references from a StreamField can be skipped when the
+    object is saved again without that field having changed.
+    """
+
+    base_content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    object_id = models.CharField(
+        max_length=255,
+        verbose_name=_("object id"),
+    )
+    field_name = models.CharField(max_length=255)
+    content_hash = models.CharField(max_length=32)
+
+    wagtail_reference_index_ignore = True
+
+    class Meta:
+        unique_together = [
+            (
+                "base_content_type",
+                "object_id",
+                "field_name",
+            )
+        ]
+
+
 class ReferenceIndex(models.Model):
     """
     Records references between objects for quick retrieval of object usage.
@@ -315,12 +348,13 @@ class ReferenceIndex(models.Model):
         return model in cls.indexed_models
 
     @classmethod
-    def _extract_references_from_object(cls, object):
+    def _extract_references_from_object(cls, object, exclude_fields=()):
         """
         Generator that scans the given object and yields any references it finds.
 
         Args:
             object (Model): an instance of a Django model to scan for references
+            exclude_fields (Iterable[str]): names of fields on the object to skip
 
         Yields:
             A tuple (content_type_id, object_id, model_path, content_path) for each
@@ -340,6 +374,9 @@ class ReferenceIndex(models.Model):
         """
         # Extract references from fields
         for field in object._meta.get_fields():
+            if field.name in exclude_fields:
+                continue
+
             if field.is_relation and field.many_to_one:
                 if getattr(field, "wagtail_reference_index_ignore", False):
                     continue
@@ -456,9 +493,6 @@ class ReferenceIndex(models.Model):
         # (to_content_type_id, to_object_id, model_path, content_path) - the properties that
         # uniquely define a reference
 
-        # Extract new references and construct a set of reference records
-        references = set(cls._extract_references_from_object(object))
-
         # Find content types for this model and all of its ancestor classes,
         # ordered from most to least specific
         content_types = [
@@ -469,7 +503,40 @@ class ReferenceIndex(models.Model):
         base_content_type = content_types[-1]
         known_content_type_ids = [ct.id for ct in content_types]
 
+        # Find StreamFields whose content is unchanged since the object was last
+        # indexed. References from these fields are left as they are in the index.
+        content_hashes = cls._get_stream_field_content_hashes(object)
+        unchanged_field_names = set()
+        if content_hashes:
+            previous_content_hashes = dict(
+                ReferenceIndexContentHash.objects.filter(
+                    base_content_type=base_content_type, object_id=object.pk
+                ).values_list("field_name", "content_hash")
+            )
+            unchanged_field_names = {
+                field_name
+                for field_name, content_hash in content_hashes.items()
+                if previous_content_hashes.get(field_name) == content_hash
+            }
+
+        # Extract new references and construct a set of reference records
+        references = set(
+            cls._extract_references_from_object(
+                object, exclude_fields=unchanged_field_names
+            )
+        )
+
         # Find existing references in the database so we know what to add/delete.
+        # References from unchanged fields are left out, so that they are neither
+        # added nor deleted.
+        existing_references_qs = cls.objects.filter(
+            base_content_type=base_content_type, object_id=object.pk
+        )
+        for field_name in unchanged_field_names:
+            existing_references_qs = existing_references_qs.exclude(
+                model_path=field_name
+            ).exclude(model_path__startswith=f"{field_name}.")
+
         # Construct a dict mapping reference records to the (content_type_id, id) pair that the
         # existing database entry is found under
         existing_references = {
@@ -477,9 +544,7 @@ class ReferenceIndex(models.Model):
                 content_type_id,
                 id,
             )
-            for id, content_type_id, to_content_type_id, to_object_id, model_path, content_path in cls.objects.filter(
-                base_content_type=base_content_type, object_id=object.pk
-            ).values_list(
+            for id, content_type_id, to_content_type_id, to_object_id, model_path, content_path in existing_references_qs.values_list(
                 "id",
                 "content_type_id",
                 "to_content_type",
@@ -539,6 +604,175 @@ class ReferenceIndex(models.Model):
         # Perform the deletion
         cls.objects.filter(id__in=deleted_reference_ids).delete()
 
+        # Record the hashes of the StreamFields that have been (re-)extracted
+        changed_content_hashes = {
+            field_name: content_hash
+            for field_name, content_hash in content_hashes.items()
+            if field_name not in unchanged_field_names
+        }
+        if changed_content_hashes:
+            ReferenceIndexContentHash.objects.bulk_create(
+                [
+                    ReferenceIndexContentHash(
+                        base_content_type=base_content_type,
+                        object_id=object.pk,
+                        field_name=field_name,
+                        content_hash=content_hash,
+                    )
+                    for field_name, content_hash in changed_content_hashes.items()
+                ],
+                # Upsert, so that concurrent saves of the same object don't both
+                # try to insert the hashes. MySQL doesn't accept unique_fields,
+                # but updates on any unique constraint conflict
+                update_conflicts=True,
+                unique_fields=(
+                    ["base_content_type", "object_id", "field_name"]
+                    if connection.features.supports_update_conflicts_with_target
+                    else None
+                ),
+                update_fields=["content_hash"],
+            )
+
+    @classmethod
+    def _get_stream_field_content_hashes(cls, object):
+        """
+        Returns a dict mapping the name of each StreamField on the given object to a
+        hash of its content.
+        """
+        content_hashes = {}
+        for field in object._meta.get_fields():
+            if not isinstance(field, StreamField):
+                continue
+
+            # Don't assign new IDs to any blocks that are missing them, as that
+            # would change the value on the object
+            value = field.value_from_object(object)
+            content_hashes[field.name] = safe_md5(
+                json.dumps(
+                    value.get_prep_value(assign_ids=False),
+                    sort_keys=True,
+                    cls=DjangoJSONEncoder,
+                ).encode("utf-8"),
+                usedforsecurity=False,
+            ).hexdigest()
+
+        return content_hashes
+
+    @classmethod
+    def _get_child_relation_names(cls, model):
+        """
+        Returns the accessor names of the child relations on the given model that
+        references are extracted from.
+        """
+        if not issubclass(model, ClusterableModel):
+            return []
+        return [
+            child_relation.get_accessor_name()
+            for child_relation in get_all_child_relations(model)
+        ]
+
+    @classmethod
+    def _prefetch_stream_blocks(cls, objects):
+        """
+        Converts the raw data of all StreamField values on the given objects (and
+        their child objects) to native values, with one ``bulk_to_python`` call per
+        block type across all of the objects. This avoids a query per object per
+        block type when references are subsequently extracted from each object.
+        """
+        stream_values = []
+
+        def collect(objects):
+            for object in objects:
+                for field in object._meta.get_fields():
+                    if isinstance(field, StreamField):
+                        value = field.value_from_object(object)
+                        if value is not None:
+                            stream_values.append(value)
+
+                for relation_name in cls._get_child_relation_names(type(object)):
+                    collect(getattr(object, relation_name).all())
+
+        collect(objects)
+        StreamValue.prefetch_blocks_in_bulk(stream_values)
+
+    @classmethod
+    def create_for_objects(cls, objects):
+        """
+        Creates ReferenceIndex records for the given objects, which must all be
+        instances of the same model.
+
+        Unlike ``create_or_update_for_object``, this does not look up or remove any
+        existing records, so it is only suitable for objects that have not been
+        indexed yet, such as when rebuilding the index from scratch. References are
+        extracted from all of the objects together, and inserted with a single
+        ``bulk_create``.
+
+        Args:
+            objects (list[Model]): The model instances to create ReferenceIndex records for
+
+        Returns:
+            The number of ReferenceIndex records created
+        """
+        if not objects:
+            return 0
+
+        model = type(objects[0])
+        content_type = ContentType.objects.get_for_model(
+            model, for_concrete_model=False
+        )
+        base_content_type = cls._get_base_content_type(model)
+
+        cls._prefetch_stream_blocks(objects)
+
+        bulk_create_kwargs = {}
+        if connection.features.supports_ignore_conflicts:
+            bulk_create_kwargs["ignore_conflicts"] = True
+
+        return len(
+            cls.objects.bulk_create(
+                [
+                    cls(
+                        content_type=content_type,
+                        base_content_type=base_content_type,
+                        object_id=object.pk,
+                        to_content_type_id=to_content_type_id,
+                        to_object_id=to_object_id,
+                        model_path=model_path,
+                        content_path=content_path,
+                        content_path_hash=cls._get_content_path_hash(content_path),
+                    )
+                    for object in objects
+                    for to_content_type_id, to_object_id, model_path, content_path in set(
+                        cls._extract_references_from_object(object)
+                    )
+                ],
+                **bulk_create_kwargs,
+            )
+        )
+
+    @classmethod
+    def rebuild_for_model(cls, model, chunk_size=1000):
+        """
+        Creates ReferenceIndex records for every instance of the given model, in chunks
+        of ``chunk_size`` objects. Objects are streamed from the database with
+        ``iterator()``, with their child relations prefetched for each chunk.
+
+        As with ``create_for_objects``, existing records are not looked up or removed,
+        so this should be used when rebuilding the index from an empty table.
+
+        Yields:
+            The number of objects processed, after each chunk
+        """
+        objects = (
+            model.objects.all()
+            .order_by("pk")
+            .prefetch_related(*cls._get_child_relation_names(model))
+            .iterator(chunk_size=chunk_size)
+        )
+        while chunk := list(islice(objects, chunk_size)):
+            cls.create_for_objects(chunk)
+            yield len(chunk)
+
     @classmethod
     def remove_for_object(cls, object):
         """
@@ -553,6 +787,9 @@ class ReferenceIndex(models.Model):
         cls.objects.filter(
             base_content_type=base_content_type, object_id=object.pk
         ).delete()
+        ReferenceIndexContentHash.objects.filter(
+            base_content_type=base_content_type, object_id=object.pk
+        ).delete()
 
     @classmethod
     def get_references_for_object(cls, object):
@@ -1,3 +1,6 @@
+import copy
+import threading
+import uuid
 from collections import namedtuple
 
 from django.apps import apps
@@ -5,7 +8,7 @@ from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Case, IntegerField, Q, When
 from django.db.models.functions import Lower
 from django.http.request import split_domain_port
@@ -62,6 +65,112 @@ def get_site_for_hostname(hostname, port):
     raise Site.DoesNotExist()
 
 
+SITE_LOOKUP_TABLE_VERSION_CACHE_KEY = "wagtail_site_lookup_table_version"
+
+
+class SiteLookupTable:
+    """
+    An in-memory copy of all sites, used by ``Site.find_for_request`` to find the
+    site for a hostname and port without querying the database. Sites are matched
+    in the same way as ``get_site_for_hostname``.
+    """
+
+    def __init__(self, version: str):
+        Site = apps.get_model("wagtailcore.Site")
+
+        self.version = version
+        self.sites_by_hostname = {}
+        self.default_site = None
+        for site in Site.objects.select_related("root_page").order_by():
+            self.sites_by_hostname.setdefault(site.hostname, []).append(site)
+            if site.is_default_site:
+                self.default_site = site
+
+    def get(self, hostname, port):
+        """
+        Return the site for the given hostname and port, or raise
+        ``Site.DoesNotExist`` if there is no matching or default site.
+        """
+        site = self._get(hostname, port)
+        if site is None:
+            raise apps.get_model("wagtailcore.Site").DoesNotExist()
+
+        # The table is shared between requests, so return a copy that can be
+        # modified (for example, by caching attributes on the root page)
+        site = copy.copy(site)
+        site.root_page = copy.copy(site.root_page)
+        return site
+
+    def _get(self, hostname, port):
+        hostname_matches = self.sites_by_hostname.get(hostname, [])
+        for site in hostname_matches:
+            # The port of a request is a string
+            if str(site.port) == str(port):
+                return site
+
+        if self.default_site is not None and self.default_site in hostname_matches:
+            return self.default_site
+
+        if len(hostname_matches) == 1:
+            return hostname_matches[0]
+
+        if not hostname_matches or self.default_site is not None:
+            return self.default_site
+
+        # Several hostname matches, none of which match the port or are the
+        # default site, are ambiguous
+        return None
+
+
+_site_lookup_table = None
+_site_lookup_table_lock = threading.Lock()
+
+
+def get_site_lookup_table():
+    """
+    Return the up-to-date site lookup table for this process, rebuilding it if
+    sites have changed since it was built, or ``None`` if it is disabled by the
+    ``WAGTAIL_SITE_LOOKUP_TABLE`` setting.
+    """
+    global _site_lookup_table
+
+    if not getattr(settings, "WAGTAIL_SITE_LOOKUP_TABLE", False):
+        return None
+
+    version = cache.get(SITE_LOOKUP_TABLE_VERSION_CACHE_KEY)
+    if version is None:
+        # Use add() so that we don't overwrite a token that has just been set by
+        # a concurrent invalidation
+        cache.add(SITE_LOOKUP_TABLE_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(SITE_LOOKUP_TABLE_VERSION_CACHE_KEY)
+
+    lookup_table = _site_lookup_table
+    if lookup_table is not None and lookup_table.version == version:
+        return lookup_table
+
+    with _site_lookup_table_lock:
+        # Another thread may have rebuilt the table while we waited for the lock
+        if _site_lookup_table is None or _site_lookup_table.version != version:
+            _site_lookup_table = SiteLookupTable(version)
+        return _site_lookup_table
+
+
+def _set_site_lookup_table_version():
+    cache.set(SITE_LOOKUP_TABLE_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_site_lookup_table():
+    """
+    Mark the site lookup tables of all processes as stale, so that they are
+    rebuilt before their next use.
+    """
+    if getattr(settings, "WAGTAIL_SITE_LOOKUP_TABLE", False):
+        _set_site_lookup_table_version()
+        # Processes may rebuild their tables from the old data until the change
+        # is committed, so mark them as stale again then
+        transaction.on_commit(_set_site_lookup_table_version)
+
+
 class SiteManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().order_by(Lower("hostname"))
@@ -166,7 +275,10 @@ class Site(models.Model):
         port = request.get_port()
         site = None
         try:
-            site = get_site_for_hostname(hostname, port)
+            if lookup_table := get_site_lookup_table():
+                site = lookup_table.get(hostname, port)
+            else:
+                site = get_site_for_hostname(hostname, port)
         except Site.DoesNotExist:
             pass
             # copy old SiteMiddleware behaviour
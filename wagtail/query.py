@@ -2,11 +2,12 @@ import posixpath
 import warnings
 from collections import defaultdict
 from collections.abc import Iterable
+from itertools import islice
 from typing import Any
 
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import CharField, Prefetch, Q
+from django.db.models import CharField, Model, Prefetch, Q
 from django.db.models.expressions import Exists, OuterRef
 from django.db.models.functions import Cast, Length, Substr
 from django.db.models.query import ModelIterable
@@ -149,6 +150,9 @@ class SpecificQuerySetMixin:
         self._defer_streamfields = False
         self._specific_select_related_fields = ()
         self._specific_prefetch_related_lookups = ()
+        # set by prefetch_stream_blocks()
+        self._prefetch_stream_block_fields = ()
+        self._prefetch_stream_blocks_done = False
 
     def _clone(self):
         """Ensure clones inherit custom attribute values."""
@@ -158,8 +162,31 @@ class SpecificQuerySetMixin:
         clone._specific_prefetch_related_lookups = (
             self._specific_prefetch_related_lookups
         )
+        clone._prefetch_stream_block_fields = self._prefetch_stream_block_fields
         return clone
 
+    def _fetch_all(self):
+        super()._fetch_all()
+        if self._prefetch_stream_block_fields and not self._prefetch_stream_blocks_done:
+            prefetch_stream_blocks(
+                self._result_cache, self._prefetch_stream_block_fields
+            )
+            self._prefetch_stream_blocks_done = True
+
+    def _iterator(self, use_chunked_fetch, chunk_size):
+        if not self._prefetch_stream_block_fields:
+            yield from super()._iterator(use_chunked_fetch, chunk_size)
+            return
+
+        # As with prefetch_related() lookups, prefetch the blocks of each chunk,
+        # using the same default chunk size as iterator()
+        if chunk_size is None:
+            chunk_size = 2000
+        iterator = super()._iterator(use_chunked_fetch, chunk_size)
+        while results := list(islice(iterator, chunk_size)):
+            prefetch_stream_blocks(results, self._prefetch_stream_block_fields)
+            yield from results
+
     def specific(self, defer=False):
         """
         This efficiently gets all the specific items for the queryset, using
@@ -316,6 +343,61 @@ class SpecificQuerySetMixin:
             )
         return clone
 
+    def prefetch_stream_blocks(self, *field_names):
+        """
+        Convert the blocks in the StreamFields ``field_names`` of all results to their
+        native values together when the queryset is evaluated, so that the blocks
+        that refer to other objects (such as images, pages and snippets) fetch them
+        with one query per block type, rather than one per result per block type.
+        For example:
+
+        .. code-block:: python
+
+            # Fetch the images in the 'body' of all of the blog pages in two queries
+            queryset = BlogPage.objects.live().prefetch_stream_blocks("body")
+
+        For specific querysets, results that don't have a StreamField of the given
+        name are skipped. As with ``prefetch_related()``, ``None`` can be supplied in
+        place of ``field_names`` to negate previous applications of
+        ``prefetch_stream_blocks()``.
+        """
+        if not field_names:
+            raise ValueError(
+                "'field_names' must be provided when calling prefetch_stream_blocks()"
+            )
+        clone = self._chain()
+        if field_names == (None,):
+            clone._prefetch_stream_block_fields = ()
+        else:
+            clone._prefetch_stream_block_fields = (
+                self._prefetch_stream_block_fields + field_names
+            )
+        return clone
+
+
+def prefetch_stream_blocks(objects, field_names):
+    """
+    Convert the blocks in the StreamFields ``field_names`` of ``objects`` to their
+    native values, passing the values of each type of block to its ``bulk_to_python``
+    method together, across all of the objects. StreamFields that are deferred, or
+    have already been converted, are skipped.
+    """
+    from wagtail.blocks import StreamValue
+
+    stream_values = []
+    for obj in objects:
+        if not isinstance(obj, Model):
+            continue
+        deferred_fields = obj.get_deferred_fields()
+        for field_name in field_names:
+            if field_name in deferred_fields:
+                continue
+            value = getattr(obj, field_name, None)
+            if isinstance(value, StreamValue):
+                stream_values.append(value)
+
+    StreamValue.prefetch_blocks_in_bulk(stream_values)
+
 
 class PageQuerySet(SearchableQuerySetMixin, SpecificQuerySetMixin, TreeQuerySet):
     def live_q(self):
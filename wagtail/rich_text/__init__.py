@@ -1,4 +1,6 @@
 import re
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
 from html import unescape
 
@@ -13,6 +15,10 @@ from wagtail.rich_text.rewriters import EmbedRewriter, LinkRewriter, MultiRuleRe
 
 features = FeatureRegistry()
 
+# Mapping of rich text source HTML to its expanded HTML, populated by
+# expanded_rich_text() for the duration of a render
+_expanded_html = ContextVar("wagtail_expanded_rich_text", default=None)
+
 
 # Rewriter function to be built up on first call to expand_db_html, using the utility classes
 # from wagtail.rich_text.rewriters along with the embed handlers / link handlers registered
@@ -53,10 +59,55 @@ def expand_db_html(html):
     """
     Expand database-representation HTML into proper HTML usable on front-end templates
     """
+    expanded_html = _expanded_html.get()
+    if expanded_html is not None and html in expanded_html:
+        return expanded_html[html]
+
     rewriter = get_rewriter()
     return rewriter(html)
 
 
+def expand_db_html_many(htmls):
+    """
+    Expand a list of database-representation HTML strings together, with one lookup
+    per link type and embed type across all of them
+    """
+    rewriter = get_rewriter()
+    return rewriter.rewrite_many(list(htmls))
+
+
+@contextmanager
+def expanded_rich_text(sources):
+    """
+    Expand the given database-representation HTML strings together (see
+    expand_db_html_many), and reuse the results for any calls to expand_db_html
+    (such as when rendering RichText values) with the same HTML within the block.
+
+    This is used while rendering a StreamField, so that the links and embeds in all
+    of its rich text blocks are expanded with one query per link or embed type,
+    rather than one per rich text block.
+    """
+    expanded_html = _expanded_html.get()
+    is_outermost = expanded_html is None
+    if is_outermost:
+        expanded_html = {}
+
+    # Nested renders add their rich text to the enclosing render's mapping
+    missing = list(dict.fromkeys(html for html in sources if html not in expanded_html))
+    if missing:
+        expanded_html.update(zip(missing, expand_db_html_many(missing)))
+
+    if not is_outermost:
+        yield
+        return
+
+    token = _expanded_html.set(expanded_html)
+    try:
+        yield
+    finally:
+        _expanded_html.reset(token)
+
+
 def extract_references_from_rich_text(html):
     rewriter = get_rewriter()
     yield from rewriter.extract_references(html)
@@ -17,36 +17,54 @@ def extract_attrs(attr_string: str) -> dict:
     """
     helper method to extract tag attributes, as a dict of un-escaped strings
     """
-    attributes = {}
-    for name, val in FIND_ATTRS.findall(attr_string):
-        val = (
-            val.replace("&lt;", "<")
-            .replace("&gt;", ">")
-            .replace("&quot;", '"')
-            .replace("&amp;", "&")
-        )
-        attributes[name] = val
-    return attributes
+    return {
+        name: unescape_attr(val) if "&" in val else val
+        for name, val in FIND_ATTRS.findall(attr_string)
+    }
+
+
+def unescape_attr(val: str) -> str:
+    return (
+        val.replace("&lt;", "<")
+        .replace("&gt;", ">")
+        .replace("&quot;", '"')
+        .replace("&amp;", "&")
+    )
 
 
 class TagMatch:
     """Represents a single matched tag in a rich text string"""
 
-    def __init__(self, match):
+    def __init__(self, match, group=1):
         self.match = match  # a regexp match object
+        self.group = group  # the index of the regexp group containing the attributes
+        self.start, self.end = match.span()
         self.replacement = None  # to be filled in by the rewriter
 
     @cached_property
     def attrs(self):
-        return extract_attrs(self.match.group(1))
+        return extract_attrs(self.match.group(self.group))
+
 
-    @property
-    def start(self):
-        return self.match.start()
+def replace_tags(html: str, matches: list[TagMatch]) -> str:
+    """
+    Return the HTML with each of the given tags (in order of appearance) replaced by its
+    replacement string, leaving tags without a replacement unchanged
+    """
+    parts = []
+    position = 0
+    for match in matches:
+        if match.replacement is None:
+            continue
+        parts.append(html[position : match.start])
+        parts.append(match.replacement)
+        position = match.end
+
+    if not parts:
+        return html
 
-    @property
-    def end(self):
-        return self.match.end()
+    parts.append(html[position:])
+    return "".join(parts)
 
 
 class TagRewriter:
@@ -71,35 +89,51 @@ class TagRewriter:
         raise NotImplementedError
 
     def __call__(self, html: str) -> str:
-        matches_by_tag_type = self.extract_tags(html)
-        matches_to_replace = []
+        return self.rewrite_many([html])[0]
+
+    def rewrite_many(self, htmls: list[str]) -> list[str]:
+        """
+        Rewrite a list of HTML strings, returning the list of rewritten strings.
+
+        Tags of the same type are collected from all of the strings and passed to a
+        single get_tag_replacements call, so that any database lookups are batched
+        across all of the strings rather than made once per string.
+        """
+        matches_by_html = [self.extract_tags(html) for html in htmls]
+
+        all_matches_by_tag_type = defaultdict(list)
+        for matches_by_tag_type in matches_by_html:
+            for tag_type, tag_matches in matches_by_tag_type.items():
+                all_matches_by_tag_type[tag_type].extend(tag_matches)
+
+        self.set_replacements(all_matches_by_tag_type)
+
+        return [
+            replace_tags(
+                html,
+                sorted(
+                    (
+                        match
+                        for tag_matches in matches_by_tag_type.values()
+                        for match in tag_matches
+                    ),
+                    key=lambda match: match.start,
+                ),
+            )
+            for html, matches_by_tag_type in zip(htmls, matches_by_html)
+        ]
 
+    def set_replacements(self, matches_by_tag_type: dict[str, list[TagMatch]]):
+        """
+        Set the replacement string of each of the given TagMatch objects, grouped by tag type
+        """
         # For each tag type, get the list of replacement strings for all tags of that type
         for tag_type, tag_matches in matches_by_tag_type.items():
             attr_dicts = [match.attrs for match in tag_matches]
             replacements = self.get_tag_replacements(tag_type, attr_dicts)
 
-            if not replacements:
-                continue
-
             for match, replacement in zip(tag_matches, replacements):
                 match.replacement = replacement
-                matches_to_replace.append(match)
-
-        # Replace the tags in order of appearance in the string, so that offsets remain valid
-        matches_to_replace.sort(key=lambda match: match.start)
-
-        offset = 0
-        for match in matches_to_replace:
-            html = (
-                html[: match.start + offset]
-                + match.replacement
-                + html[match.end + offset :]
-            )
-
-            offset += len(match.replacement) - match.end + match.start
-
-        return html
 
     def extract_tags(self, html: str) -> dict[str, list[TagMatch]]:
         """Helper method to extract and group HTML tags and their attributes.
@@ -227,16 +261,78 @@ class LinkRewriter(TagRewriter):
 
 
 class MultiRuleRewriter:
-    """Rewrites HTML by applying a sequence of rewriter functions"""
+    """
+    Rewrites HTML by applying a sequence of rewriter functions.
+
+    If all of the rewriters are TagRewriters, the HTML is scanned for the tags of all
+    rewriters at once, in a single pass, rather than once per rewriter.
+    """
 
     def __init__(self, rewriters):
         self.rewriters = rewriters
 
+    @cached_property
+    def single_pass_regex(self):
+        """
+        A regex combining the opening tag regexes of all rewriters, where group N+1
+        contains the attributes of a tag matched by the Nth rewriter, or None if the
+        rewriters can't be combined.
+        """
+        if not all(isinstance(rewriter, TagRewriter) for rewriter in self.rewriters):
+            return None
+
+        regexes = [rewriter.get_opening_tag_regex() for rewriter in self.rewriters]
+        if any(
+            regex.groups != 1 or regex.groupindex or regex.flags != regexes[0].flags
+            for regex in regexes
+        ):
+            return None
+
+        return re.compile(
+            "|".join(f"(?:{regex.pattern})" for regex in regexes), regexes[0].flags
+        )
+
     def __call__(self, html):
+        if self.single_pass_regex is not None:
+            return self.rewrite_many([html])[0]
+
         for rewrite in self.rewriters:
             html = rewrite(html)
         return html
 
+    def rewrite_many(self, htmls):
+        if self.single_pass_regex is None:
+            for rewriter in self.rewriters:
+                htmls = rewriter.rewrite_many(htmls)
+            return htmls
+
+        # For each rewriter, a dict mapping tag types to a list of TagMatch objects
+        # across all of the HTML strings
+        matches_by_rewriter = [defaultdict(list) for rewriter in self.rewriters]
+        get_tag_types = [
+            rewriter.get_tag_type_from_attrs for rewriter in self.rewriters
+        ]
+        matches_by_html = []
+
+        for html in htmls:
+            tag_matches = []
+            for re_match in self.single_pass_regex.finditer(html):
+                index = re_match.lastindex - 1
+                tag_match = TagMatch(re_match, group=index + 1)
+                tag_type = get_tag_types[index](tag_match.attrs)
+
+                matches_by_rewriter[index][tag_type].append(tag_match)
+                tag_matches.append(tag_match)
+            matches_by_html.append(tag_matches)
+
+        for rewriter, matches_by_tag_type in zip(self.rewriters, matches_by_rewriter):
+            rewriter.set_replacements(matches_by_tag_type)
+
+        return [
+            replace_tags(html, tag_matches)
+            for html, tag_matches in zip(htmls, matches_by_html)
+        ]
+
     def extract_references(self, html):
         for rewriter in self.rewriters:
             yield from rewriter.extract_references(html)
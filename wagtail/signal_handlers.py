@@ -13,6 +13,14 @@ from django.db.models.signals import (
 )
 
 from wagtail.models import Locale, Page, ReferenceIndex, Site
+from wagtail.models.sites import invalidate_site_lookup_table
+from wagtail.signals import (
+    page_published,
+    page_slug_changed,
+    page_unpublished,
+    post_page_move,
+)
+from wagtail.url_routing import RouteCache
 
 from .tasks import update_reference_index_task
 
@@ -22,10 +30,16 @@ logger = logging.getLogger("wagtail")
 # Clear the wagtail_site_root_paths from the cache whenever Site records are updated.
 def post_save_site_signal_handler(instance, update_fields=None, **kwargs):
     Site.clear_site_root_paths_cache()
+    invalidate_site_lookup_table()
+    if route_cache := RouteCache.from_settings():
+        route_cache.invalidate_all()
 
 
 def post_delete_site_signal_handler(instance, **kwargs):
     Site.clear_site_root_paths_cache()
+    invalidate_site_lookup_table()
+    if route_cache := RouteCache.from_settings():
+        route_cache.invalidate_all()
 
 
 def pre_delete_page_unpublish(sender, instance, **kwargs):
@@ -39,6 +53,23 @@ def post_delete_page_log_deletion(sender, instance, **kwargs):
     logger.info('Page deleted: "%s" id=%d', instance.title, instance.id)
 
 
+# Invalidate cached page routes (see WAGTAIL_ROUTE_CACHE) whenever a page's
+# position in the tree, or whether it can be served, changes.
+def invalidate_route_cache_for_page(instance, **kwargs):
+    if route_cache := RouteCache.from_settings():
+        route_cache.invalidate_page(instance)
+
+
+def invalidate_route_cache_on_slug_change(instance, instance_before, **kwargs):
+    if route_cache := RouteCache.from_settings():
+        route_cache.invalidate_url_paths(instance_before.url_path, instance.url_path)
+
+
+def invalidate_route_cache_on_move(url_path_before, url_path_after, **kwargs):
+    if route_cache := RouteCache.from_settings():
+        route_cache.invalidate_url_paths(url_path_before, url_path_after)
+
+
 def reset_locales_display_names_cache(sender, instance, **kwargs):
     cache.delete("wagtail_locales_display_name")
 
@@ -111,6 +142,12 @@ def register_signal_handlers():
     pre_delete.connect(pre_delete_page_unpublish, sender=Page)
     post_delete.connect(post_delete_page_log_deletion, sender=Page)
 
+    page_published.connect(invalidate_route_cache_for_page)
+    page_unpublished.connect(invalidate_route_cache_for_page)
+    post_delete.connect(invalidate_route_cache_for_page, sender=Page)
+    page_slug_changed.connect(invalidate_route_cache_on_slug_change)
+    post_page_move.connect(invalidate_route_cache_on_move)
+
     post_save.connect(reset_locales_display_names_cache, sender=Locale)
     post_delete.connect(reset_locales_display_names_cache, sender=Locale)
 
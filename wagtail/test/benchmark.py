@@ -8,15 +8,21 @@ class Benchmark:
     def test(self):
         timings = []
         memory_usage = []
+        peak_memory_usage = []
         tracemalloc.start()
 
         for i in range(self.repeat):
             before_memory = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            start_traced_memory = tracemalloc.get_traced_memory()[0]
             start_time = time.time()
 
             self.bench()
 
             end_time = time.time()
+            peak_memory_usage.append(
+                tracemalloc.get_traced_memory()[1] - start_traced_memory
+            )
             after_memory = tracemalloc.take_snapshot()
             timings.append(end_time - start_time)
             memory_usage.append(
@@ -41,3 +47,11 @@ class Benchmark:
             "avg:",
             sum(memory_usage) / len(memory_usage),
         )
+        print(  # noqa: T201
+            "peak memory min:",
+            min(peak_memory_usage),
+            "max:",
+            max(peak_memory_usage),
+            "avg:",
+            sum(peak_memory_usage) / len(peak_memory_usage),
+        )
@@ -44,6 +44,12 @@ urlpatterns = [
         },
     ),
     path("sitemap-<str:section>.xml", sitemaps_views.sitemap, name="sitemap"),
+    path("pregenerated-sitemap.xml", sitemaps_views.pregenerated_index),
+    path(
+        "pregenerated-sitemap-<str:section>.xml.gz",
+        sitemaps_views.pregenerated_section,
+        name="wagtailsitemaps_pregenerated_section",
+    ),
     path("testapp/", include(testapp_urls)),
     path("fallback/", lambda request: HttpResponse("ok"), name="fallback"),
 ]
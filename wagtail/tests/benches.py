@@ -0,0 +1,142 @@
+from django.test import SimpleTestCase, TestCase
+
+from wagtail.models import Page
+from wagtail.rich_text import expand_db_html
+from wagtail.rich_text.rewriters import EmbedRewriter, LinkRewriter, MultiRuleRewriter
+from wagtail.test.benchmark import Benchmark
+from wagtail.test.testapp.models import StreamPage
+
+PARAGRAPH = (
+    "<p>Lorem ipsum dolor sit amet, <b>consectetur</b> adipiscing elit, sed do "
+    '<a linktype="page" id="{page_id}">eiusmod tempor</a> incididunt ut labore et '
+    '<a href="https://wagtail.org/?a=1&amp;b=2">dolore magna</a> aliqua. Ut enim ad '
+    'minim veniam, quis <a linktype="document" id="1">nostrud exercitation</a> '
+    "ullamco laboris nisi ut aliquip ex ea commodo consequat.</p>"
+    '<embed alt="An image" embedtype="image" format="left" id="{image_id}"/>'
+)
+
+
+def get_rich_text(paragraphs):
+    return "".join(
+        PARAGRAPH.format(page_id=i % 10 + 2, image_id=i % 3 + 1)
+        for i in range(paragraphs)
+    )
+
+
+class RewriterBenchmark(Benchmark):
+    """
+    Benches the scanning and rewriting of rich text tags, using link and embed
+    rules that don't make database queries.
+    """
+
+    paragraphs = 1
+
+    def setUp(self):
+        self.html = get_rich_text(self.paragraphs)
+        self.rewriter = MultiRuleRewriter(
+            [
+                LinkRewriter(
+                    rules={
+                        "page": lambda attrs: '<a href="/page/{}/">'.format(
+                            attrs["id"]
+                        ),
+                        "document": lambda attrs: '<a href="/document/{}/">'.format(
+                            attrs["id"]
+                        ),
+                    }
+                ),
+                EmbedRewriter(
+                    rules={
+                        "image": lambda attrs: '<img src="/image/{}/">'.format(
+                            attrs["id"]
+                        )
+                    }
+                ),
+            ]
+        )
+
+    def bench(self):
+        for i in range(100):
+            result = self.rewriter(self.html)
+
+        self.assertNotIn("linktype", result)
+        self.assertNotIn("<embed", result)
+
+
+class BenchRewriteSmallRichText(RewriterBenchmark, SimpleTestCase):
+    # Around 0.5KB, such as a single paragraph block
+    paragraphs = 1
+
+
+class BenchRewriteMediumRichText(RewriterBenchmark, SimpleTestCase):
+    # Around 10KB, such as a typical article body
+    paragraphs = 20
+
+
+class BenchRewriteLargeRichText(RewriterBenchmark, SimpleTestCase):
+    # Around 200KB, such as a long report
+    paragraphs = 400
+
+
+class BenchExpandDbHtml(Benchmark, TestCase):
+    """
+    Benches the expansion of a typical article body, including database queries.
+    """
+
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.html = get_rich_text(20)
+
+    def bench(self):
+        result = expand_db_html(self.html)
+
+        self.assertNotIn("linktype", result)
+
+
+class StreamPageListingBenchmark(Benchmark):
+    """
+    Benches loading a listing of pages with large StreamField bodies, as a listing
+    page would, without the body being used.
+    """
+
+    pages = 50
+    # Around 100KB per page
+    blocks = 200
+
+    def setUp(self):
+        home_page = Page.objects.get(url_path="/home/")
+        body = []
+        for i in range(self.blocks):
+            body.append(("text", f"Heading {i}"))
+            body.append(("rich_text", get_rich_text(1)))
+            body.append(
+                ("product", {"name": f"Product {i}", "price": f"{i}.99"}),
+            )
+        for i in range(self.pages):
+            home_page.add_child(
+                instance=StreamPage(title=f"Stream page {i}", body=body)
+            )
+
+    def bench(self):
+        titles = [page.title for page in StreamPage.objects.all()]
+
+        self.assertEqual(len(titles), self.pages)
+
+
+class BenchListStreamPages(StreamPageListingBenchmark, TestCase):
+    fixtures = ["test.json"]
+
+
+class BenchListAndAccessStreamPages(StreamPageListingBenchmark, TestCase):
+    """
+    Benches the same listing, with the number of blocks in each body being used,
+    so that every body is parsed.
+    """
+
+    fixtures = ["test.json"]
+
+    def bench(self):
+        block_counts = [len(page.body) for page in StreamPage.objects.all()]
+
+        self.assertEqual(block_counts, [self.blocks * 3] * self.pages)
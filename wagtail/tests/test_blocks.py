@@ -8,11 +8,13 @@ from decimal import Decimal
 
 # non-standard import name for gettext_lazy, to prevent strings from being picked up for translation
 from django import forms
+from django.core.cache import caches
 from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
 from django.forms.utils import ErrorList
 from django.template.loader import render_to_string
-from django.test import SimpleTestCase, TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import translation
 from django.utils.safestring import SafeData, mark_safe
 from django.utils.translation import gettext_lazy as _
 
@@ -5121,6 +5123,268 @@ class TestStreamBlockWithFixtures(TestCase):
             ],
         )
 
+    def test_render_expands_rich_text_in_bulk(self):
+        block = blocks.StreamBlock(
+            [
+                ("paragraph", blocks.RichTextBlock()),
+                (
+                    "section",
+                    blocks.StructBlock(
+                        [
+                            ("heading", blocks.CharBlock()),
+                            (
+                                "body",
+                                blocks.StreamBlock(
+                                    [("paragraph", blocks.RichTextBlock())]
+                                ),
+                            ),
+                        ]
+                    ),
+                ),
+            ]
+        )
+        value = block.to_python(
+            [
+                {
+                    "type": "paragraph",
+                    "value": '<p><a linktype="document" id="1">first</a></p>',
+                },
+                {
+                    "type": "paragraph",
+                    "value": '<p><a linktype="document" id="2">second</a></p>',
+                },
+                {
+                    "type": "section",
+                    "value": {
+                        "heading": "More documents",
+                        "body": [
+                            {
+                                "type": "paragraph",
+                                "value": '<p><a linktype="document" id="1">third</a></p>',
+                            },
+                        ],
+                    },
+                },
+            ]
+        )
+
+        # The document links in all of the rich text blocks, including those
+        # nested in other blocks, are expanded with a single query
+        with self.assertNumQueries(1):
+            result = block.render(value)
+
+        self.assertIn('<a href="/documents/1/test.pdf">first</a>', result)
+        self.assertIn('<a href="/documents/2/another_test.pdf">second</a>', result)
+        self.assertIn('<a href="/documents/1/test.pdf">third</a>', result)
+
+
+class CountingCharBlock(blocks.CharBlock):
+    render_count = 0
+
+    def render_basic(self, value, context=None):
+        CountingCharBlock.render_count += 1
+        return super().render_basic(value, context=context)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "wagtail-block-render-cache-tests",
+        }
+    },
+    WAGTAIL_BLOCK_RENDER_CACHE="default",
+)
+class TestStreamBlockRenderCache(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        caches["default"].clear()
+        CountingCharBlock.render_count = 0
+        self.block = blocks.StreamBlock(
+            [
+                ("page", blocks.PageChooserBlock()),
+                ("heading", CountingCharBlock()),
+                ("uncached", CountingCharBlock(render_cache=False)),
+                ("by_page", CountingCharBlock(render_cache_context=["page"])),
+            ]
+        )
+        self.raw_data = [
+            {"type": "heading", "value": "Events", "id": "heading-1"},
+            {"type": "page", "value": 3, "id": "page-1"},
+        ]
+
+    def test_render_uses_cache(self):
+        result = self.block.render(self.block.to_python(self.raw_data))
+        self.assertEqual(CountingCharBlock.render_count, 1)
+
+        # Blocks in the cache are not loaded from the database or rendered again
+        with self.assertNumQueries(0):
+            cached_result = self.block.render(self.block.to_python(self.raw_data))
+        self.assertEqual(cached_result, result)
+        self.assertEqual(CountingCharBlock.render_count, 1)
+        self.assertIn('<div class="block-heading">Events</div>', cached_result)
+        self.assertIn('<a href="/events/">Events</a>', cached_result)
+
+    def test_changed_value_is_rendered(self):
+        self.block.render(self.block.to_python(self.raw_data))
+
+        self.raw_data[0]["value"] = "Other events"
+        result = self.block.render(self.block.to_python(self.raw_data))
+        self.assertIn('<div class="block-heading">Other events</div>', result)
+        self.assertEqual(CountingCharBlock.render_count, 2)
+
+    def test_changed_child_is_rendered(self):
+        value = self.block.to_python(self.raw_data)
+        self.block.render(value)
+
+        # The raw data of the stream is stale once a child has been changed
+        value[0].value = "Other events"
+        result = self.block.render(value)
+        self.assertIn('<div class="block-heading">Other events</div>', result)
+        self.assertEqual(CountingCharBlock.render_count, 2)
+
+    def test_opt_out(self):
+        raw_data = [{"type": "uncached", "value": "Not cached", "id": "uncached-1"}]
+        self.block.render(self.block.to_python(raw_data))
+        result = self.block.render(self.block.to_python(raw_data))
+        self.assertIn('<div class="block-uncached">Not cached</div>', result)
+        self.assertEqual(CountingCharBlock.render_count, 2)
+
+    def test_blocks_without_id_are_not_cached(self):
+        raw_data = [{"type": "heading", "value": "Events"}]
+        self.block.render(self.block.to_python(raw_data))
+        self.block.render(self.block.to_python(raw_data))
+        self.assertEqual(CountingCharBlock.render_count, 2)
+
+    def test_render_cache_context(self):
+        raw_data = [{"type": "by_page", "value": "Hello", "id": "by-page-1"}]
+        home_page = Page.objects.get(url_path="/home/")
+        events_page = Page.objects.get(url_path="/home/events/")
+
+        for page in [home_page, events_page, home_page]:
+            self.block.render(self.block.to_python(raw_data), context={"page": page})
+        # Only the first render for each page is not cached
+        self.assertEqual(CountingCharBlock.render_count, 2)
+
+    def test_key_depends_on_language(self):
+        child_block = self.block.child_blocks["heading"]
+        with translation.override("en"):
+            en_key = child_block.get_render_cache_key("heading-1", "Events")
+        with translation.override("fr"):
+            fr_key = child_block.get_render_cache_key("heading-1", "Events")
+        self.assertNotEqual(en_key, fr_key)
+
+    @override_settings(WAGTAIL_BLOCK_RENDER_CACHE=None)
+    def test_disabled(self):
+        self.block.render(self.block.to_python(self.raw_data))
+        self.block.render(self.block.to_python(self.raw_data))
+        self.assertEqual(CountingCharBlock.render_count, 2)
+
+
+class CountingSearchCharBlock(blocks.CharBlock):
+    extract_count = 0
+
+    def get_searchable_content(self, value):
+        CountingSearchCharBlock.extract_count += 1
+        return super().get_searchable_content(value)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "wagtail-block-search-cache-tests",
+        }
+    },
+    WAGTAIL_BLOCK_SEARCH_CACHE="default",
+)
+class TestStreamBlockSearchCache(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        caches["default"].clear()
+        CountingSearchCharBlock.extract_count = 0
+        self.block = blocks.StreamBlock(
+            [
+                ("page", blocks.PageChooserBlock()),
+                ("heading", CountingSearchCharBlock()),
+                ("uncached", CountingSearchCharBlock(search_cache=False)),
+                ("paragraph", blocks.RichTextBlock()),
+            ]
+        )
+        self.raw_data = [
+            {"type": "heading", "value": "Events", "id": "heading-1"},
+            {"type": "page", "value": 3, "id": "page-1"},
+            {"type": "paragraph", "value": "<p>Hello <b>world</b></p>", "id": "p-1"},
+        ]
+
+    def test_searchable_content_uses_cache(self):
+        content = self.block.get_searchable_content(self.block.to_python(self.raw_data))
+        self.assertEqual(content, ["Events", "Hello world"])
+        self.assertEqual(CountingSearchCharBlock.extract_count, 1)
+
+        # Blocks in the cache are not loaded from the database or extracted again
+        with self.assertNumQueries(0):
+            cached_content = self.block.get_searchable_content(
+                self.block.to_python(self.raw_data)
+            )
+        self.assertEqual(cached_content, content)
+        self.assertEqual(CountingSearchCharBlock.extract_count, 1)
+
+    def test_only_changed_blocks_are_extracted(self):
+        self.block.get_searchable_content(self.block.to_python(self.raw_data))
+
+        self.raw_data[0]["value"] = "Other events"
+        self.raw_data.append(
+            {"type": "heading", "value": "News", "id": "heading-2"},
+        )
+        value = self.block.to_python(self.raw_data)
+        content = self.block.get_searchable_content(value)
+        self.assertEqual(content, ["Other events", "Hello world", "News"])
+        self.assertEqual(CountingSearchCharBlock.extract_count, 3)
+        # The unchanged blocks were not converted from their raw data
+        self.assertIsNone(value._bound_blocks[1])
+        self.assertIsNone(value._bound_blocks[2])
+
+    def test_changed_child_is_extracted(self):
+        value = self.block.to_python(self.raw_data)
+        self.block.get_searchable_content(value)
+
+        # The raw data of the stream is stale once a child has been changed
+        value[0].value = "Other events"
+        content = self.block.get_searchable_content(value)
+        self.assertEqual(content, ["Other events", "Hello world"])
+        self.assertEqual(CountingSearchCharBlock.extract_count, 2)
+
+    def test_opt_out(self):
+        raw_data = [{"type": "uncached", "value": "Not cached", "id": "uncached-1"}]
+        self.block.get_searchable_content(self.block.to_python(raw_data))
+        content = self.block.get_searchable_content(self.block.to_python(raw_data))
+        self.assertEqual(content, ["Not cached"])
+        self.assertEqual(CountingSearchCharBlock.extract_count, 2)
+
+    def test_blocks_without_id_are_not_cached(self):
+        raw_data = [{"type": "heading", "value": "Events"}]
+        self.block.get_searchable_content(self.block.to_python(raw_data))
+        self.block.get_searchable_content(self.block.to_python(raw_data))
+        self.assertEqual(CountingSearchCharBlock.extract_count, 2)
+
+    def test_search_index_disabled(self):
+        block = blocks.StreamBlock(
+            [("heading", CountingSearchCharBlock())], search_index=False
+        )
+        self.assertEqual(
+            block.get_searchable_content(block.to_python(self.raw_data[:1])), []
+        )
+        self.assertEqual(CountingSearchCharBlock.extract_count, 0)
+
+    @override_settings(WAGTAIL_BLOCK_SEARCH_CACHE=None)
+    def test_disabled(self):
+        self.block.get_searchable_content(self.block.to_python(self.raw_data))
+        self.block.get_searchable_content(self.block.to_python(self.raw_data))
+        self.assertEqual(CountingSearchCharBlock.extract_count, 2)
+
 
 class TestPageChooserBlock(TestCase):
     fixtures = ["test.json"]
@@ -225,7 +225,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
                 .exclude(approved_go_live_at__isnull=True)
                 .exists()
             )
-            with self.assertNumQueries(49):
+            with self.assertNumQueries(54):
                 with self.captureOnCommitCallbacks(execute=True):
                     management.call_command("publish_scheduled_pages")
 
@@ -283,7 +283,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
                 .exists()
             )
 
-            with self.assertNumQueries(49):
+            with self.assertNumQueries(54):
                 with self.captureOnCommitCallbacks(execute=True):
                     management.call_command("publish_scheduled_pages")
 
@@ -320,7 +320,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
         page.title = "Goodbye world!"
         page.save_revision()
 
-        with self.assertNumQueries(49):
+        with self.assertNumQueries(54):
             with self.captureOnCommitCallbacks(execute=True):
                 management.call_command("publish_scheduled_pages")
 
@@ -349,7 +349,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
             .exists()
         )
 
-        with self.assertNumQueries(42):
+        with self.assertNumQueries(47):
             with self.captureOnCommitCallbacks(execute=True):
                 management.call_command("publish_scheduled_pages")
 
@@ -386,7 +386,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
             p = Page.objects.get(slug="hello-world")
             self.assertTrue(p.live)
 
-            with self.assertNumQueries(29):
+            with self.assertNumQueries(34):
                 with self.captureOnCommitCallbacks(execute=True):
                     management.call_command("publish_scheduled_pages")
 
@@ -464,7 +464,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
                 .exists()
             )
 
-            with self.assertNumQueries(15):
+            with self.assertNumQueries(20):
                 with self.captureOnCommitCallbacks(execute=True):
                     management.call_command("publish_scheduled")
 
@@ -513,7 +513,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
                 .exists()
             )
 
-            with self.assertNumQueries(15):
+            with self.assertNumQueries(20):
                 with self.captureOnCommitCallbacks(execute=True):
                     management.call_command("publish_scheduled")
 
@@ -543,7 +543,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
         self.snippet.text = "Goodbye world!"
         self.snippet.save_revision()
 
-        with self.assertNumQueries(15):
+        with self.assertNumQueries(20):
             with self.captureOnCommitCallbacks(execute=True):
                 management.call_command("publish_scheduled")
 
@@ -568,7 +568,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
             .exists()
         )
 
-        with self.assertNumQueries(14):
+        with self.assertNumQueries(19):
             with self.captureOnCommitCallbacks(execute=True):
                 management.call_command("publish_scheduled")
 
@@ -597,7 +597,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
             self.snippet.refresh_from_db()
             self.assertTrue(self.snippet.live)
 
-            with self.assertNumQueries(10):
+            with self.assertNumQueries(15):
                 with self.captureOnCommitCallbacks(execute=True):
                     management.call_command("publish_scheduled")
 
@@ -628,6 +628,113 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
         self.assertFalse(self.snippet.expired)
 
 
+class TestPublishScheduledCommandBatches(TestCase):
+    def schedule(self, text, go_live_at):
+        snippet = DraftStateModel.objects.create(
+            text=text, live=False, go_live_at=go_live_at
+        )
+        snippet.save_revision(approved_go_live_at=go_live_at)
+        return snippet
+
+    def test_publishes_in_batches(self):
+        go_live_at = timezone.now() - timedelta(hours=1)
+        snippets = [self.schedule(f"Snippet {i}", go_live_at) for i in range(5)]
+
+        management.call_command("publish_scheduled", batch_size=2)
+
+        for snippet in snippets:
+            snippet.refresh_from_db()
+            self.assertTrue(snippet.live)
+
+    def test_failing_object_does_not_block_batch(self):
+        go_live_at = timezone.now() - timedelta(hours=1)
+        snippets = [self.schedule(f"Snippet {i}", go_live_at) for i in range(3)]
+        failing_revision = snippets[1].latest_revision
+        publish = Revision.publish
+
+        def publish_or_fail(revision, *args, **kwargs):
+            if revision.pk == failing_revision.pk:
+                raise ValueError("Can't publish this revision")
+            return publish(revision, *args, **kwargs)
+
+        with mock.patch.object(Revision, "publish", publish_or_fail):
+            with self.assertLogs("wagtail", level="ERROR"):
+                with self.assertRaisesMessage(
+                    management.CommandError,
+                    "1 scheduled objects could not be published or unpublished.",
+                ):
+                    management.call_command("publish_scheduled", batch_size=10)
+
+        live = [DraftStateModel.objects.get(pk=s.pk).live for s in snippets]
+        self.assertEqual(live, [True, False, True])
+
+    def test_objects_are_published_once_when_batch_has_failure(self):
+        go_live_at = timezone.now() - timedelta(hours=1)
+        # The failing object is processed after one that has been published
+        snippets = [
+            self.schedule(f"Snippet {i}", go_live_at + timedelta(minutes=i))
+            for i in range(3)
+        ]
+        failing_revision = snippets[1].latest_revision
+        publish = Revision.publish
+
+        def publish_or_fail(revision, *args, **kwargs):
+            if revision.pk == failing_revision.pk:
+                raise ValueError("Can't publish this revision")
+            return publish(revision, *args, **kwargs)
+
+        published_pks = []
+
+        def published_handler(sender, instance, **kwargs):
+            published_pks.append(instance.pk)
+
+        published.connect(published_handler)
+        try:
+            with mock.patch.object(Revision, "publish", publish_or_fail):
+                with self.assertLogs("wagtail", level="ERROR"):
+                    with self.assertRaises(management.CommandError):
+                        management.call_command("publish_scheduled", batch_size=10)
+        finally:
+            published.disconnect(published_handler)
+
+        # The objects that were published before the failure aren't published again
+        self.assertEqual(sorted(published_pks), [snippets[0].pk, snippets[2].pk])
+
+    def test_daemon_waits_until_next_due(self):
+        snippet = self.schedule("Due", timezone.now() - timedelta(minutes=1))
+        self.schedule("Later", timezone.now() + timedelta(seconds=30))
+
+        with mock.patch(
+            "wagtail.management.commands.publish_scheduled.time.sleep",
+            side_effect=KeyboardInterrupt,
+        ) as sleep:
+            management.call_command(
+                "publish_scheduled", daemon=True, interval=60, stdout=StringIO()
+            )
+
+        snippet.refresh_from_db()
+        self.assertTrue(snippet.live)
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args.args[0], 30, delta=5)
+
+    def test_daemon_waits_for_interval_when_nothing_is_scheduled(self):
+        with mock.patch(
+            "wagtail.management.commands.publish_scheduled.time.sleep",
+            side_effect=KeyboardInterrupt,
+        ) as sleep:
+            management.call_command(
+                "publish_scheduled", daemon=True, interval=15, stdout=StringIO()
+            )
+
+        sleep.assert_called_once_with(15)
+
+    def test_dryrun_with_daemon(self):
+        with self.assertRaisesMessage(
+            management.CommandError, "--dryrun can't be used with --daemon."
+        ):
+            management.call_command("publish_scheduled", dryrun=True, daemon=True)
+
+
 class TestPurgeRevisionsCommandForPages(TestCase):
     base_options = {}
 
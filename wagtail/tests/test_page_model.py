@@ -8,6 +8,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser, Group
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
 from django.core.exceptions import ValidationError
 from django.http import Http404
 from django.test import Client, TestCase, override_settings
@@ -34,6 +35,7 @@ from wagtail.models import (
     get_translatable_models,
 )
 from wagtail.signals import page_published
+from wagtail.test.routablepage.models import RoutablePageTest
 from wagtail.test.testapp.models import (
     AbstractPage,
     Advert,
@@ -72,7 +74,7 @@ from wagtail.test.testapp.models import (
     TaggedPage,
 )
 from wagtail.test.utils import WagtailTestUtils
-from wagtail.url_routing import RouteResult
+from wagtail.url_routing import RouteCache, RouteResult
 
 
 def get_ct(model):
@@ -364,6 +366,15 @@ class TestSiteRouting(TestCase):
             self.assertEqual(Site.find_for_request(request), self.default_site)
 
 
+@override_settings(WAGTAIL_SITE_LOOKUP_TABLE=True)
+class TestSiteRoutingWithLookupTable(TestSiteRouting):
+    def setUp(self):
+        super().setUp()
+        # Build the lookup table beforehand, so that finding a site only queries
+        # the (database) cache for the version of the table
+        Site.find_for_request(get_dummy_request())
+
+
 class TestRouting(TestCase):
     fixtures = ["test.json"]
 
@@ -599,6 +610,187 @@ class TestRouting(TestCase):
             self.assertEqual(parent, events_page)
 
 
+@override_settings(WAGTAIL_SINGLE_QUERY_ROUTING=True)
+class TestSingleQueryRouting(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.site = Site.objects.get(is_default_site=True)
+        self.homepage = Page.objects.get(url_path="/home/")
+
+    def test_route_for_request(self):
+        christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
+
+        request = get_dummy_request(path="/events/christmas/", site=self.site)
+        found_page, args, kwargs = Page.route_for_request(request, request.path)
+        self.assertEqual(found_page, christmas_page)
+        self.assertIsInstance(found_page, EventPage)
+        self.assertEqual((args, kwargs), ([], {}))
+
+    def test_route_to_site_root(self):
+        request = get_dummy_request(path="/", site=self.site)
+        self.assertEqual(
+            Page.find_for_request(request, request.path), self.homepage.specific
+        )
+
+    def test_query_count_is_independent_of_depth(self):
+        for path in ["/secret-plans/", "/secret-plans/steal-underpants/"]:
+            request = get_dummy_request(path=path, site=self.site)
+            # prime the site lookup
+            Site.find_for_request(request)
+            root_page = self.site.root_page
+            with self.assertNumQueries(2):
+                # expect queries for the pages along the path & the specific page
+                Page._route_by_url_path(
+                    request, root_page, [c for c in path.split("/") if c]
+                )
+
+    def test_route_to_unknown_page_returns_none(self):
+        request = get_dummy_request(path="/events/quinquagesima/", site=self.site)
+        self.assertIsNone(Page.route_for_request(request, request.path))
+
+    def test_route_through_missing_page_returns_none(self):
+        request = get_dummy_request(path="/nonexistent/christmas/", site=self.site)
+        self.assertIsNone(Page.route_for_request(request, request.path))
+
+    def test_route_to_unpublished_page_returns_none(self):
+        request = get_dummy_request(
+            path="/events/tentative-unpublished-event/", site=self.site
+        )
+        self.assertIsNone(Page.route_for_request(request, request.path))
+
+    def test_route_does_not_escape_site_root(self):
+        events_page = Page.objects.get(url_path="/home/events/")
+        events_site = Site.objects.create(
+            hostname="events.example.com", root_page=events_page
+        )
+        # /home/about-us/ exists, but is not within the events site
+        request = get_dummy_request(path="/about-us/", site=events_site)
+        self.assertIsNone(Page.route_for_request(request, request.path))
+
+    def test_cached_parent_obj_set(self):
+        request = get_dummy_request(
+            path="/secret-plans/steal-underpants/", site=self.site
+        )
+        found_page = Page.find_for_request(request, request.path)
+        with self.assertNumQueries(0):
+            parent = found_page.get_parent(update=False)
+        self.assertEqual(parent.url_path, "/home/secret-plans/")
+
+    def test_hands_off_to_custom_route(self):
+        routable_page = self.homepage.add_child(
+            instance=RoutablePageTest(title="Routable Page", slug="routable", live=True)
+        )
+
+        request = get_dummy_request(path="/routable/archive/year/2014/", site=self.site)
+        found_page, args, kwargs = Page.route_for_request(request, request.path)
+        self.assertEqual(found_page, routable_page)
+        view, view_args, view_kwargs = args
+        self.assertEqual(view.__func__, RoutablePageTest.archive_by_year)
+        self.assertEqual(view_args, ("2014",))
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "routes": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+    WAGTAIL_ROUTE_CACHE="routes",
+)
+class TestRouteCache(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        caches["routes"].clear()
+        self.site = Site.objects.get(is_default_site=True)
+
+    def route(self, path, site=None):
+        request = get_dummy_request(path=path, site=site or self.site)
+        return Page.route_for_request(request, request.path)
+
+    def test_cache_hit(self):
+        page = EventPage.objects.get(url_path="/home/secret-plans/steal-underpants/")
+        self.assertEqual(self.route("/secret-plans/steal-underpants/")[0], page)
+
+        request = get_dummy_request(
+            path="/secret-plans/steal-underpants/", site=self.site
+        )
+        Site.find_for_request(request)
+        with self.assertNumQueries(1):
+            # only the page itself is fetched, by ID
+            found_page = Page.find_for_request(request, request.path)
+        self.assertEqual(found_page, page)
+        self.assertIsInstance(found_page, EventPage)
+
+    def test_cached_route_still_checks_live(self):
+        page = SimplePage.objects.get(url_path="/home/about-us/")
+        self.assertEqual(self.route("/about-us/")[0], page)
+
+        # Bypass signals, so that the cache entry is not invalidated
+        Page.objects.filter(id=page.id).update(live=False)
+        self.assertIsNone(self.route("/about-us/"))
+
+    def test_unpublish_invalidates(self):
+        page = SimplePage.objects.get(url_path="/home/about-us/")
+        self.assertEqual(self.route("/about-us/")[0], page)
+        route_cache = RouteCache.from_settings()
+        self.assertEqual(
+            route_cache.get(self.site.pk, ["about-us"]),
+            (page.pk, page.content_type_id, []),
+        )
+
+        page.unpublish()
+        self.assertIsNone(route_cache.get(self.site.pk, ["about-us"]))
+        self.assertIsNone(self.route("/about-us/"))
+
+    def test_publish_invalidates_handoff_route(self):
+        homepage = Page.objects.get(url_path="/home/")
+        routable_page = homepage.add_child(
+            instance=RoutablePageTest(title="Routable Page", slug="routable", live=True)
+        )
+        # handled by the routable page itself
+        self.assertIsNone(self.route("/routable/child/"))
+
+        child = SimplePage(title="Child", slug="child", content="hello", live=False)
+        routable_page.add_child(instance=child)
+        child.save_revision().publish()
+        self.assertEqual(self.route("/routable/child/")[0], child)
+
+    def test_slug_change_invalidates_subtree(self):
+        events_page = Page.objects.get(url_path="/home/events/")
+        christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
+        self.assertEqual(self.route("/events/christmas/")[0], christmas_page)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            events_page.slug = "whats-on"
+            events_page.save()
+
+        self.assertIsNone(self.route("/events/christmas/"))
+        self.assertEqual(self.route("/whats-on/christmas/")[0], christmas_page)
+
+    def test_move_invalidates_subtree(self):
+        christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
+        about_page = Page.objects.get(url_path="/home/about-us/")
+        self.assertEqual(self.route("/events/christmas/")[0], christmas_page)
+
+        christmas_page.move(about_page, pos="last-child")
+
+        self.assertIsNone(self.route("/events/christmas/"))
+        self.assertEqual(self.route("/about-us/christmas/")[0], christmas_page)
+
+    def test_delete_invalidates_subtree(self):
+        self.assertIsNotNone(self.route("/events/christmas/"))
+        Page.objects.get(url_path="/home/events/").delete()
+        self.assertIsNone(self.route("/events/christmas/"))
+
+    def test_site_change_invalidates(self):
+        self.assertIsNotNone(self.route("/events/christmas/"))
+        self.site.root_page = Page.objects.get(url_path="/home/events/")
+        self.site.save()
+        self.assertIsNone(self.route("/events/christmas/"))
+        self.assertIsNotNone(self.route("/christmas/"))
+
+
 @override_settings(
     ROOT_URLCONF="wagtail.test.urls_multilang",
     LANGUAGE_CODE="en",
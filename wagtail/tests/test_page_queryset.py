@@ -4,9 +4,13 @@ from unittest import mock
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
+from django.db import connection
 from django.db.models import Count, Q
 from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
 from wagtail.models import Locale, Page, PageViewRestriction, Site, Workflow
 from wagtail.search.query import MATCH_ALL
 from wagtail.signals import page_unpublished
@@ -1201,6 +1205,112 @@ class TestSpecificQuery(WagtailTestUtils, TestCase):
             self.assertEqual(result_2, benchmark_result)
 
 
+class TestPrefetchStreamBlocks(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.images = [
+            Image.objects.create(title=f"Image {i}", file=get_test_image_file())
+            for i in range(2)
+        ]
+        home_page = Page.objects.get(url_path="/home/")
+        for i in range(3):
+            home_page.add_child(
+                instance=StreamPage(
+                    title=f"Stream page {i}",
+                    body=[
+                        ("text", "Images"),
+                        ("image", self.images[0]),
+                        ("image", self.images[1]),
+                        (
+                            "books",
+                            [("title", "The Hobbit"), ("author", "J. R. R. Tolkien")],
+                        ),
+                    ],
+                )
+            )
+
+    def get_block_values(self, pages):
+        return [[block.value for block in page.body] for page in pages]
+
+    def test_without_prefetch(self):
+        pages = list(StreamPage.objects.all())
+        # One query per page for the images
+        with self.assertNumQueries(3):
+            self.get_block_values(pages)
+
+    def test_prefetch_stream_blocks(self):
+        # One query for the pages, and one for the images in all of them
+        with self.assertNumQueries(2):
+            pages = list(StreamPage.objects.prefetch_stream_blocks("body"))
+
+        with self.assertNumQueries(0):
+            values = self.get_block_values(pages)
+
+        self.assertEqual(len(values), 3)
+        for page_values in values:
+            self.assertEqual(page_values[0], "Images")
+            self.assertEqual(page_values[1:3], self.images)
+            self.assertEqual(
+                [book.value for book in page_values[3]],
+                ["The Hobbit", "J. R. R. Tolkien"],
+            )
+
+    def test_prefetch_stream_blocks_specific(self):
+        queryset = Page.objects.child_of(Page.objects.get(url_path="/home/")).specific()
+        with CaptureQueriesContext(connection) as queries:
+            list(queryset)
+
+        # One extra query for the images in all of the stream pages
+        with self.assertNumQueries(len(queries) + 1):
+            pages = list(queryset.prefetch_stream_blocks("body"))
+
+        # Pages without a 'body' StreamField are skipped
+        stream_pages = [page for page in pages if isinstance(page, StreamPage)]
+        self.assertEqual(len(stream_pages), 3)
+        self.assertLess(len(stream_pages), len(pages))
+        with self.assertNumQueries(0):
+            self.get_block_values(stream_pages)
+
+    def test_prefetch_stream_blocks_with_iterator(self):
+        queryset = StreamPage.objects.prefetch_stream_blocks("body")
+        # One query for the pages, and one for the images of each chunk
+        with self.assertNumQueries(3):
+            pages = list(queryset.iterator(chunk_size=2))
+
+        with self.assertNumQueries(0):
+            self.get_block_values(pages)
+
+    def test_prefetch_stream_blocks_with_iterator_default_chunk_size(self):
+        queryset = StreamPage.objects.prefetch_stream_blocks("body")
+        with self.assertNumQueries(2):
+            pages = list(queryset.iterator())
+
+        with self.assertNumQueries(0):
+            self.get_block_values(pages)
+
+    def test_prefetch_stream_blocks_deferred(self):
+        with self.assertNumQueries(1):
+            pages = list(
+                StreamPage.objects.defer_streamfields().prefetch_stream_blocks("body")
+            )
+        self.assertEqual(len(pages), 3)
+
+    def test_prefetch_stream_blocks_without_field_names(self):
+        with self.assertRaises(ValueError):
+            StreamPage.objects.prefetch_stream_blocks()
+
+    def test_prefetch_stream_blocks_negation(self):
+        with self.assertNumQueries(1):
+            pages = list(
+                StreamPage.objects.prefetch_stream_blocks(
+                    "body"
+                ).prefetch_stream_blocks(None)
+            )
+        with self.assertNumQueries(3):
+            self.get_block_values(pages)
+
+
 class TestSpecificQuerySearch(WagtailTestUtils, TransactionTestCase):
     fixtures = ["test_specific.json"]
 
@@ -1,18 +1,21 @@
+import json
 from io import StringIO
+from unittest import mock
 
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
 from django.core.exceptions import FieldDoesNotExist
-from django.db import models
+from django.db import models, transaction
 from django.test import TestCase
 from django.utils.functional import SimpleLazyObject
 
 from wagtail.blocks import StreamValue, StructValue
 from wagtail.documents import get_document_model
 from wagtail.documents.tests.utils import get_test_document_file
+from wagtail.fields import StreamField
 from wagtail.images import get_image_model
 from wagtail.images.tests.utils import get_test_image_file
-from wagtail.models import Page, ReferenceIndex
+from wagtail.models import Page, ReferenceIndex, ReferenceIndexContentHash
 from wagtail.rich_text import RichText
 from wagtail.test.testapp.models import (
     Advert,
@@ -25,7 +28,9 @@ from wagtail.test.testapp.models import (
     GenericSnippetNoIndexPage,
     GenericSnippetPage,
     HeadCountRelatedModelUsingPK,
+    JSONStreamModel,
     ModelWithNullableParentalKey,
+    StreamPage,
     VariousOnDeleteModel,
 )
 
@@ -311,6 +316,195 @@ class TestCreateOrUpdateForObject(TestCase):
         self.assertEqual(refs.count(), 1)
 
 
+class TestIncrementalStreamFieldExtraction(TestCase):
+    def setUp(self):
+        image_model = get_image_model()
+        self.image_1 = image_model.objects.create(
+            title="Test image 1", file=get_test_image_file()
+        )
+        self.image_2 = image_model.objects.create(
+            title="Test image 2", file=get_test_image_file()
+        )
+        self.page = StreamPage(
+            title="Stream page",
+            slug="stream-page",
+            body=[("text", "foo"), ("image", self.image_1)],
+        )
+        Page.objects.get(id=2).add_child(instance=self.page)
+        with transaction.atomic():
+            ReferenceIndex.create_or_update_for_object(self.page)
+
+    def get_referenced_images(self):
+        return set(
+            ReferenceIndex.get_references_for_object(self.page).values_list(
+                "to_object_id", flat=True
+            )
+        )
+
+    def test_unchanged_field_is_not_extracted(self):
+        self.assertEqual(self.get_referenced_images(), {str(self.image_1.pk)})
+
+        page = StreamPage.objects.get(pk=self.page.pk)
+        page.title = "New title"
+        with mock.patch.object(StreamField, "extract_references") as extract_references:
+            with transaction.atomic():
+                ReferenceIndex.create_or_update_for_object(page)
+
+        extract_references.assert_not_called()
+        # The references from the unchanged field are kept
+        self.assertEqual(self.get_referenced_images(), {str(self.image_1.pk)})
+
+    def test_changed_field_is_extracted(self):
+        page = StreamPage.objects.get(pk=self.page.pk)
+        page.body = [("text", "foo"), ("image", self.image_2)]
+        with transaction.atomic():
+            ReferenceIndex.create_or_update_for_object(page)
+
+        self.assertEqual(self.get_referenced_images(), {str(self.image_2.pk)})
+        self.assertEqual(
+            ReferenceIndexContentHash.objects.filter(
+                object_id=str(self.page.pk), field_name="body"
+            ).count(),
+            1,
+        )
+
+    def test_mutated_stream_value_is_extracted(self):
+        obj = JSONStreamModel.objects.create(
+            body=[("text", "foo"), ("image", self.image_1)]
+        )
+        with transaction.atomic():
+            ReferenceIndex.create_or_update_for_object(obj)
+
+        obj = JSONStreamModel.objects.get(pk=obj.pk)
+        # Convert the blocks, so that the raw data is cached, then replace one
+        obj.body[1]
+        obj.body[1] = ("image", self.image_2)
+        with transaction.atomic():
+            ReferenceIndex.create_or_update_for_object(obj)
+
+        self.assertEqual(
+            set(
+                ReferenceIndex.get_references_for_object(obj).values_list(
+                    "to_object_id", flat=True
+                )
+            ),
+            {str(self.image_2.pk)},
+        )
+
+    def test_remove_for_object(self):
+        ReferenceIndex.remove_for_object(self.page)
+        self.assertFalse(
+            ReferenceIndexContentHash.objects.filter(
+                object_id=str(self.page.pk)
+            ).exists()
+        )
+
+    def test_rebuild_clears_content_hashes(self):
+        management.call_command("rebuild_references_index", stdout=StringIO())
+        self.assertFalse(ReferenceIndexContentHash.objects.exists())
+        self.assertEqual(self.get_referenced_images(), {str(self.image_1.pk)})
+
+
+class TestRebuildForModel(TestCase):
+    def setUp(self):
+        image_model = get_image_model()
+        self.images = [
+            image_model.objects.create(
+                title=f"Test image {i}", file=get_test_image_file()
+            )
+            for i in range(3)
+        ]
+        self.root_page = Page.objects.get(id=2)
+
+        for i, image in enumerate(self.images):
+            event_page = EventPage(
+                title=f"Event page {i}",
+                slug=f"event-page-{i}",
+                location="the moon",
+                audience="public",
+                cost="free",
+                date_from="2001-01-01",
+                feed_image=image,
+            )
+            event_page.carousel_items = [
+                EventPageCarouselItem(caption="carousel", image=image, sort_order=1),
+            ]
+            self.root_page.add_child(instance=event_page)
+
+            self.root_page.add_child(
+                instance=StreamPage(
+                    title=f"Stream page {i}",
+                    slug=f"stream-page-{i}",
+                    body=[
+                        ("text", "foo"),
+                        ("image", image),
+                        ("rich_text", RichText(f'<a linktype="page" id="{i + 2}">')),
+                    ],
+                )
+            )
+
+    def get_references(self):
+        return set(
+            ReferenceIndex.objects.values_list(
+                "content_type",
+                "base_content_type",
+                "object_id",
+                "to_content_type",
+                "to_object_id",
+                "model_path",
+                "content_path",
+                "content_path_hash",
+            )
+        )
+
+    def test_matches_create_or_update_for_object(self):
+        ReferenceIndex.objects.all().delete()
+        for model in [EventPage, StreamPage]:
+            for instance in model.objects.all():
+                ReferenceIndex.create_or_update_for_object(instance)
+        expected_references = self.get_references()
+        self.assertEqual(len(expected_references), 12)
+
+        ReferenceIndex.objects.all().delete()
+        for model in [EventPage, StreamPage]:
+            self.assertEqual(
+                list(ReferenceIndex.rebuild_for_model(model, chunk_size=2)), [2, 1]
+            )
+        self.assertEqual(self.get_references(), expected_references)
+
+    def test_query_count_does_not_depend_on_object_count(self):
+        for image in self.images:
+            JSONStreamModel.objects.create(
+                body=json.dumps(
+                    [
+                        {"type": "text", "value": "foo"},
+                        {"type": "image", "value": image.pk},
+                    ]
+                )
+            )
+        ReferenceIndex.objects.all().delete()
+        # Populate the ContentType cache
+        ContentType.objects.get_for_model(JSONStreamModel)
+        ContentType.objects.get_for_model(get_image_model())
+
+        # One query each for the objects, the images in their StreamFields,
+        # and the bulk insert
+        with self.assertNumQueries(3):
+            list(ReferenceIndex.rebuild_for_model(JSONStreamModel, chunk_size=10))
+
+        self.assertEqual(
+            set(ReferenceIndex.objects.values_list("to_object_id", flat=True)),
+            {str(image.pk) for image in self.images},
+        )
+
+    def test_rebuild_references_index_command(self):
+        expected_references = self.get_references()
+        ReferenceIndex.objects.all().delete()
+
+        management.call_command("rebuild_references_index", stdout=StringIO())
+        self.assertTrue(expected_references.issubset(self.get_references()))
+
+
 class TestDescribeOnDelete(TestCase):
     fixtures = ["test.json"]
 
@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from django.forms.models import modelform_factory
 from django.test import TestCase, override_settings
@@ -11,10 +11,17 @@ from wagtail.rich_text import (
     RichTextMaxLengthValidator,
     RichTextMinLengthValidator,
     expand_db_html,
+    expand_db_html_many,
+    expanded_rich_text,
 )
 from wagtail.rich_text.feature_registry import FeatureRegistry
 from wagtail.rich_text.pages import PageLinkHandler
-from wagtail.rich_text.rewriters import LinkRewriter, extract_attrs
+from wagtail.rich_text.rewriters import (
+    EmbedRewriter,
+    LinkRewriter,
+    MultiRuleRewriter,
+    extract_attrs,
+)
 from wagtail.test.testapp.models import EventIndex, EventPage
 from wagtail.test.utils.form_data import rich_text
 
@@ -218,6 +225,44 @@ This is another image: <embed embedtype="image" id="2" format="left" />
             ),
         )
 
+    def test_expand_db_html_many(self):
+        with self.assertNumQueries(1):
+            result = expand_db_html_many(
+                [
+                    '<a linktype="document" id="1">document</a>',
+                    '<a href="https://wagtail.org/">foo</a>',
+                    '<a linktype="document" id="2">document</a><embed id="1" />',
+                ]
+            )
+
+        self.assertEqual(
+            result,
+            [
+                '<a href="/documents/1/test.pdf">document</a>',
+                '<a href="https://wagtail.org/">foo</a>',
+                '<a href="/documents/2/another_test.pdf">document</a>',
+            ],
+        )
+
+    def test_expanded_rich_text(self):
+        first = '<p><a linktype="document" id="1">first</a></p>'
+        second = '<p><a linktype="document" id="2">second</a></p>'
+
+        with self.assertNumQueries(1):
+            with expanded_rich_text([first, second]):
+                self.assertEqual(
+                    str(RichText(second)),
+                    '<p><a href="/documents/2/another_test.pdf">second</a></p>',
+                )
+                self.assertEqual(
+                    expand_db_html(first),
+                    '<p><a href="/documents/1/test.pdf">first</a></p>',
+                )
+
+        # Expanded HTML is not reused outside of the block
+        with self.assertNumQueries(1):
+            expand_db_html(first)
+
 
 class TestRichTextValue(TestCase):
     fixtures = ["test.json"]
@@ -359,6 +404,86 @@ class TestLinkRewriterTagReplacing(TestCase):
         )
 
 
+class TestMultiRuleRewriter(TestCase):
+    def get_rewriter(self):
+        return MultiRuleRewriter(
+            [
+                LinkRewriter(
+                    bulk_rules={
+                        "page": lambda attrs_list: [
+                            '<a href="/article/{}">'.format(attrs["id"])
+                            for attrs in attrs_list
+                        ]
+                    }
+                ),
+                EmbedRewriter(
+                    rules={
+                        "image": lambda attrs: '<img src="{}.png">'.format(attrs["id"])
+                    }
+                ),
+            ]
+        )
+
+    def test_rewrite_in_single_pass(self):
+        rewriter = self.get_rewriter()
+        self.assertIsNotNone(rewriter.single_pass_regex)
+
+        with (
+            patch.object(LinkRewriter, "extract_tags", side_effect=AssertionError),
+            patch.object(EmbedRewriter, "extract_tags", side_effect=AssertionError),
+        ):
+            result = rewriter(
+                '<p><a linktype="page" id="3">foo</a></p>'
+                '<embed embedtype="image" id="1" />'
+                '<p><a href="https://wagtail.org/">bar</a><a id="top">baz</a></p>'
+                '<embed embedtype="unknown" /><a linktype="page" id="4">qux</a>'
+            )
+
+        self.assertEqual(
+            result,
+            '<p><a href="/article/3">foo</a></p>'
+            '<img src="1.png">'
+            '<p><a href="https://wagtail.org/">bar</a><a id="top">baz</a></p>'
+            '<a href="/article/4">qux</a>',
+        )
+
+    def test_rewrite_many(self):
+        page_rule = Mock(
+            side_effect=lambda attrs_list: [
+                '<a href="/article/{}">'.format(attrs["id"]) for attrs in attrs_list
+            ]
+        )
+        rewriter = MultiRuleRewriter([LinkRewriter(bulk_rules={"page": page_rule})])
+
+        result = rewriter.rewrite_many(
+            [
+                '<a linktype="page" id="3">',
+                "<p>No links</p>",
+                '<a linktype="page" id="4">',
+            ]
+        )
+
+        # Tags of the same type are rewritten together across all of the strings
+        page_rule.assert_called_once_with(
+            [{"linktype": "page", "id": "3"}, {"linktype": "page", "id": "4"}]
+        )
+        self.assertEqual(
+            result,
+            ['<a href="/article/3">', "<p>No links</p>", '<a href="/article/4">'],
+        )
+
+    def test_rewrite_with_other_rewriters(self):
+        rewriter = MultiRuleRewriter(
+            [self.get_rewriter(), lambda html: html.replace("foo", "bar")]
+        )
+        self.assertIsNone(rewriter.single_pass_regex)
+
+        self.assertEqual(
+            rewriter('<a linktype="page" id="3">foo</a>'),
+            '<a href="/article/3">bar</a>',
+        )
+
+
 class TestRichTextField(TestCase):
     fixtures = ["test.json"]
 
@@ -3,6 +3,7 @@ from django.test import TestCase, override_settings
 
 from wagtail.coreutils import get_dummy_request
 from wagtail.models import Page, Site
+from wagtail.models.sites import get_site_lookup_table
 
 
 class TestSiteNaturalKey(TestCase):
@@ -152,6 +153,92 @@ class TestFindSiteForRequest(TestCase):
         self.assertEqual(Site.find_for_request(request), self.default_site)
 
 
+@override_settings(
+    ALLOWED_HOSTS=["example.com", "other.example.com"],
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "wagtail-site-lookup-table-tests",
+        }
+    },
+    WAGTAIL_SITE_LOOKUP_TABLE=True,
+)
+class TestSiteLookupTable(TestCase):
+    def setUp(self):
+        self.default_site = Site.objects.get()
+        self.site = Site.objects.create(
+            hostname="example.com", port=80, root_page=Page.objects.get(pk=2)
+        )
+
+    def get_request(self, hostname):
+        request = get_dummy_request()
+        request.META.update({"HTTP_HOST": hostname, "SERVER_PORT": 80})
+        return request
+
+    def test_find_for_request_without_queries(self):
+        Site.find_for_request(self.get_request("example.com"))
+
+        with self.assertNumQueries(0):
+            site = Site.find_for_request(self.get_request("example.com"))
+            self.assertEqual(site, self.site)
+            self.assertEqual(site.root_page.pk, 2)
+            self.assertEqual(
+                Site.find_for_request(self.get_request("unknown.com")),
+                self.default_site,
+            )
+
+    def test_returns_copies(self):
+        site = Site.find_for_request(self.get_request("example.com"))
+        site.hostname = "changed.com"
+        site.root_page.title = "Changed"
+
+        site = Site.find_for_request(self.get_request("example.com"))
+        self.assertEqual(site.hostname, "example.com")
+        self.assertNotEqual(site.root_page.title, "Changed")
+
+    def test_invalidated_on_site_save(self):
+        lookup_table = get_site_lookup_table()
+        self.assertEqual(
+            Site.find_for_request(self.get_request("other.example.com")),
+            self.default_site,
+        )
+
+        self.site.hostname = "other.example.com"
+        self.site.save()
+
+        self.assertIsNot(get_site_lookup_table(), lookup_table)
+        self.assertEqual(
+            Site.find_for_request(self.get_request("other.example.com")),
+            self.site,
+        )
+
+    def test_invalidated_on_site_delete(self):
+        Site.find_for_request(self.get_request("example.com"))
+
+        self.site.delete()
+
+        self.assertEqual(
+            Site.find_for_request(self.get_request("example.com")),
+            self.default_site,
+        )
+
+    def test_invalidated_on_root_page_save(self):
+        Site.find_for_request(self.get_request("example.com"))
+
+        page = Page.objects.get(pk=2)
+        page.title = "New title"
+        page.save()
+
+        site = Site.find_for_request(self.get_request("example.com"))
+        self.assertEqual(site.root_page.title, "New title")
+
+    @override_settings(WAGTAIL_SITE_LOOKUP_TABLE=False)
+    def test_disabled(self):
+        self.assertIsNone(get_site_lookup_table())
+        with self.assertNumQueries(1):
+            Site.find_for_request(self.get_request("example.com"))
+
+
 class TestDefaultSite(TestCase):
     def test_create_default_site(self):
         Site.objects.all().delete()
@@ -166,6 +166,82 @@ class TestLazyStreamField(TestCase):
             assert instance.body[1].value is None
             assert instance.body[2].value.title == "Test image 3"
 
+    def test_prefetch_blocks_in_bulk(self):
+        """
+        prefetch_blocks_in_bulk should fetch the blocks of several streams with
+        one query per block type, rather than one per stream
+        """
+        image_2 = Image.objects.create(title="Test image 2", file=get_test_image_file())
+        other_image = self.model.objects.create(
+            body=json.dumps([{"type": "image", "value": image_2.pk}])
+        )
+
+        with self.assertNumQueries(1):
+            instances = list(
+                self.model.objects.filter(
+                    pk__in=[
+                        self.with_image.pk,
+                        self.no_image.pk,
+                        self.three_items.pk,
+                        other_image.pk,
+                    ]
+                ).order_by("pk")
+            )
+
+        with self.assertNumQueries(1):
+            StreamValue.prefetch_blocks_in_bulk(
+                [instance.body for instance in instances]
+            )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(instances[0].body[0].value, self.image)
+            self.assertEqual(instances[0].body[1].value, "foo")
+            self.assertEqual(instances[1].body[0].value, "foo")
+            self.assertEqual(
+                [child.value for child in instances[2].body],
+                ["foo", self.image, "bar"],
+            )
+            self.assertEqual(instances[3].body[0].value, image_2)
+
+    def test_json_parsed_on_first_access(self):
+        instance = self.model.objects.get(pk=self.three_items.pk)
+
+        # The stored JSON is not parsed until the content of the stream is accessed
+        self.assertIsInstance(instance.body, StreamValue)
+        self.assertIn("_raw_json", instance.body.__dict__)
+        self.assertNotIn("_raw_data", instance.body.__dict__)
+
+        self.assertEqual(len(instance.body), 3)
+        self.assertNotIn("_raw_json", instance.body.__dict__)
+        self.assertTrue(instance.body.is_lazy)
+        self.assertIsNone(instance.body.raw_text)
+        self.assertEqual(instance.body.raw_data[2]["value"], "bar")
+
+    def test_unparsed_json_skips_unknown_block_types(self):
+        instance = self.model.objects.create(
+            body=json.dumps(
+                [
+                    {"type": "text", "value": "foo"},
+                    {"type": "unknown", "value": "bar"},
+                ]
+            )
+        )
+        instance = self.model.objects.get(pk=instance.pk)
+        self.assertEqual([child.value for child in instance.body], ["foo"])
+
+    def test_unparsed_json_is_saved(self):
+        instance = self.model.objects.get(pk=self.three_items.pk)
+        with disable_reference_index_auto_update():
+            instance.save()
+
+        # The JSON is written back without being parsed
+        self.assertIn("_raw_json", instance.body.__dict__)
+
+        instance = self.model.objects.get(pk=self.three_items.pk)
+        self.assertEqual(
+            [child.value for child in instance.body], ["foo", self.image, "bar"]
+        )
+
     def test_lazy_load_get_prep_value(self):
         """
         Saving a lazy StreamField that hasn't had its data accessed should not
@@ -1,10 +1,12 @@
 import hashlib
+import math
 import os
 import pickle
 import tempfile
 import unittest
 from io import BytesIO
 from pathlib import Path
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -30,6 +32,7 @@ from wagtail.coreutils import (
     string_to_ascii,
 )
 from wagtail.models import Page, Site
+from wagtail.utils import json as wagtail_json
 from wagtail.utils.file import hash_filelike
 from wagtail.utils.templates import template_is_overridden
 from wagtail.utils.utils import deep_update, flatten_choices
@@ -655,3 +658,26 @@ class TestFlattenChoices(SimpleTestCase):
                 "unknown": "Unknown",
             },
         )
+
+
+class TestJSONLoads(SimpleTestCase):
+    def test_loads(self):
+        self.assertEqual(
+            wagtail_json.loads('[{"type": "text", "value": "caf\\u00e9"}]'),
+            [{"type": "text", "value": "café"}],
+        )
+        self.assertEqual(
+            wagtail_json.loads(b'{"a": [1, 2.5, null]}'), {"a": [1, 2.5, None]}
+        )
+
+    def test_loads_values_rejected_by_orjson(self):
+        self.assertTrue(math.isnan(wagtail_json.loads("[NaN]")[0]))
+        self.assertEqual(wagtail_json.loads("[18446744073709551616]"), [2**64])
+
+    def test_loads_invalid(self):
+        with self.assertRaises(ValueError):
+            wagtail_json.loads("<p>not JSON</p>")
+
+    @mock.patch.object(wagtail_json, "orjson", None)
+    def test_loads_without_orjson(self):
+        self.assertEqual(wagtail_json.loads('{"a": 1}'), {"a": 1})
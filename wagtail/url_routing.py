@@ -1,3 +1,14 @@
+from __future__ import annotations
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import get_language
+
+from wagtail.coreutils import safe_md5
+
+
 class RouteResult:
     """
     An object to be returned from Page.route, which encapsulates
@@ -14,3 +25,139 @@ class RouteResult:
 
     def __getitem__(self, index):
         return (self.page, self.args, self.kwargs)[index]
+
+
+class RouteCache:
+    """
+    A cache of resolved page routes shared between processes, used by
+    ``Page.route_for_request`` when the ``WAGTAIL_ROUTE_CACHE`` setting is set
+    to the alias of a Django cache backend.
+
+    Each entry maps a site, language and request path to the ID and content type
+    of the page whose ``route()`` method handles that path, along with any path
+    components to pass to it. The page's ``route()`` method is still called on
+    every request, so custom routing (and checks such as whether the page is
+    live) continue to apply.
+
+    Entries are not deleted directly. Instead, each entry records a version token
+    for every ``url_path`` along its route; invalidating a ``url_path`` replaces its
+    token, which makes every cached route through that page stale, including
+    routes to all of its descendants.
+    """
+
+    ENTRY_KEY_PREFIX = "wagtail-route"
+    VERSION_KEY_PREFIX = "wagtail-route-version"
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    @classmethod
+    def from_settings(cls) -> RouteCache | None:
+        """
+        Return a ``RouteCache`` for the cache backend named by the
+        ``WAGTAIL_ROUTE_CACHE`` setting, or ``None`` if route caching is disabled.
+        """
+        alias = getattr(settings, "WAGTAIL_ROUTE_CACHE", None)
+        if alias is None:
+            return None
+        return cls(caches[alias])
+
+    def _entry_key(self, site_id, path_components):
+        path_hash = safe_md5(
+            "/".join(path_components).encode("utf-8"), usedforsecurity=False
+        ).hexdigest()
+        return f"{self.ENTRY_KEY_PREFIX}:{site_id}:{get_language()}:{path_hash}"
+
+    def _url_path_version_key(self, url_path):
+        url_path_hash = safe_md5(
+            url_path.encode("utf-8"), usedforsecurity=False
+        ).hexdigest()
+        return f"{self.VERSION_KEY_PREFIX}:path:{url_path_hash}"
+
+    def _translation_version_key(self, translation_key):
+        return f"{self.VERSION_KEY_PREFIX}:translation:{translation_key}"
+
+    def _global_version_key(self):
+        return f"{self.VERSION_KEY_PREFIX}:global"
+
+    def get(self, site_id, path_components):
+        """
+        Return the cached ``(page_id, content_type_id, remaining_components)``
+        tuple for the given site and path, or ``None`` if there is no valid entry.
+        """
+        entry = self.cache.get(self._entry_key(site_id, path_components))
+        if entry is None:
+            return None
+
+        versions, route = entry
+        if self.cache.get_many(list(versions)) != versions:
+            # A page along this route has changed since the entry was stored
+            return None
+
+        return tuple(route)
+
+    def get_versions(self, root_page, path_components):
+        """
+        Return the current version tokens that a route from ``root_page``
+        through the given path components depends on. These must be fetched
+        before the route is resolved, and passed to ``set()`` afterwards.
+        """
+        keys = [
+            self._global_version_key(),
+            self._translation_version_key(root_page.translation_key),
+            self._url_path_version_key(root_page.url_path),
+        ]
+        url_path = root_page.url_path
+        for component in path_components:
+            url_path += component + "/"
+            keys.append(self._url_path_version_key(url_path))
+
+        versions = self.cache.get_many(keys)
+        missing_keys = [key for key in keys if key not in versions]
+        if missing_keys:
+            for key in missing_keys:
+                # Use add() so that we don't overwrite a token that has just
+                # been set by a concurrent invalidation
+                self.cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions.update(self.cache.get_many(missing_keys))
+
+        return versions
+
+    def set(self, site_id, path_components, versions, route):
+        """
+        Store a ``(page_id, content_type_id, remaining_components)`` tuple for the
+        given site and path, with the version tokens returned by ``get_versions()``.
+        """
+        self.cache.set(
+            self._entry_key(site_id, path_components), (versions, tuple(route))
+        )
+
+    def _bump(self, keys):
+        self.cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=None)
+
+    def invalidate_url_paths(self, *url_paths):
+        """
+        Invalidate cached routes to the pages at the given URL paths, and to all
+        of their descendants.
+        """
+        self._bump(
+            [self._url_path_version_key(url_path) for url_path in url_paths if url_path]
+        )
+
+    def invalidate_page(self, page):
+        """
+        Invalidate cached routes to the given page and all of its descendants,
+        as well as routes that start from any of its translations.
+        """
+        self._bump(
+            [
+                self._url_path_version_key(page.url_path),
+                self._translation_version_key(page.translation_key),
+            ]
+        )
+
+    def invalidate_all(self):
+        """
+        Invalidate every cached route, for example when sites are changed.
+        """
+        self._bump([self._global_version_key()])
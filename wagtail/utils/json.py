@@ -0,0 +1,21 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def loads(value):
+    """
+    Parse a JSON string (or bytes), using the faster ``orjson`` library if it is
+    installed. Raises ``ValueError`` if the value is not valid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the json module, such as about NaN values
+            # and integers larger than 64 bits, so fall back on it for those
+            pass
+    return json.loads(value)